@@ -0,0 +1,103 @@
+"""
+Cold vs warm start benchmark for the persistent disk cache
+
+Starts the server twice against a simulated upstream with fixed latency and replays
+the same workload after each start. The first start runs with an empty cache file;
+the second reuses it, like a restart of a long-running server.
+
+Usage:
+    python benchmarks/bench_disk_cache.py [--requests 200] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+def _workload(count: int) -> List[Dict[str, Any]]:
+    """NFT metadata lookups and finalized log ranges"""
+    calls: List[Dict[str, Any]] = []
+    for i in range(count):
+        if i % 2:
+            request: Dict[str, Any] = {
+                "blockchain": "eth",
+                "contract_address": "0xabc",
+                "token_id": str(i),
+            }
+            calls.append({"tool": "get_nft_metadata", "request": request})
+        else:
+            request = {"blockchain": "eth", "from_block": i * 100, "to_block": i * 100 + 99}
+            calls.append({"tool": "get_logs", "request": request})
+    return calls
+
+
+async def _run(calls: List[Dict[str, Any]], latency: float) -> Dict[str, Any]:
+    upstream: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        method = json.loads(request.content)["method"]
+        upstream.append(method)
+        await asyncio.sleep(latency)
+        if method == "ankr_getBlockchainStats":
+            result: Dict[str, Any] = {"stats": [{"blockchain": "eth", "latestBlockNumber": 10**8}]}
+        elif method == "ankr_getLogs":
+            result = {"logs": []}
+        else:
+            result = {"metadata": {"blockchain": "eth", "tokenId": "1"}}
+        return httpx.Response(200, json={"result": result})
+
+    client = AnkrRpcClient("https://rpc.bench/", transport=httpx.MockTransport(handler))
+    start = time.perf_counter()
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Benchmark")
+    started = time.perf_counter()
+
+    await asyncio.gather(
+        *[mcp._mcp_call_tool(call["tool"], {"request": call["request"]}) for call in calls]
+    )
+    finished = time.perf_counter()
+    await client.aclose()
+    return {
+        "startup_ms": (started - start) * 1000,
+        "workload_ms": (finished - started) * 1000,
+        "upstream_calls": len(upstream),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    calls = _workload(args.requests)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WEB3_MCP_DISK_CACHE"] = os.path.join(tmp, "cache.db")
+        os.environ.setdefault("ANKR_ENDPOINT", "https://rpc.bench/")
+        os.environ.setdefault("ANKR_PRIVATE_KEY", "benchmark")
+        cold = asyncio.run(_run(calls, args.latency_ms / 1000))
+        warm = asyncio.run(_run(calls, args.latency_ms / 1000))
+
+    print(f"{'':6} {'startup ms':>12} {'workload ms':>12} {'upstream calls':>15}")
+    for name, result in (("cold", cold), ("warm", warm)):
+        print(
+            f"{name:6} {result['startup_ms']:12.1f} {result['workload_ms']:12.1f}"
+            f" {result['upstream_calls']:15d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of SDK object serialization
+
+Compares the previous dir()-reflection loop of get_nfts_by_owner with
+serialize.to_plain on a wallet-sized list of NFTs, with and without a `fields`
+projection, and reports the JSON payload size of each.
+
+Usage:
+    python benchmarks/bench_serialize.py [--nfts 5000] [--repeat 5]
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, List
+
+import pydantic_core
+from ankr.types import Blockchain, Nft, Trait
+
+from web3_mcp.serialize import to_plain
+
+# A typical projection for listing a wallet's NFTs
+PROJECTION = ["blockchain", "contractAddress", "tokenId", "name"]
+
+
+def _wallet(count: int) -> List[Nft]:
+    return [
+        Nft(
+            blockchain=Blockchain.Eth,
+            collectionName="Collection",
+            contractAddress="0x" + "ab" * 20,
+            contractType="ERC721",
+            imageUrl=f"https://example.com/{i}.png",
+            name=f"Token #{i}",
+            symbol="TKN",
+            tokenId=str(i),
+            tokenUrl=f"https://example.com/{i}.json",
+            quantity="1",
+            traits=[Trait(trait_type="rank", value=str(i % 10))],
+        )
+        for i in range(count)
+    ]
+
+
+def reflect(assets: List[Nft]) -> List[Dict[str, Any]]:
+    """The previous get_nfts_by_owner serialization"""
+    serialized_assets = []
+    for nft in assets:
+        nft_dict = {}
+        for attr in dir(nft):
+            if not attr.startswith("__") and not callable(getattr(nft, attr)):
+                nft_dict[attr] = getattr(nft, attr)
+        serialized_assets.append(nft_dict)
+    return serialized_assets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--nfts", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    assets = _wallet(args.nfts)
+    cases = {
+        "dir() reflection": lambda: reflect(assets),
+        "to_plain": lambda: to_plain(assets),
+        "to_plain + fields": lambda: to_plain(assets, PROJECTION),
+    }
+    baseline = None
+    print(f"{args.nfts} NFTs, best of {args.repeat}")
+    print(f"{'':18} {'time ms':>9} {'speedup':>8} {'payload KiB':>12}")
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        baseline = baseline or seconds
+        payload = len(pydantic_core.to_json(case(), fallback=vars)) / 1024
+        print(f"{name:18} {seconds * 1000:9.2f} {baseline / seconds:7.1f}x {payload:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
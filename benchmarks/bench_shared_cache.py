@@ -0,0 +1,150 @@
+"""
+Multi-process benchmark for the shared cache tier
+
+Runs several worker processes, each with its own server and a simulated upstream
+with fixed latency, replaying random NFT metadata and token price lookups over a
+common key space. It runs once with per-process caches only and once with the
+shared cache tier, and reports the combined hit rate across workers.
+
+Usage:
+    python benchmarks/bench_shared_cache.py [--workers 4] [--requests 500] [--keys 500]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+# Requests each worker has in flight at once
+CONCURRENCY = 10
+
+
+def _workload(worker: int, count: int, keys: int) -> List[Dict[str, Any]]:
+    """Random metadata and price lookups drawn from a key space shared by all workers"""
+    rng = random.Random(worker)
+    calls: List[Dict[str, Any]] = []
+    for _ in range(count):
+        key = rng.randrange(keys)
+        if key % 2:
+            request = {"blockchain": "eth", "contract_address": "0xabc", "token_id": str(key)}
+            calls.append({"tool": "get_nft_metadata", "request": request})
+        else:
+            request = {"blockchain": "eth", "contract_address": f"0x{key:040x}"}
+            calls.append({"tool": "get_token_price", "request": request})
+    return calls
+
+
+async def _run(calls: List[Dict[str, Any]], latency: float) -> Dict[str, Any]:
+    upstream: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        method = json.loads(request.content)["method"]
+        upstream.append(method)
+        await asyncio.sleep(latency)
+        if method == "ankr_getTokenPrice":
+            result: Dict[str, Any] = {"blockchain": "eth", "usdPrice": "1.5"}
+        else:
+            result = {"metadata": {"blockchain": "eth", "tokenId": "1"}}
+        return httpx.Response(200, json={"result": result})
+
+    client = AnkrRpcClient("https://rpc.bench/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Benchmark")
+
+    start = time.perf_counter()
+    for i in range(0, len(calls), CONCURRENCY):
+        await asyncio.gather(
+            *[
+                mcp._mcp_call_tool(call["tool"], {"request": call["request"]})
+                for call in calls[i : i + CONCURRENCY]
+            ]
+        )
+    elapsed = time.perf_counter() - start
+    stats = json.loads((await mcp._mcp_read_resource("ankr://stats"))[0].content)
+    await client.aclose()
+    return {
+        "upstream_calls": len(upstream),
+        "shared_hits": stats.get("shared_cache", {}).get("hits", 0),
+        "elapsed": elapsed,
+    }
+
+
+def _worker(
+    worker: int,
+    count: int,
+    keys: int,
+    latency: float,
+    shared_path: Optional[str],
+    results: Any,
+) -> None:
+    os.environ.setdefault("ANKR_ENDPOINT", "https://rpc.bench/")
+    os.environ.setdefault("ANKR_PRIVATE_KEY", "benchmark")
+    if shared_path:
+        os.environ["WEB3_MCP_SHARED_CACHE"] = shared_path
+    results.put(asyncio.run(_run(_workload(worker, count, keys), latency)))
+
+
+def _deployment(args: argparse.Namespace, shared_path: Optional[str]) -> Dict[str, Any]:
+    """Run all workers concurrently and combine their results"""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=_worker,
+            args=(i, args.requests, args.keys, args.latency_ms / 1000, shared_path, results),
+        )
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    total = args.workers * args.requests
+    upstream = sum(outcome["upstream_calls"] for outcome in outcomes)
+    return {
+        "upstream_calls": upstream,
+        "shared_hits": sum(outcome["shared_hits"] for outcome in outcomes),
+        "hit_rate": 1 - upstream / total,
+        "elapsed_ms": max(outcome["elapsed"] for outcome in outcomes) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=500, help="requests per worker")
+    parser.add_argument("--keys", type=int, default=500, help="distinct lookups")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    local = _deployment(args, None)
+    with tempfile.TemporaryDirectory(dir="/dev/shm" if os.path.isdir("/dev/shm") else None) as tmp:
+        shared = _deployment(args, os.path.join(tmp, "shared.db"))
+
+    print(f"{args.workers} workers x {args.requests} requests over {args.keys} keys")
+    print(f"{'':8} {'hit rate':>9} {'upstream calls':>15} {'shared hits':>12} {'wall ms':>9}")
+    for name, result in (("local", local), ("shared", shared)):
+        print(
+            f"{name:8} {result['hit_rate']:9.1%} {result['upstream_calls']:15d}"
+            f" {result['shared_hits']:12d} {result['elapsed_ms']:9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
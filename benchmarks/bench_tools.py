@@ -0,0 +1,289 @@
+"""
+Offline benchmark of every tool against a local Advanced API stand-in
+
+Runs each registered tool of the server through the MCP tool call path against
+fake_upstream.py, with caching and rate limiting off so every call reaches the
+upstream. Reports throughput, p50/p95/p99 latency and peak traced memory per tool,
+each the median over --repeat runs, and with --check fails when a tool regressed
+against a baseline recorded on the same machine. The streaming scan_* tools need a
+client session for their notifications and are not included.
+
+Usage:
+    python benchmarks/bench_tools.py [--requests 200] [--concurrency 8]
+        [--latency-ms 20] [--items 50] [--repeat 3] [--tools get_logs,get_blocks]
+        [--check | --update-baseline] [--baseline benchmarks/baseline.json]
+        [--tolerance 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from fake_upstream import ADDRESS, HASH, FakeUpstream
+
+from web3_mcp.server import init_server
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Calls per tool in the traced memory pass; tracemalloc slows calls down, so it is
+# kept separate from the timed pass
+MEMORY_CALLS = 32
+WARMUP_CALLS = 5
+
+# Metrics checked against the baseline, with absolute slack on top of the relative
+# tolerance so tiny values do not flap. p99 is only reported: with a few hundred
+# calls it is one of the slowest handful, which scheduler jitter alone can double.
+SLACK = {"p50_ms": 1.0, "p95_ms": 2.0, "peak_kib": 256.0}
+
+# Anything that would send calls elsewhere, cache them or add work to the measurement
+_ISOLATED_ENV = (
+    "WEB3_MCP_KEY_POOL_FILE",
+    "WEB3_MCP_DISK_CACHE",
+    "WEB3_MCP_SHARED_CACHE",
+    "WEB3_MCP_METRICS",
+    "WEB3_MCP_TRACING",
+    "WEB3_MCP_PROFILE_DIR",
+    "WEB3_MCP_HEDGE",
+    "WEB3_MCP_CASSETTE",
+    "WEB3_MCP_CASSETTE_MODE",
+)
+
+WORKLOAD: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "get_nfts_by_owner": lambda i: {"blockchain": "eth", "wallet_address": f"0x{i:040x}"},
+    "get_nft_metadata": lambda i: {
+        "blockchain": "eth",
+        "contract_address": ADDRESS,
+        "token_id": str(i),
+    },
+    "get_nft_metadata_batch": lambda i: {
+        "items": [
+            {"blockchain": "eth", "contract_address": ADDRESS, "token_id": f"{i}-{j}"}
+            for j in range(10)
+        ]
+    },
+    "get_nft_holders": lambda i: {"blockchain": "eth", "contract_address": f"0x{i:040x}"},
+    "get_blockchain_stats": lambda i: {"blockchain": "eth"},
+    "get_blocks": lambda i: {"blockchain": "eth", "from_block": i * 100, "to_block": i * 100 + 9},
+    "get_logs": lambda i: {"blockchain": "eth", "address": f"0x{i:040x}"},
+    "get_transactions_by_hash": lambda i: {"blockchain": "eth", "transaction_hash": HASH},
+    "get_transactions_by_address": lambda i: {"blockchain": "eth", "wallet_address": ADDRESS},
+    "get_interactions": lambda i: {"blockchain": "eth", "wallet_address": f"0x{i:040x}"},
+    "get_account_balance": lambda i: {"blockchain": "eth", "wallet_address": f"0x{i:040x}"},
+    "get_currencies": lambda i: {"blockchain": "eth"},
+    "get_token_price": lambda i: {"blockchain": "eth", "contract_address": f"0x{i:040x}"},
+    "get_token_prices": lambda i: {
+        "items": [
+            {"blockchain": "eth", "contract_address": f"0x{i:036x}{j:04x}"} for j in range(10)
+        ]
+    },
+    "get_token_holders": lambda i: {"blockchain": "eth", "contract_address": f"0x{i:040x}"},
+    "get_token_holders_count": lambda i: {"blockchain": "eth", "contract_address": ADDRESS},
+    "get_token_transfers": lambda i: {"blockchain": "eth", "contract_address": ADDRESS},
+}
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _drive(mcp: Any, tool: str, calls: int, concurrency: int, offset: int) -> List[float]:
+    """Make calls with at most concurrency in flight and return each call's latency"""
+    latencies: List[float] = []
+    indexes = iter(range(offset, offset + calls))
+
+    async def worker() -> None:
+        for i in indexes:
+            start = time.perf_counter()
+            content = await mcp._mcp_call_tool(tool, {"request": WORKLOAD[tool](i)})
+            latencies.append(time.perf_counter() - start)
+            if "Error executing tool" in getattr(content[0], "text", ""):
+                raise RuntimeError(f"{tool} failed: {content[0].text}")
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies
+
+
+async def _bench_tool(mcp: Any, tool: str, requests: int, concurrency: int) -> Dict[str, float]:
+    await _drive(mcp, tool, WARMUP_CALLS, 1, 0)
+
+    start = time.perf_counter()
+    latencies = await _drive(mcp, tool, requests, concurrency, WARMUP_CALLS)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    await _drive(mcp, tool, MEMORY_CALLS, concurrency, WARMUP_CALLS + requests)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "throughput_rps": requests / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "peak_kib": max(0, peak - before) / 1024,
+    }
+
+
+def _median(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    return {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]}
+
+
+async def run(
+    tools: Optional[List[str]], requests: int, concurrency: int, repeat: int = 1
+) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark each tool in turn on one server (by default every registered tool)
+
+    Each tool is run `repeat` times and each metric is the median over the runs.
+    """
+    mcp = init_server(name="Benchmark")
+    registered = {tool.name for tool in await mcp._mcp_list_tools()}
+    if tools is None:
+        tools = [tool for tool in WORKLOAD if tool in registered]
+    missing = [tool for tool in tools if tool not in registered]
+    if missing:
+        raise SystemExit(f"Tools not registered by the server: {', '.join(missing)}")
+    results = {}
+    for tool in tools:
+        runs = [await _bench_tool(mcp, tool, requests, concurrency) for _ in range(repeat)]
+        results[tool] = _median(runs)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """
+    Compare results against a baseline
+
+    Args:
+        results: Metrics per tool from this run
+        baseline: Metrics per tool from the baseline
+        tolerance: Allowed relative slowdown, e.g. 0.3 for 30%
+
+    Returns:
+        One message per regressed metric
+    """
+    regressions = []
+    for tool, expected in baseline.items():
+        actual = results.get(tool)
+        if actual is None:
+            continue
+        for metric, slack in SLACK.items():
+            limit = expected[metric] * (1 + tolerance) + slack
+            if actual[metric] > limit:
+                regressions.append(
+                    f"{tool} {metric}: {actual[metric]:.1f} > {limit:.1f}"
+                    f" (baseline {expected[metric]:.1f})"
+                )
+        floor = expected["throughput_rps"] / (1 + tolerance)
+        if actual["throughput_rps"] < floor:
+            regressions.append(
+                f"{tool} throughput_rps: {actual['throughput_rps']:.1f} < {floor:.1f}"
+                f" (baseline {expected['throughput_rps']:.1f})"
+            )
+    return regressions
+
+
+def _settings(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "latency_ms": args.latency_ms,
+        "items": args.items,
+        "repeat": args.repeat,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per tool (median)")
+    parser.add_argument("--tools", help="Comma-separated tools (default: all)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="Exit 1 on regressions")
+    mode.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    tools = args.tools.split(",") if args.tools else None
+    unknown = [tool for tool in tools or [] if tool not in WORKLOAD]
+    if unknown:
+        parser.error(f"Unknown tools: {', '.join(unknown)}")
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    baseline: Optional[Dict[str, Any]] = None
+    if args.check and not os.path.exists(args.baseline):
+        # Baselines are machine-specific and not committed; record one here first
+        parser.error(f"No baseline at {args.baseline}; run with --update-baseline first")
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["settings"] != _settings(args):
+            parser.error(f"Settings differ from the baseline's: {baseline['settings']}")
+
+    for key in _ISOLATED_ENV:
+        os.environ.pop(key, None)
+    with FakeUpstream(args.latency_ms, args.items) as url:
+        os.environ.update(
+            {
+                "ANKR_ENDPOINT": url,
+                "ANKR_RPC_URL": url,
+                "ANKR_PRIVATE_KEY": "benchmark",
+                "WEB3_MCP_UPSTREAM": "rpc",
+                "WEB3_MCP_CACHE": "false",
+                "WEB3_MCP_COALESCE": "false",
+                "WEB3_MCP_RATE_LIMIT": "0",
+            }
+        )
+        results = asyncio.run(run(tools, args.requests, args.concurrency, args.repeat))
+
+    print(
+        f"{args.requests} calls per tool, {args.concurrency} concurrent, "
+        f"{args.latency_ms:g} ms upstream latency, {args.items} items per page, "
+        f"median of {args.repeat} runs"
+    )
+    print(f"{'tool':30} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak KiB':>9}")
+    for tool, result in results.items():
+        print(
+            f"{tool:30} {result['throughput_rps']:9.1f} {result['p50_ms']:8.1f}"
+            f" {result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['peak_kib']:9.0f}"
+        )
+
+    if args.update_baseline:
+        rounded = {
+            tool: {metric: round(value, 2) for metric, value in result.items()}
+            for tool, result in results.items()
+        }
+        with open(args.baseline, "w") as f:
+            json.dump({"settings": _settings(args), "tools": rounded}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    elif baseline is not None:
+        regressions = compare(results, baseline["tools"], args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Local stand-in for the Ankr Advanced API
+
+A JSON-RPC server answering every method in web3_mcp.constants with synthetic data,
+after a configurable latency and with a configurable number of items per page. It
+runs in its own process, so its work does not show up in the measured process's
+CPU time or memory.
+
+Usage:
+    python benchmarks/fake_upstream.py [--port 8545] [--latency-ms 20] [--items 50]
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from web3_mcp.constants import ADVANCED_API_METHODS
+
+ADDRESS = "0x" + "ab" * 20
+HASH = "0x" + "cd" * 32
+
+
+def _chain(params: Dict[str, Any]) -> str:
+    blockchain = params.get("blockchain")
+    if isinstance(blockchain, list):
+        blockchain = blockchain[0] if blockchain else None
+    return blockchain if isinstance(blockchain, str) else "eth"
+
+
+def _nft(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "blockchain": chain,
+        "collectionName": "Collection",
+        "contractAddress": ADDRESS,
+        "contractType": "ERC721",
+        "imageUrl": f"https://example.com/{i}.png",
+        "name": f"Token #{i}",
+        "symbol": "TKN",
+        "tokenId": str(i),
+        "tokenUrl": f"https://example.com/{i}.json",
+        "quantity": "1",
+        "traits": [{"trait_type": "rank", "value": str(i % 10)}],
+    }
+
+
+def _log(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "address": ADDRESS,
+        "blockHash": HASH,
+        "blockNumber": hex(1_000_000 + i),
+        "blockchain": chain,
+        "data": "0x" + "00" * 64,
+        "logIndex": hex(i),
+        "removed": False,
+        "topics": [HASH, HASH],
+        "transactionHash": f"0x{i:064x}",
+        "transactionIndex": "0x0",
+    }
+
+
+def _transaction(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "blockHash": HASH,
+        "blockNumber": hex(1_000_000 + i),
+        "from": ADDRESS,
+        "to": ADDRESS,
+        "transactionIndex": hex(i),
+        "value": "0x0",
+        "gasPrice": "0x3b9aca00",
+        "gas": "0x5208",
+        "cumulativeGasUsed": "0x5208",
+        "gasUsed": "0x5208",
+        "input": "0x",
+        "nonce": hex(i),
+        "hash": f"0x{i:064x}",
+        "status": "0x1",
+        "blockchain": chain,
+        "timestamp": hex(1_700_000_000 + i),
+        "type": "0x2",
+        "logs": [_log(chain, i)],
+    }
+
+
+def _block(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "blockchain": chain,
+        "number": hex(1_000_000 + i),
+        "hash": HASH,
+        "parentHash": HASH,
+        "miner": ADDRESS,
+        "gasLimit": "0x1c9c380",
+        "gasUsed": "0x5208",
+        "size": "0x220",
+        "timestamp": hex(1_700_000_000 + i),
+        "transactions": [_transaction(chain, i)],
+    }
+
+
+def _transfer(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "blockHeight": 1_000_000 + i,
+        "blockchain": chain,
+        "timestamp": 1_700_000_000 + i,
+        "tokenDecimals": 18,
+        "tokenName": "Token",
+        "tokenSymbol": "TKN",
+        "transactionHash": f"0x{i:064x}",
+        "value": "1.5",
+        "valueRawInteger": "1500000000000000000",
+        "fromAddress": ADDRESS,
+        "toAddress": ADDRESS,
+        "contractAddress": ADDRESS,
+        "tokenId": str(i),
+    }
+
+
+def _balance(chain: str, i: int) -> Dict[str, Any]:
+    return {
+        "balance": "1.5",
+        "balanceRawInteger": "1500000000000000000",
+        "balanceUsd": "3000",
+        "blockchain": chain,
+        "holderAddress": ADDRESS,
+        "tokenDecimals": 18,
+        "tokenName": f"Token {i}",
+        "tokenPrice": "2000",
+        "tokenSymbol": "TKN",
+        "tokenType": "ERC20",
+        "contractAddress": ADDRESS,
+    }
+
+
+def _items(count: int, chain: str, item: Callable[[str, int], Any]) -> List[Any]:
+    return [item(chain, i) for i in range(count)]
+
+
+def reply(method: str, params: Dict[str, Any], items: int) -> Dict[str, Any]:
+    """
+    Build a synthetic result for an Advanced API method
+
+    Args:
+        method: JSON-RPC method name from web3_mcp.constants
+        params: Request parameters
+        items: Number of items in list results
+
+    Returns:
+        The JSON-RPC result object
+    """
+    chain = _chain(params)
+    holder = {"holderAddress": ADDRESS, "balance": "1.5", "balanceRawInteger": "15"}
+    token = {"blockchain": chain, "contractAddress": params.get("contractAddress", ADDRESS)}
+    results: Dict[str, Callable[[], Dict[str, Any]]] = {
+        "ankr_getNFTsByOwner": lambda: {"owner": ADDRESS, "assets": _items(items, chain, _nft)},
+        "ankr_getNFTMetadata": lambda: {
+            "metadata": {
+                "blockchain": chain,
+                "contractAddress": params.get("contractAddress"),
+                "contractType": "ERC721",
+                "tokenId": params.get("tokenId"),
+            },
+            "attributes": {"name": "Token", "traits": _nft(chain, 0)["traits"]},
+        },
+        "ankr_getNFTHolders": lambda: {"holders": [ADDRESS] * items},
+        "ankr_getNftTransfers": lambda: {"transfers": _items(items, chain, _transfer)},
+        "ankr_getBlockchainStats": lambda: {
+            "stats": [
+                {
+                    "blockchain": chain,
+                    "latestBlockNumber": 20_000_000,
+                    "blockTimeMs": 12_000,
+                    "totalTransactionsCount": 2_000_000_000,
+                }
+            ]
+        },
+        "ankr_getBlocks": lambda: {"blocks": _items(items, chain, _block)},
+        "ankr_getLogs": lambda: {"logs": _items(items, chain, _log)},
+        "ankr_getTransactionsByHash": lambda: {"transactions": [_transaction(chain, 0)]},
+        "ankr_getTransactionsByAddress": lambda: {
+            "transactions": _items(items, chain, _transaction)
+        },
+        "ankr_getInteractions": lambda: {"blockchains": [chain]},
+        "ankr_getAccountBalance": lambda: {
+            "assets": _items(items, chain, _balance),
+            "totalBalanceUsd": str(3000 * items),
+            "totalCount": items,
+        },
+        "ankr_getCurrencies": lambda: {
+            "currencies": [
+                {"blockchain": chain, "address": ADDRESS, "name": f"Token {i}", "symbol": "TKN"}
+                for i in range(items)
+            ]
+        },
+        "ankr_getTokenPrice": lambda: {**token, "usdPrice": "2000.5"},
+        "ankr_getTokenHolders": lambda: {
+            **token,
+            "holders": [holder] * items,
+            "holdersCount": items,
+            "tokenDecimals": 18,
+        },
+        "ankr_getTokenHoldersCount": lambda: {
+            **token,
+            "latestHoldersCount": 1000,
+            "holderCountHistory": [
+                {"holderCount": 1000 - i, "lastUpdatedAt": "2024-01-01", "totalAmount": "1"}
+                for i in range(items)
+            ],
+        },
+        "ankr_getTokenTransfers": lambda: {"transfers": _items(items, chain, _transfer)},
+    }
+    return results[method]()
+
+
+class FakeAnkrHandler(BaseHTTPRequestHandler):
+    """Answers Advanced API calls after the server's latency"""
+
+    server: "FakeAnkrServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, delayed ACKs add ~40 ms
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.server.latency)
+        if body.get("method") in ADVANCED_API_METHODS:
+            result = reply(body["method"], body.get("params") or {}, self.server.items)
+            message: Dict[str, Any] = {"jsonrpc": "2.0", "id": body.get("id"), "result": result}
+        else:
+            error = {"code": -32601, "message": f"Method not found: {body.get('method')}"}
+            message = {"jsonrpc": "2.0", "id": body.get("id"), "error": error}
+        data = json.dumps(message).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeAnkrServer(ThreadingHTTPServer):
+    """HTTP server holding the latency and page size settings"""
+
+    daemon_threads = True
+    # Batch tools open many connections at once; a short backlog adds SYN retry delays
+    request_queue_size = 1024
+
+    def __init__(self, port: int, latency: float, items: int):
+        super().__init__(("127.0.0.1", port), FakeAnkrHandler)
+        self.latency = latency
+        self.items = items
+
+
+def _serve(port: int, latency: float, items: int, ready: Any) -> None:
+    server = FakeAnkrServer(port, latency, items)
+    ready.send(server.server_address[1])
+    server.serve_forever()
+
+
+class FakeUpstream:
+    """Runs the fake server in a child process for the duration of a with block"""
+
+    def __init__(self, latency_ms: float = 20.0, items: int = 50, port: int = 0):
+        self.latency = latency_ms / 1000
+        self.items = items
+        self.port = port
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+
+    def __enter__(self) -> str:
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        self._process = context.Process(
+            target=_serve, args=(self.port, self.latency, self.items, sender), daemon=True
+        )
+        self._process.start()
+        self.port = receiver.recv()
+        return f"http://127.0.0.1:{self.port}/"
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--items", type=int, default=50)
+    args = parser.parse_args()
+    server = FakeAnkrServer(args.port, args.latency_ms / 1000, args.items)
+    print(f"Fake Ankr Advanced API on http://127.0.0.1:{server.server_address[1]}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -125,6 +125,10 @@ def ankr_credentials() -> Tuple[str, str]:
     endpoint = os.environ.get("ANKR_ENDPOINT")
     private_key = os.environ.get("ANKR_PRIVATE_KEY", os.environ.get("DOTENV_PRIVATE_KEY_DEVIN"))
 
+    # Replaying a cassette (WEB3_MCP_CASSETTE) makes no network calls
+    if os.environ.get("WEB3_MCP_CASSETTE") and os.environ.get("WEB3_MCP_CASSETTE_MODE") != "record":
+        return endpoint or "https://rpc.ankr.com/multichain", private_key or "replay"
+
     if not endpoint or not private_key:
         pytest.skip("ANKR_ENDPOINT and ANKR_PRIVATE_KEY environment variables are required")
 
@@ -2,4 +2,9 @@
 Web3 MCP - An MCP server implementation wrapping Ankr Advanced API
 """
 
+from .sdk import preload_types
+
 __version__ = "0.1.0"
+
+# Before any module imports from ankr.types, so the SDK's heavy package init is skipped
+preload_types()
@@ -2,14 +2,108 @@
 Entry point for running MCP server
 """
 
+import argparse
 import os
 import sys
+from typing import List, Optional
 
+from .config import env_float, env_int, env_str
+from .metrics import Metrics, get_metrics
+from .profiling import DEFAULT_RATE as DEFAULT_PROFILE_RATE
+from .profiling import MODES as PROFILE_MODES
+from .serve import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_SHUTDOWN_TIMEOUT, run_workers, serve_sse
 from .server import init_server
+from .shared_cache import default_shared_path, remove_shared_cache
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line options, defaulting to their WEB3_MCP_* environment variables
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Parsed options
+    """
+    parser = argparse.ArgumentParser(prog="web3-mcp", description="Ankr Advanced API MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse"],
+        default=env_str("WEB3_MCP_TRANSPORT", "stdio"),
+        help="stdio serves one client; sse serves many over HTTP (default: stdio)",
+    )
+    parser.add_argument(
+        "--host",
+        default=env_str("WEB3_MCP_HOST", DEFAULT_HOST),
+        help=f"SSE listen address (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=env_int("WEB3_MCP_PORT", DEFAULT_PORT),
+        help=f"SSE port; worker N listens on port + N (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=env_int("WEB3_MCP_WORKERS", 1),
+        help="SSE worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=float,
+        default=env_float("WEB3_MCP_SHUTDOWN_TIMEOUT", DEFAULT_SHUTDOWN_TIMEOUT),
+        help=f"Seconds open connections get on shutdown (default: {DEFAULT_SHUTDOWN_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        default=env_str("WEB3_MCP_PROFILE_DIR"),
+        help="Profile sampled tool calls and write the profiles to this directory",
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=env_float("WEB3_MCP_PROFILE_RATE", DEFAULT_PROFILE_RATE),
+        help=f"Percentage of tool calls to profile (default: {DEFAULT_PROFILE_RATE:g})",
+    )
+    parser.add_argument(
+        "--profile-min-ms",
+        type=float,
+        default=env_float("WEB3_MCP_PROFILE_MIN_MS", 0.0),
+        help="Keep only profiles of calls taking at least this many ms (default: 0)",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        default=env_str("WEB3_MCP_PROFILE_MODE", "cprofile"),
+        help="cprofile writes .prof files; sample writes collapsed stacks (default: cprofile)",
+    )
+    parser.add_argument(
+        "--startup-bench",
+        action="store_true",
+        help="Measure time to the first tool response of fresh stdio servers and exit",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Server starts for --startup-bench (default: 5)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.transport == "stdio" and args.workers > 1:
+        parser.error("--workers requires --transport sse")
+    return args
 
 
 def main() -> None:
     """Run MCP server"""
+    args = parse_args()
+    if args.startup_bench:
+        from .startup_bench import run
+
+        run(args.runs)
+        return
+
     endpoint = os.environ.get("ANKR_ENDPOINT")
     private_key = os.environ.get("ANKR_PRIVATE_KEY", os.environ.get("DOTENV_PRIVATE_KEY_DEVIN"))
 
@@ -21,12 +115,45 @@ def main() -> None:
         print("Warning: ANKR_PRIVATE_KEY environment variable is not set", file=sys.stderr)
         print("Some API calls may fail without authentication", file=sys.stderr)
 
+    if args.profile_dir:
+        # Servers, including worker processes, read the profiling options from the environment
+        os.environ.update(
+            {
+                "WEB3_MCP_PROFILE_DIR": args.profile_dir,
+                "WEB3_MCP_PROFILE_RATE": str(args.profile_rate),
+                "WEB3_MCP_PROFILE_MIN_MS": str(args.profile_min_ms),
+                "WEB3_MCP_PROFILE_MODE": args.profile_mode,
+            }
+        )
+
+    if args.transport == "sse" and args.workers > 1:
+        # Workers share one cache tier, created for this deployment unless configured
+        created = "WEB3_MCP_SHARED_CACHE" not in os.environ
+        if created:
+            os.environ["WEB3_MCP_SHARED_CACHE"] = default_shared_path(str(os.getpid()))
+        try:
+            # Each worker builds its own server from the environment
+            status = run_workers(
+                init_server, args.workers, args.host, args.port, args.shutdown_timeout
+            )
+        finally:
+            if created:
+                remove_shared_cache(os.environ["WEB3_MCP_SHARED_CACHE"])
+        sys.exit(status)
+
     mcp = init_server(
         name="Ankr MCP",
         endpoint=endpoint,
         private_key=private_key,
     )
-    mcp.run()
+    if args.transport == "sse":
+        serve_sse(mcp, args.host, args.port, args.shutdown_timeout)
+    else:
+        # Without an HTTP endpoint to scrape, metrics are written out periodically
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.dump_periodically(*Metrics.dump_settings())
+        mcp.run()
 
 
 if __name__ == "__main__":
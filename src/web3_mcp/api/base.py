@@ -0,0 +1,175 @@
+"""
+Shared upstream call plumbing for the Ankr API wrappers
+"""
+
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from .. import tracing
+from ..config import env_int
+from ..executor import BlockingExecutor, get_executor
+from ..keypool import RpcTransport
+from ..metrics import get_metrics
+from ..ratelimit import RateLimiter
+from ..resilience import CircuitBreaker, Hedger
+
+if TYPE_CHECKING:
+    from ankr import AnkrWeb3
+
+DEFAULT_MAX_PAGE_SIZE = 1000
+
+RequestT = TypeVar("RequestT", bound=BaseModel)
+
+
+def _rows(reply: Any) -> int:
+    """Number of items in a reply: the length of its first list attribute"""
+    for value in getattr(reply, "__dict__", {}).values():
+        if isinstance(value, list):
+            return len(value)
+    return 0
+
+
+class BaseApi:
+    """Base class routing Advanced API calls through the native client or the Ankr SDK"""
+
+    # Attribute of AnkrWeb3 holding the SDK API object ("nft", "query" or "token")
+    sdk_api = ""
+
+    def __init__(
+        self,
+        client: Optional["AnkrWeb3"],
+        executor: Optional[BlockingExecutor] = None,
+        rpc: Optional[RpcTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        hedger: Optional[Hedger] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the API wrapper
+
+        Args:
+            client: Ankr SDK client, used when no native client is given (None if unused)
+            executor: Executor for blocking SDK calls (defaults to the shared executor)
+            rpc: Native JSON-RPC client or key pool; when set, calls bypass the SDK transport
+            limiter: Rate limiter with retries shared by all wrappers (None to call directly)
+            hedger: Hedger for slow idempotent reads (None to never hedge)
+            breaker: Per-method circuit breaker (None to always call upstream)
+        """
+        self.client = client
+        self.executor = executor or get_executor()
+        self.rpc = rpc
+        self.limiter = limiter
+        self.hedger = hedger
+        self.breaker = breaker
+        self.max_page_size = env_int("WEB3_MCP_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE)
+
+    def _page_size(self, page_size: Optional[int]) -> Optional[int]:
+        """Clamp a requested page size to the per-call maximum (WEB3_MCP_MAX_PAGE_SIZE)"""
+        if page_size is None:
+            return None
+        return max(1, min(page_size, self.max_page_size))
+
+    async def _call(self, method: str, request: Any, reply: Any) -> Any:
+        """
+        Call an Advanced API method through the circuit breaker, rate limiter and hedger
+
+        Each layer is skipped when it is not set. The breaker sees the outcome after
+        retries, and every retry attempt may be hedged; a hedged request takes its own
+        rate limiter token. With tracing on, the call is
+        one page span, counted towards the tool span's pages and rows.
+
+        Args:
+            method: JSON-RPC method name from constants
+            request: Ankr SDK request object
+            reply: Ankr SDK reply type used to parse the result
+
+        Returns:
+            Parsed reply object
+
+        Raises:
+            CircuitOpenError: If the method's circuit is open
+        """
+
+        async def attempt() -> Any:
+            if self.hedger is None:
+                return await self._call_upstream(method, request, reply)
+            return await self.hedger.call(
+                method, lambda: self._call_upstream(method, request, reply), hedge
+            )
+
+        async def hedge() -> Any:
+            # The limiter took a token for the attempt; the duplicate request needs its own
+            if self.limiter is not None:
+                await self.limiter.acquire(method)
+            return await self._call_upstream(method, request, reply)
+
+        async def limited() -> Any:
+            if self.limiter is None:
+                return await attempt()
+            return await self.limiter.call(method, attempt)
+
+        with tracing.span(
+            method,
+            blockchain=getattr(request, "blockchain", None),
+            continued=bool(getattr(request, "pageToken", None)),
+        ) as page:
+            if self.breaker is None:
+                result = await limited()
+            else:
+                result = await self.breaker.call(method, limited)
+            if tracing.get_tracer() is not None:
+                rows = _rows(result)
+                page.set_attribute("rows", rows)
+                tracing.count(pages=1, rows=rows)
+            return result
+
+    async def _call_upstream(self, method: str, request: Any, reply: Any) -> Any:
+        """Make one upstream call through the native client or the SDK, timed when metrics are on"""
+        metrics = get_metrics()
+        if metrics is None:
+            return await self._request(method, request, reply)
+        return await metrics.track_upstream(method, lambda: self._request(method, request, reply))
+
+    async def _request(self, method: str, request: Any, reply: Any) -> Any:
+        """Send one request through the native client or the SDK"""
+        if self.rpc is not None:
+            result = await self.rpc.call(method, request.to_dict())
+            with tracing.span("decode"):
+                return reply.from_dict(**result)
+
+        if self.client is None:
+            raise RuntimeError("No upstream client configured")
+        provider = getattr(self.client, self.sdk_api).provider
+        with tracing.span("sdk request", method=method):
+            return await self.executor.run(
+                provider.call_method, rpc=method, request=request, reply=reply
+            )
+
+    async def _iter_pages(
+        self,
+        fetch: Callable[[RequestT], Awaitable[Dict[str, Any]]],
+        request: RequestT,
+        max_pages: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield pages one at a time, following next_page_token
+
+        Args:
+            fetch: Single-page wrapper method, e.g. QueryApi.get_logs
+            request: Request model for the first page
+            max_pages: Stop after this many pages (None for no limit)
+
+        Yields:
+            Each page as returned by fetch
+        """
+        pages = 0
+        while True:
+            page = await fetch(request)
+            pages += 1
+            yield page
+
+            next_page_token = page.get("next_page_token")
+            if not next_page_token or (max_pages is not None and pages >= max_pages):
+                return
+            request = request.model_copy(update={"page_token": next_page_token})
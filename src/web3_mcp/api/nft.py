@@ -2,11 +2,24 @@
 NFT API implementation for Ankr Advanced API
 """
 
-from typing import Any, Dict, List, Optional
-
-from ankr import AnkrWeb3
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ankr.types import (
+    GetNFTHoldersReply,
+    GetNFTHoldersRequest,
+    GetNFTMetadataReply,
+    GetNFTMetadataRequest,
+    GetNFTsByOwnerReply,
+    GetNFTsByOwnerRequest,
+    GetNftTransfersReply,
+    GetTransfersRequest,
+)
 from pydantic import BaseModel, Field
 
+from ..constants import NFT_GET_BY_OWNER, NFT_GET_HOLDERS, NFT_GET_METADATA, NFT_GET_TRANSFERS
+from ..serialize import to_plain
+from .base import BaseApi
+
 
 class NFTCollection(BaseModel):
     blockchain: str
@@ -31,6 +44,7 @@ class NFTByOwnerRequest(BaseModel):
     blockchain: Optional[str] = None
     page_token: Optional[str] = None
     page_size: Optional[int] = 50
+    fields: Optional[List[str]] = None
 
 
 class NFTMetadataRequest(BaseModel):
@@ -39,6 +53,10 @@ class NFTMetadataRequest(BaseModel):
     token_id: str
 
 
+class NFTMetadataBatchRequest(BaseModel):
+    items: List[NFTMetadataRequest]
+
+
 class NFTHoldersRequest(BaseModel):
     blockchain: str
     contract_address: str
@@ -57,50 +75,30 @@ class NFTTransfersRequest(BaseModel):
     page_size: Optional[int] = 50
 
 
-class NFTApi:
+class NFTApi(BaseApi):
     """Wrapper for Ankr NFT API methods"""
 
-    def __init__(self, client: AnkrWeb3):
-        self.client = client
+    sdk_api = "nft"
 
     async def get_nfts_by_owner(self, request: NFTByOwnerRequest) -> Dict[str, Any]:
         """Get NFTs owned by a wallet address"""
-        from ankr.types import GetNFTsByOwnerRequest
-
-        try:
-            ankr_request = GetNFTsByOwnerRequest(
-                walletAddress=request.wallet_address,
-                blockchain=request.blockchain if request.blockchain else None,
-            )
-
-            if request.page_size is not None:
-                ankr_request.pageSize = request.page_size
-
-            if request.page_token:
-                ankr_request.pageToken = request.page_token
+        ankr_request = GetNFTsByOwnerRequest(
+            walletAddress=request.wallet_address,
+            blockchain=request.blockchain if request.blockchain else None,
+        )
 
-            result = self.client.nft.get_nfts(ankr_request)
-            assets = list(result) if result else []
+        if request.page_size is not None:
+            ankr_request.pageSize = self._page_size(request.page_size)
 
-            # Serialize NFT objects to dictionaries
-            serialized_assets = []
-            for nft in assets:
-                nft_dict = {}
-                # Add all attributes from the NFT object to the dictionary
-                for attr in dir(nft):
-                    if not attr.startswith("__") and not callable(getattr(nft, attr)):
-                        nft_dict[attr] = getattr(nft, attr)
-                serialized_assets.append(nft_dict)
+        if request.page_token:
+            ankr_request.pageToken = request.page_token
 
-            return {"assets": serialized_assets, "next_page_token": ""}
-        except Exception as e:
-            print(f"Error in get_nfts_by_owner: {e}")
-            return {"assets": [], "next_page_token": ""}
+        reply = await self._call(NFT_GET_BY_OWNER, ankr_request, GetNFTsByOwnerReply)
+        assets = to_plain(reply.assets or [], request.fields)
+        return {"assets": assets, "next_page_token": reply.nextPageToken or ""}
 
     async def get_nft_metadata(self, request: NFTMetadataRequest) -> Dict[str, Any]:
         """Get metadata for a specific NFT"""
-        from ankr.types import GetNFTMetadataRequest
-
         ankr_request = GetNFTMetadataRequest(
             blockchain=request.blockchain,
             contractAddress=request.contract_address,
@@ -108,9 +106,9 @@ class NFTApi:
             forceFetch=True,
         )
 
-        result = self.client.nft.get_nft_metadata(ankr_request)
+        result = await self._call(NFT_GET_METADATA, ankr_request, GetNFTMetadataReply)
         if hasattr(result, "__dict__"):
-            return result.__dict__
+            return to_plain(result)
         return {
             "name": getattr(result, "name", ""),
             "description": getattr(result, "description", ""),
@@ -120,44 +118,44 @@ class NFTApi:
 
     async def get_nft_holders(self, request: NFTHoldersRequest) -> Dict[str, Any]:
         """Get holders of a specific NFT collection"""
-        from ankr.types import GetNFTHoldersRequest
-
         ankr_request = GetNFTHoldersRequest(
             blockchain=request.blockchain,
             contractAddress=request.contract_address,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.nft.get_nft_holders(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
+        reply = await self._call(NFT_GET_HOLDERS, ankr_request, GetNFTHoldersReply)
+        holders = to_plain(reply.holders or [])
+        return {"holders": holders, "next_page_token": reply.nextPageToken or ""}
 
-        if hasattr(result, "__iter__"):
-            holders = list(result) if result else []
-            return {"holders": holders, "next_page_token": ""}
-        return {"holders": [], "next_page_token": ""}
+    def iter_nft_holders(
+        self, request: NFTHoldersRequest, max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over holders of an NFT collection one page at a time"""
+        return self._iter_pages(self.get_nft_holders, request, max_pages)
 
     async def get_nft_transfers(self, request: NFTTransfersRequest) -> Dict[str, Any]:
         """Get transfer history for NFTs"""
-        from ankr.types import GetNFTTransfersRequest
-
-        ankr_request = GetNFTTransfersRequest(
+        # ankr_getNftTransfers filters by address only; contract and token are matched here
+        ankr_request = GetTransfersRequest(
             blockchain=request.blockchain,
-            contractAddress=request.contract_address,
-            tokenId=request.token_id,
-            walletAddress=request.wallet_address,
+            address=[request.wallet_address] if request.wallet_address else None,
             fromBlock=request.from_block,
             toBlock=request.to_block,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.nft.get_nft_transfers(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
-
-        if hasattr(result, "__iter__"):
-            transfers = list(result) if result else []
-            return {"transfers": transfers, "next_page_token": ""}
-        return {"transfers": [], "next_page_token": ""}
+        reply = await self._call(NFT_GET_TRANSFERS, ankr_request, GetNftTransfersReply)
+        transfers = [
+            transfer
+            for transfer in to_plain(reply.transfers or [])
+            if (
+                not request.contract_address
+                or (transfer.get("contractAddress") or "").lower()
+                == request.contract_address.lower()
+            )
+            and (not request.token_id or transfer.get("tokenId") == request.token_id)
+        ]
+        return {"transfers": transfers, "next_page_token": reply.nextPageToken or ""}
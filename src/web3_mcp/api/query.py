@@ -2,11 +2,78 @@
 Query API implementation for Ankr Advanced API
 """
 
-from typing import Any, Dict, List, Optional
-
-from ankr import AnkrWeb3
+import asyncio
+import re
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ankr.types import (
+    GetBlockchainStatsReply,
+    GetBlockchainStatsRequest,
+    GetBlocksReply,
+    GetBlocksRequest,
+    GetInteractionsReply,
+    GetInteractionsRequest,
+    GetLogsReply,
+    GetLogsRequest,
+    GetTransactionsByAddressReply,
+    GetTransactionsByAddressRequest,
+    GetTransactionsByHashReply,
+    GetTransactionsByHashRequest,
+)
 from pydantic import BaseModel
 
+from ..config import env_int
+from ..constants import (
+    QUERY_GET_BLOCKCHAIN_STATS,
+    QUERY_GET_BLOCKS,
+    QUERY_GET_INTERACTIONS,
+    QUERY_GET_LOGS,
+    QUERY_GET_TRANSACTIONS_BY_ADDRESS,
+    QUERY_GET_TRANSACTIONS_BY_HASH,
+)
+from ..executor import BlockingExecutor
+from ..keypool import RpcTransport
+from ..ratelimit import RateLimiter
+from ..resilience import CircuitBreaker, Hedger
+from ..serialize import to_plain
+from .base import BaseApi
+
+if TYPE_CHECKING:
+    from ankr import AnkrWeb3
+
+DEFAULT_LOG_SHARD_BLOCKS = 2000
+DEFAULT_LOG_SHARD_CONCURRENCY = 4
+
+# Page tokens of sharded log scans: "s1.<block>.<logs of that block already returned>"
+LOG_CURSOR_PREFIX = "s1."
+
+# Upstream errors asking for a narrower block range
+_TOO_MANY_RESULTS = re.compile(r"too many|too large|limit exceeded|exceeds|range is too", re.I)
+
+
+_LOG_ORDER_FIELDS = ("blockNumber", "logIndex")
+
+
+def _log_position(log: Dict[str, Any]) -> Tuple[int, int]:
+    """Return (block number, log index) of a log, which upstream gives as hex strings"""
+    position = []
+    for name in _LOG_ORDER_FIELDS:
+        value = log.get(name)
+        position.append(int(value, 0) if isinstance(value, str) else int(value or 0))
+    return position[0], position[1]
+
+
+def _encode_log_cursor(block: int, skip: int) -> str:
+    return f"{LOG_CURSOR_PREFIX}{block}.{skip}"
+
+
+def _decode_log_cursor(token: str) -> Tuple[int, int]:
+    try:
+        block, skip = token[len(LOG_CURSOR_PREFIX) :].split(".")
+        return int(block), int(skip)
+    except ValueError:
+        raise ValueError(f"Invalid page token: {token!r}")
+
 
 class BlockchainStatsRequest(BaseModel):
     blockchain: str
@@ -19,6 +86,7 @@ class BlocksRequest(BaseModel):
     descending_order: Optional[bool] = None
     page_token: Optional[str] = None
     page_size: Optional[int] = 50
+    fields: Optional[List[str]] = None
 
 
 class LogsRequest(BaseModel):
@@ -30,6 +98,7 @@ class LogsRequest(BaseModel):
     descending_order: Optional[bool] = None
     page_token: Optional[str] = None
     page_size: Optional[int] = 50
+    fields: Optional[List[str]] = None
 
 
 class TransactionsByHashRequest(BaseModel):
@@ -58,21 +127,35 @@ class InteractionsRequest(BaseModel):
     page_size: Optional[int] = 50
 
 
-class QueryApi:
+class QueryApi(BaseApi):
     """Wrapper for Ankr Query API methods"""
 
-    def __init__(self, client: AnkrWeb3):
-        self.client = client
+    sdk_api = "query"
+
+    def __init__(
+        self,
+        client: Optional["AnkrWeb3"],
+        executor: Optional[BlockingExecutor] = None,
+        rpc: Optional[RpcTransport] = None,
+        limiter: Optional[RateLimiter] = None,
+        hedger: Optional[Hedger] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        super().__init__(client, executor, rpc, limiter, hedger, breaker)
+        self.log_shard_blocks = env_int("WEB3_MCP_LOG_SHARD_BLOCKS", DEFAULT_LOG_SHARD_BLOCKS)
+        self.log_shard_concurrency = max(
+            1, env_int("WEB3_MCP_LOG_SHARD_CONCURRENCY", DEFAULT_LOG_SHARD_CONCURRENCY)
+        )
 
     async def get_blockchain_stats(self, request: BlockchainStatsRequest) -> Dict[str, Any]:
         """Get blockchain statistics"""
-        from ankr.types import GetBlockchainStatsRequest
-
         ankr_request = GetBlockchainStatsRequest(blockchain=request.blockchain)
 
-        result = self.client.query.get_blockchain_stats(ankr_request)
+        reply = await self._call(QUERY_GET_BLOCKCHAIN_STATS, ankr_request, GetBlockchainStatsReply)
+        # The reply holds one stats entry per requested chain
+        result = reply.stats[0] if reply.stats else None
         if hasattr(result, "__dict__"):
-            return {"stats": result.__dict__}
+            return {"stats": to_plain(result)}
 
         stats = {
             "lastBlockNumber": getattr(result, "lastBlockNumber", 0),
@@ -83,33 +166,73 @@ class QueryApi:
 
     async def get_blocks(self, request: BlocksRequest) -> Dict[str, Any]:
         """Get blocks information"""
-        from ankr.types import GetBlocksRequest
-
         params = {"blockchain": request.blockchain}
 
-        if request.from_block is not None:
-            params["fromBlock"] = str(request.from_block)
-
-        if request.to_block is not None:
-            params["toBlock"] = str(request.to_block)
+        # ankr_getBlocks has no upstream page token, so pages are windows of page_size
+        # blocks within the requested range and the page token is the next window's edge
+        from_block, to_block = request.from_block, request.to_block
+        next_page_token = ""
+        page_size = self._page_size(request.page_size)
+        if from_block is not None and to_block is not None and page_size:
+            if request.descending_order:
+                if request.page_token:
+                    to_block = int(request.page_token)
+                window_end = max(from_block, to_block - page_size + 1)
+                if window_end > from_block:
+                    next_page_token = str(window_end - 1)
+                from_block = window_end
+            else:
+                if request.page_token:
+                    from_block = int(request.page_token)
+                window_end = min(to_block, from_block + page_size - 1)
+                if window_end < to_block:
+                    next_page_token = str(window_end + 1)
+                to_block = window_end
+
+        if from_block is not None:
+            params["fromBlock"] = str(from_block)
+
+        if to_block is not None:
+            params["toBlock"] = str(to_block)
 
         if request.descending_order is not None:
             params["descOrder"] = str(request.descending_order).lower()
 
         ankr_request = GetBlocksRequest(**params)
 
-        result = self.client.query.get_blocks(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
-        if hasattr(result, "__iter__"):
-            blocks = list(result) if result else []
-            return {"blocks": blocks, "next_page_token": ""}
-        return {"blocks": [], "next_page_token": ""}
+        reply = await self._call(QUERY_GET_BLOCKS, ankr_request, GetBlocksReply)
+        blocks = to_plain(reply.blocks or [], request.fields)
+        return {"blocks": blocks, "next_page_token": next_page_token}
 
-    async def get_logs(self, request: LogsRequest) -> Dict[str, Any]:
-        """Get blockchain logs"""
-        from ankr.types import GetLogsRequest
+    def iter_blocks(
+        self, request: BlocksRequest, max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over blocks one page at a time"""
+        return self._iter_pages(self.get_blocks, request, max_pages)
 
+    async def get_logs(self, request: LogsRequest) -> Dict[str, Any]:
+        """
+        Get blockchain logs
+
+        Ranges wider than WEB3_MCP_LOG_SHARD_BLOCKS are split into block-range shards
+        fetched concurrently; their pages use a sharded cursor as next_page_token.
+        """
+        page_token = request.page_token or ""
+        if page_token.startswith(LOG_CURSOR_PREFIX) or (
+            not page_token and self._shardable(request)
+        ):
+            return await self._get_logs_sharded(request)
+        return await self._get_logs_page(request)
+
+    def _shardable(self, request: LogsRequest) -> bool:
+        if self.log_shard_blocks <= 0:
+            return False
+        if request.from_block is None or request.to_block is None:
+            return False
+        return request.to_block - request.from_block + 1 > self.log_shard_blocks
+
+    async def _get_logs_page(self, request: LogsRequest) -> Dict[str, Any]:
+        """Fetch one upstream page of logs"""
         ankr_request = GetLogsRequest(
             blockchain=request.blockchain,
             fromBlock=request.from_block,
@@ -118,28 +241,150 @@ class QueryApi:
             topics=request.topics,
             descOrder=request.descending_order,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.query.get_logs(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
-        if hasattr(result, "__iter__"):
-            logs = list(result) if result else []
-            return {"logs": logs, "next_page_token": ""}
-        return {"logs": [], "next_page_token": ""}
+        reply = await self._call(QUERY_GET_LOGS, ankr_request, GetLogsReply)
+        logs = to_plain(reply.logs or [], request.fields)
+        return {"logs": logs, "next_page_token": reply.nextPageToken or ""}
+
+    async def _get_logs_sharded(self, request: LogsRequest) -> Dict[str, Any]:
+        """
+        Fetch one page of logs from a wide block range using concurrent shards
+
+        Shards are fetched in waves of up to WEB3_MCP_LOG_SHARD_CONCURRENCY and merged
+        in block/log-index order, each asking upstream for no more logs than the page
+        still needs; later shards are cancelled once earlier ones fill the page. A shard
+        that upstream rejects as too large is split in half, and later waves use the
+        smaller shard size; sparse waves double it.
+
+        Args:
+            request: Logs request with from_block and to_block set
+
+        Returns:
+            Logs and the cursor to resume from ("" when the range is exhausted)
+        """
+        assert request.from_block is not None and request.to_block is not None
+        first, last = request.from_block, request.to_block
+        descending = bool(request.descending_order)
+        page_size = self._page_size(request.page_size) or self.max_page_size
+
+        cursor, skip = first if not descending else last, 0
+        if request.page_token:
+            cursor, skip = _decode_log_cursor(request.page_token)
+
+        # The first `skip` logs of the cursor block were returned by the previous page
+        need = page_size + skip
+        shard_blocks = self.log_shard_blocks
+        split = False
+
+        # Shards keep the ordering fields, which the final projection drops again
+        fields = request.fields
+        shard_fields = None if fields is None else [*fields, *_LOG_ORDER_FIELDS]
+
+        async def scan(start: int, end: int, limit: int) -> List[Any]:
+            """Return up to `limit` logs of [start, end] in request order"""
+            nonlocal split
+            shard = request.model_copy(
+                update={
+                    "from_block": start,
+                    "to_block": end,
+                    "page_token": None,
+                    # No shard can contribute more than `limit` logs to the page
+                    "page_size": min(limit, self.max_page_size),
+                    "fields": shard_fields,
+                }
+            )
+            logs: List[Any] = []
+            try:
+                while len(logs) < limit:
+                    page = await self._get_logs_page(shard)
+                    logs.extend(page["logs"])
+                    if not page["next_page_token"]:
+                        break
+                    shard = shard.model_copy(update={"page_token": page["next_page_token"]})
+            except Exception as e:
+                if start == end or not _TOO_MANY_RESULTS.search(str(e)):
+                    raise
+                split = True
+                middle = (start + end) // 2
+                halves = [(start, middle), (middle + 1, end)]
+                logs = []
+                for low, high in reversed(halves) if descending else halves:
+                    logs.extend(await scan(low, high, limit - len(logs)))
+                    if len(logs) >= limit:
+                        break
+            logs.sort(key=_log_position, reverse=descending)
+            return logs
+
+        collected: List[Any] = []
+        while len(collected) < need and first <= cursor <= last:
+            shards = []
+            for _ in range(self.log_shard_concurrency):
+                if not first <= cursor <= last:
+                    break
+                if descending:
+                    start = max(first, cursor - shard_blocks + 1)
+                    shards.append((start, cursor))
+                    cursor = start - 1
+                else:
+                    end = min(last, cursor + shard_blocks - 1)
+                    shards.append((cursor, end))
+                    cursor = end + 1
+
+            remaining = need - len(collected)
+            split = False
+            # Shards are consumed in request order; once the earlier ones fill the page,
+            # the later ones are cancelled instead of fetching logs that are dropped
+            tasks = [asyncio.ensure_future(scan(start, end, remaining)) for start, end in shards]
+            wave_count = 0
+            try:
+                for task in tasks:
+                    logs = await task
+                    collected.extend(logs)
+                    wave_count += len(logs)
+                    if len(collected) >= need:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            if split:
+                shard_blocks = max(1, shard_blocks // 2)
+            elif wave_count < remaining // 2:
+                shard_blocks *= 2
+
+        next_page_token = ""
+        if len(collected) >= need:
+            collected = collected[:need]
+            last_block = _log_position(collected[-1])[0]
+            returned = sum(1 for log in collected if _log_position(log)[0] == last_block)
+            next_page_token = _encode_log_cursor(last_block, returned)
+
+        logs = collected[skip:]
+        if fields is not None:
+            logs = to_plain(logs, fields)
+        return {"logs": logs, "next_page_token": next_page_token}
+
+    def iter_logs(
+        self, request: LogsRequest, max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over blockchain logs one page at a time"""
+        return self._iter_pages(self.get_logs, request, max_pages)
 
     async def get_transactions_by_hash(self, request: TransactionsByHashRequest) -> Dict[str, Any]:
         """Get transactions by hash"""
-        from ankr.types import GetTransactionByHashRequest
-
-        ankr_request = GetTransactionByHashRequest(
-            blockchain=request.blockchain, transaction_hash=request.transaction_hash
+        ankr_request = GetTransactionsByHashRequest(
+            transactionHash=request.transaction_hash, blockchain=request.blockchain
         )
 
-        result = self.client.query.get_transaction_by_hash(ankr_request)
+        reply = await self._call(
+            QUERY_GET_TRANSACTIONS_BY_HASH, ankr_request, GetTransactionsByHashReply
+        )
+        result = reply.transactions[0] if reply.transactions else None
         if hasattr(result, "__dict__"):
-            return result.__dict__
+            return to_plain(result)
         return {
             "hash": getattr(result, "hash", ""),
             "from": getattr(result, "from", ""),
@@ -151,8 +396,6 @@ class QueryApi:
         self, request: TransactionsByAddressRequest
     ) -> Dict[str, Any]:
         """Get transactions by address"""
-        from ankr.types import GetTransactionsByAddressRequest
-
         ankr_request = GetTransactionsByAddressRequest(
             blockchain=request.blockchain,
             walletAddress=request.wallet_address,
@@ -160,21 +403,19 @@ class QueryApi:
             toBlock=request.to_block,
             descOrder=request.descending_order,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.query.get_transactions_by_address(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
-        if hasattr(result, "__iter__"):
-            transactions = list(result) if result else []
-            return {"transactions": transactions, "next_page_token": ""}
-        return {"transactions": [], "next_page_token": ""}
+        reply = await self._call(
+            QUERY_GET_TRANSACTIONS_BY_ADDRESS, ankr_request, GetTransactionsByAddressReply
+        )
+        return {
+            "transactions": to_plain(reply.transactions or []),
+            "next_page_token": reply.nextPageToken or "",
+        }
 
     async def get_interactions(self, request: InteractionsRequest) -> Dict[str, Any]:
         """Get wallet interactions with contracts"""
-        from ankr.types import GetInteractionsRequest
-
         ankr_request = GetInteractionsRequest(
             blockchain=request.blockchain,
             walletAddress=request.wallet_address,
@@ -183,13 +424,9 @@ class QueryApi:
             contractAddress=request.contract_address,
             descOrder=request.descending_order,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.query.get_interactions(ankr_request)
-        if hasattr(result, "__dict__"):
-            return result.__dict__
-        if hasattr(result, "__iter__"):
-            interactions = list(result) if result else []
-            return {"interactions": interactions, "next_page_token": ""}
-        return {"interactions": [], "next_page_token": ""}
+        reply = await self._call(QUERY_GET_INTERACTIONS, ankr_request, GetInteractionsReply)
+        interactions = to_plain(reply.blockchains or [])
+        return {"interactions": interactions, "next_page_token": ""}
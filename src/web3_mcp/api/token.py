@@ -5,9 +5,33 @@ Token API implementation for Ankr Advanced API
 import json
 from typing import Any, Dict, List, Optional
 
-from ankr import AnkrWeb3
+from ankr.types import (
+    GetAccountBalanceReply,
+    GetAccountBalanceRequest,
+    GetCurrenciesReply,
+    GetCurrenciesRequest,
+    GetTokenHoldersCountReply,
+    GetTokenHoldersCountRequest,
+    GetTokenHoldersReply,
+    GetTokenHoldersRequest,
+    GetTokenPriceReply,
+    GetTokenPriceRequest,
+    GetTokenTransfersReply,
+    GetTransfersRequest,
+)
 from pydantic import BaseModel
 
+from ..constants import (
+    TOKEN_GET_ACCOUNT_BALANCE,
+    TOKEN_GET_CURRENCIES,
+    TOKEN_GET_TOKEN_HOLDERS,
+    TOKEN_GET_TOKEN_HOLDERS_COUNT,
+    TOKEN_GET_TOKEN_PRICE,
+    TOKEN_GET_TOKEN_TRANSFERS,
+)
+from ..serialize import to_plain
+from .base import BaseApi
+
 
 class AccountBalanceRequest(BaseModel):
     """Request model for getting token balances"""
@@ -19,6 +43,7 @@ class AccountBalanceRequest(BaseModel):
     erc20_only: Optional[bool] = None
     native_only: Optional[bool] = None
     tokens_only: Optional[bool] = None
+    fields: Optional[List[str]] = None
 
 
 class CurrenciesRequest(BaseModel):
@@ -32,6 +57,10 @@ class TokenPriceRequest(BaseModel):
     contract_address: str
 
 
+class TokenPricesRequest(BaseModel):
+    items: List[TokenPriceRequest]
+
+
 # Not provided as a tool, but needed for internal functionality
 class TokenHoldersRequest(BaseModel):
     blockchain: str
@@ -83,49 +112,43 @@ class TokenTransfersResponse(BaseModel):
     next_page_token: str = ""
 
 
-class TokenApi:
+class TokenApi(BaseApi):
     """Wrapper for Ankr Token API methods"""
 
-    def __init__(self, client: AnkrWeb3):
-        self.client = client
+    sdk_api = "token"
 
     async def get_account_balance(self, request: AccountBalanceRequest) -> Dict[str, Any]:
         """Get token balances for a wallet address"""
-        from ankr.types import GetAccountBalanceRequest
-
         ankr_request = GetAccountBalanceRequest(
             walletAddress=request.wallet_address,
             blockchain=request.blockchain,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.token.get_account_balance(ankr_request)
-        balances = [balance.__dict__ for balance in result] if result else []
-        return {"assets": balances}
+        reply = await self._call(TOKEN_GET_ACCOUNT_BALANCE, ankr_request, GetAccountBalanceReply)
+        balances = to_plain(reply.assets or [], request.fields)
+        return {"assets": balances, "next_page_token": reply.nextPageToken or ""}
 
     async def get_currencies(self, request: CurrenciesRequest) -> CurrenciesResponse:
         """Get available currencies"""
-        from ankr.types import GetCurrenciesRequest
-
         ankr_request = GetCurrenciesRequest(
             blockchain=request.blockchain if request.blockchain else None,
         )
 
-        result = self.client.token.get_currencies(ankr_request)
-        currencies = list(result) if result else []
+        reply = await self._call(TOKEN_GET_CURRENCIES, ankr_request, GetCurrenciesReply)
+        currencies = to_plain(reply.currencies or [])
         return CurrenciesResponse(currencies=currencies)
 
     async def get_token_price(self, request: TokenPriceRequest) -> Dict[str, Any]:
         """Get token price information"""
-        from ankr.types import GetTokenPriceRequest
-
         ankr_request = GetTokenPriceRequest(
             blockchain=request.blockchain,
             contractAddress=request.contract_address,
         )
 
-        result = self.client.token.get_token_price(ankr_request)
+        reply = await self._call(TOKEN_GET_TOKEN_PRICE, ankr_request, GetTokenPriceReply)
+        result = reply.usdPrice
         if not result:
             raise ValueError("Failed to get token price: result is None")
 
@@ -168,47 +191,54 @@ class TokenApi:
     # Not provided as a tool, but needed for internal functionality
     async def get_token_holders(self, request: TokenHoldersRequest) -> TokenHoldersResponse:
         """Get token holders"""
-        from ankr.types import GetTokenHoldersRequest
-
         ankr_request = GetTokenHoldersRequest(
             blockchain=request.blockchain,
             contractAddress=request.contract_address,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.token.get_token_holders(ankr_request)
-        holders = list(result) if result else []
-        return TokenHoldersResponse(holders=holders, next_page_token="")
+        reply = await self._call(TOKEN_GET_TOKEN_HOLDERS, ankr_request, GetTokenHoldersReply)
+        return TokenHoldersResponse(
+            holders=to_plain(reply.holders or []), next_page_token=reply.nextPageToken or ""
+        )
 
     async def get_token_holders_count(
         self, request: TokenHoldersCountRequest
     ) -> TokenHoldersCountResponse:
         """Get token holders count"""
-        from ankr.types import GetTokenHoldersCountRequest
-
         ankr_request = GetTokenHoldersCountRequest(
             blockchain=request.blockchain,
             contractAddress=request.contract_address,
         )
 
-        result = self.client.token.get_token_holders_count(ankr_request)
-        count = result.count if hasattr(result, "count") else 0
+        ankr_request.pageSize = 1
+        reply = await self._call(
+            TOKEN_GET_TOKEN_HOLDERS_COUNT, ankr_request, GetTokenHoldersCountReply
+        )
+        history = reply.holderCountHistory or []
+        count = history[0].count if history and hasattr(history[0], "count") else 0
         return TokenHoldersCountResponse(count=count)
 
     async def get_token_transfers(self, request: TokenTransfersRequest) -> TokenTransfersResponse:
         """Get token transfers"""
-        from ankr.types import GetTokenTransfersRequest
-
-        ankr_request = GetTokenTransfersRequest(
+        # ankr_getTokenTransfers filters by address only; the contract is matched here
+        ankr_request = GetTransfersRequest(
             blockchain=request.blockchain,
-            contractAddress=request.contract_address,
+            address=[request.wallet_address] if request.wallet_address else None,
             fromBlock=request.from_block,
             toBlock=request.to_block,
             pageToken=request.page_token,
-            pageSize=request.page_size,
+            pageSize=self._page_size(request.page_size),
         )
 
-        result = self.client.token.get_token_transfers(ankr_request)
-        transfers = list(result) if result else []
-        return TokenTransfersResponse(transfers=transfers, next_page_token="")
+        reply = await self._call(TOKEN_GET_TOKEN_TRANSFERS, ankr_request, GetTokenTransfersReply)
+        transfers = [
+            transfer
+            for transfer in to_plain(reply.transfers or [])
+            if not request.contract_address
+            or (transfer.get("contractAddress") or "").lower() == request.contract_address.lower()
+        ]
+        return TokenTransfersResponse(
+            transfers=transfers, next_page_token=reply.nextPageToken or ""
+        )
@@ -3,35 +3,100 @@ Authentication module for Ankr API
 """
 
 import os
-from typing import Optional
+import sys
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
 
-from ankr import AnkrWeb3
+from .cassette import Cassette
+from .constants import ANKR_MULTICHAIN_URL
+from .keypool import RpcPool, RpcTransport, load_pool_file, parse_pool
+from .rpc import AnkrRpcClient
+from .sdk import sdk_client_class
+
+if TYPE_CHECKING:
+    from ankr import AnkrWeb3
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve AnkrWeb3 on first use, as importing the SDK is slow"""
+    if name == "AnkrWeb3":
+        return sdk_client_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class AnkrAuth:
     """Authentication handler for Ankr API"""
 
-    def __init__(self, endpoint: Optional[str] = None, private_key: Optional[str] = None):
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        private_key: Optional[str] = None,
+        rpc_url: Optional[str] = None,
+    ):
         """
         Initialize Ankr authentication
 
+        Several keys or endpoints can be pooled to spread calls over their quotas:
+        ANKR_PRIVATE_KEY or ANKR_RPC_URL may hold a comma-separated list, each entry
+        optionally weighted as `entry*weight`, or WEB3_MCP_KEY_POOL_FILE may name a JSON
+        file listing {"key" or "url", "weight"} objects. The SDK transport uses the
+        first key.
+
+        WEB3_MCP_CASSETTE may name a cassette file recording every upstream call, or
+        replaying them without network access (WEB3_MCP_CASSETTE_MODE=record|replay).
+
         Args:
             endpoint: Ankr RPC endpoint URL (defaults to env var ANKR_ENDPOINT)
             private_key: Private key for authentication (defaults to env var ANKR_PRIVATE_KEY)
+            rpc_url: Advanced API JSON-RPC URL for the native client
+                (defaults to env var ANKR_RPC_URL, then the multichain URL for the key)
         """
         self.endpoint = endpoint or os.environ.get("ANKR_ENDPOINT")
-        self.private_key = private_key or os.environ.get(
+        private_key = private_key or os.environ.get(
             "ANKR_PRIVATE_KEY", os.environ.get("DOTENV_PRIVATE_KEY_DEVIN")
         )
 
         if not self.endpoint:
             raise ValueError("Ankr endpoint not provided. Set ANKR_ENDPOINT environment variable.")
 
-        self._client = None
+        keys = parse_pool(private_key or "")
+        self.private_key = keys[0][0] if keys else private_key
+
+        pool_file = os.environ.get("WEB3_MCP_KEY_POOL_FILE")
+        rpc_url = rpc_url or os.environ.get("ANKR_RPC_URL")
+        self.rpc_urls: List[Tuple[str, int]]
+        if pool_file:
+            self.rpc_urls = load_pool_file(os.path.expanduser(pool_file))
+        elif rpc_url:
+            self.rpc_urls = parse_pool(rpc_url)
+        elif keys:
+            self.rpc_urls = [(ANKR_MULTICHAIN_URL + key, weight) for key, weight in keys]
+        else:
+            self.rpc_urls = [(ANKR_MULTICHAIN_URL, 1)]
+        self.rpc_url = self.rpc_urls[0][0]
+
+        self.cassette = Cassette.from_env()
+        self._client: Optional["AnkrWeb3"] = None
+        self._rpc_client: Optional[RpcTransport] = None
 
     @property
-    def client(self) -> AnkrWeb3:
-        """Return authenticated Ankr client"""
+    def client(self) -> "AnkrWeb3":
+        """Return authenticated Ankr client, importing the SDK on first use"""
         if not self._client:
-            self._client = AnkrWeb3(api_key=self.private_key)
+            self._client = sys.modules[__name__].AnkrWeb3(api_key=self.private_key)
+            if self.cassette is not None:
+                self.cassette.wrap_sdk(self._client)
         return self._client
+
+    @property
+    def rpc_client(self) -> RpcTransport:
+        """Return authenticated native JSON-RPC client, pooled when several are configured"""
+        if not self._rpc_client:
+            if self.cassette is not None and self.cassette.replaying:
+                self._rpc_client = self.cassette.wrap_rpc(None)
+            elif len(self.rpc_urls) > 1:
+                self._rpc_client = RpcPool.from_env(self.rpc_urls)
+            else:
+                self._rpc_client = AnkrRpcClient.from_env(self.rpc_url)
+            if self.cassette is not None and not self.cassette.replaying:
+                self._rpc_client = self.cassette.wrap_rpc(self._rpc_client)
+        return self._rpc_client
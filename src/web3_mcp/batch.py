@@ -0,0 +1,65 @@
+"""
+Bounded-concurrency execution of batch tool calls
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Sequence, TypeVar
+
+from pydantic import BaseModel
+
+ItemT = TypeVar("ItemT", bound=BaseModel)
+
+DEFAULT_BATCH_CONCURRENCY = 8
+DEFAULT_BATCH_MAX_ITEMS = 100
+
+
+def item_key(item: BaseModel, fields: Sequence[str]) -> str:
+    """Build the result key of a batch item, e.g. "eth:0xabc" or "eth:0xabc:1" """
+    return ":".join(str(getattr(item, field)) for field in fields)
+
+
+async def run_batch(
+    items: Sequence[ItemT],
+    call: Callable[[ItemT], Awaitable[Dict[str, Any]]],
+    key_fields: Sequence[str],
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    max_items: int = DEFAULT_BATCH_MAX_ITEMS,
+) -> Dict[str, Any]:
+    """
+    Run one call per batch item with at most `concurrency` calls in flight
+
+    Duplicate items are called once. A failing item does not fail the batch; its
+    error is returned in place of its result.
+
+    Args:
+        items: Batch items
+        call: Coroutine function handling a single item
+        key_fields: Item fields joined with ":" to key the results
+        concurrency: Maximum number of concurrent calls
+        max_items: Maximum batch size
+
+    Returns:
+        Results keyed by item, each with either a "result" or an "error"
+
+    Raises:
+        ValueError: If the batch has more than max_items items
+    """
+    if len(items) > max_items:
+        raise ValueError(f"Batch has {len(items)} items, the maximum is {max_items}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(item: ItemT) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"result": await call(item)}
+            except Exception as e:
+                return {"error": str(e)}
+
+    unique = {item_key(item, key_fields): item for item in items}
+    outcomes = await asyncio.gather(*[run(item) for item in unique.values()])
+    results = dict(zip(unique, outcomes))
+    return {
+        "results": results,
+        "errors": sum(1 for outcome in results.values() if "error" in outcome),
+    }
@@ -0,0 +1,184 @@
+"""
+Per-response size budget with continuation cursors
+"""
+
+import base64
+import json
+import secrets
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from .cache import ResponseCache, estimate_size
+from .config import env_float, env_int
+
+DEFAULT_MAX_RESPONSE_BYTES = 1024 * 1024
+DEFAULT_MAX_RESPONSE_ROWS = 0
+DEFAULT_REMAINDER_TTL = 10 * 60
+DEFAULT_REMAINDER_MAX_BYTES = 64 * 1024 * 1024
+
+# Page tokens that continue a truncated response
+CURSOR_PREFIX = "c1."
+
+
+class Cursor(NamedTuple):
+    """Position in a truncated response"""
+
+    # Remainder store entry holding the full page
+    id: str
+    # Number of the page's items already returned
+    offset: int
+    # Page token that fetched the page, used if the entry has been evicted
+    page_token: str
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode a cursor as an opaque page token"""
+    data = json.dumps(list(cursor), separators=(",", ":")).encode()
+    return CURSOR_PREFIX + base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Decode a page token produced by encode_cursor
+
+    Raises:
+        ValueError: If the token is not a valid continuation cursor
+    """
+    data = token[len(CURSOR_PREFIX) :]
+    try:
+        fields = json.loads(base64.urlsafe_b64decode(data + "=" * (-len(data) % 4)))
+        return Cursor(str(fields[0]), int(fields[1]), str(fields[2]))
+    except (ValueError, TypeError, IndexError):
+        raise ValueError(f"Invalid page token: {token!r}")
+
+
+class ResponseBudget:
+    """
+    Cap the items returned per tool call by serialized bytes and row count
+
+    When a page exceeds the budget, the items that fit are returned with a
+    continuation cursor as next_page_token, and the full page is kept in a
+    remainder store, so continuing does not call upstream again.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+        max_rows: int = DEFAULT_MAX_RESPONSE_ROWS,
+        remainder_ttl: float = DEFAULT_REMAINDER_TTL,
+        remainder_max_bytes: int = DEFAULT_REMAINDER_MAX_BYTES,
+    ):
+        """
+        Initialize the budget
+
+        Args:
+            max_bytes: Maximum serialized size of a response's items (0 for no limit)
+            max_rows: Maximum number of items per response (0 for no limit)
+            remainder_ttl: Seconds a truncated page is kept for continuation
+            remainder_max_bytes: Maximum total size of kept pages
+        """
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.remainder_ttl = remainder_ttl
+        self._remainders = ResponseCache(max_bytes=remainder_max_bytes, ttls={})
+        self.truncated = 0
+        self.continued = 0
+        self.refetched = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseBudget"]:
+        """
+        Create a budget from WEB3_MCP_MAX_RESPONSE_BYTES and WEB3_MCP_MAX_RESPONSE_ROWS
+
+        WEB3_MCP_RESPONSE_REMAINDER_TTL sets how long truncated pages can be continued.
+        Returns None when both limits are 0.
+        """
+        budget = cls(
+            max_bytes=env_int("WEB3_MCP_MAX_RESPONSE_BYTES", DEFAULT_MAX_RESPONSE_BYTES),
+            max_rows=env_int("WEB3_MCP_MAX_RESPONSE_ROWS", DEFAULT_MAX_RESPONSE_ROWS),
+            remainder_ttl=env_float("WEB3_MCP_RESPONSE_REMAINDER_TTL", DEFAULT_REMAINDER_TTL),
+        )
+        return budget if budget.max_bytes or budget.max_rows else None
+
+    def _fits(self, items: List[Any]) -> int:
+        """Return how many leading items fit the budget (at least one)"""
+        limit = len(items)
+        if self.max_rows:
+            limit = min(limit, self.max_rows)
+        if not self.max_bytes:
+            return max(1, limit)
+        used = 2
+        for count, item in enumerate(items[:limit]):
+            used += estimate_size(item) + 1
+            if used > self.max_bytes:
+                return max(1, count)
+        return limit
+
+    def _slice(
+        self, page: Dict[str, Any], items_key: str, cursor: Cursor, entry_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Return the part of page starting at cursor.offset that fits the budget"""
+        items = page.get(items_key) or []
+        rest = items[cursor.offset :]
+        count = self._fits(rest) if rest else 0
+        if cursor.offset + count >= len(items):
+            if not cursor.offset:
+                return page
+            return {**page, items_key: rest}
+
+        if entry_id is None:
+            entry_id = secrets.token_urlsafe(12)
+            self._remainders.set(entry_id, page, self.remainder_ttl)
+            self.truncated += 1
+        next_cursor = Cursor(entry_id, cursor.offset + count, cursor.page_token)
+        return {
+            **page,
+            items_key: rest[:count],
+            "next_page_token": encode_cursor(next_cursor),
+            "truncated": True,
+        }
+
+    async def apply(
+        self,
+        page_token: Optional[str],
+        items_key: str,
+        fetch: Callable[[Optional[str]], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Fetch a page, or continue a truncated one, and fit it to the budget
+
+        Args:
+            page_token: The tool request's page token, possibly a continuation cursor
+            items_key: Key of the item list in the result
+            fetch: Coroutine function fetching the page for an upstream page token
+
+        Returns:
+            The page, or the part of it that fits with a continuation cursor
+
+        Raises:
+            ValueError: If page_token is a malformed continuation cursor
+        """
+        if not page_token or not page_token.startswith(CURSOR_PREFIX):
+            page = await fetch(page_token)
+            return self._slice(page, items_key, Cursor("", 0, page_token or ""), None)
+
+        cursor = decode_cursor(page_token)
+        stored = self._remainders.get(cursor.id)
+        if stored is not None:
+            self.continued += 1
+            return self._slice(stored, items_key, cursor, cursor.id)
+
+        # The kept page expired; fetch that one page again and continue from the offset
+        self.refetched += 1
+        page = await fetch(cursor.page_token or None)
+        return self._slice(page, items_key, cursor, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return truncation and continuation counters"""
+        return {
+            "max_bytes": self.max_bytes,
+            "max_rows": self.max_rows,
+            "truncated": self.truncated,
+            "continued": self.continued,
+            "refetched": self.refetched,
+            "remainders": self._remainders.stats()["entries"],
+        }
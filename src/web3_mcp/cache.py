@@ -0,0 +1,157 @@
+"""
+In-process TTL + LRU response cache for tool results
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+import pydantic_core
+
+from .config import env_bool, env_float, env_int
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Seconds a tool result stays fresh; tools not listed here are not cached
+DEFAULT_TOOL_TTLS: Dict[str, float] = {
+    "get_nfts_by_owner": 60,
+    "get_nft_metadata": 6 * 60 * 60,
+    "get_nft_holders": 5 * 60,
+    "get_blockchain_stats": 5,
+    "get_blocks": 15,
+    "get_logs": 15,
+    "get_account_balance": 30,
+    "get_token_price": 30,
+}
+
+
+def estimate_size(value: Any) -> int:
+    """Estimate the memory footprint of a cached value by its JSON size"""
+    return len(pydantic_core.to_json(value, fallback=vars))
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU cache bounded by entry count and bytes, with a TTL policy per tool"""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum total estimated size of cached results
+            ttls: Seconds each tool's results stay fresh (defaults to DEFAULT_TOOL_TTLS)
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TOOL_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Create a cache configured from the environment, or None when WEB3_MCP_CACHE is off
+
+        WEB3_MCP_CACHE_MAX_ENTRIES and WEB3_MCP_CACHE_MAX_BYTES bound the cache, and
+        WEB3_MCP_CACHE_TTL_<TOOL> (e.g. WEB3_MCP_CACHE_TTL_GET_TOKEN_PRICE) overrides a
+        tool's TTL in seconds; 0 disables caching for that tool.
+        """
+        if not env_bool("WEB3_MCP_CACHE", True):
+            return None
+        ttls = {
+            tool: env_float(f"WEB3_MCP_CACHE_TTL_{tool.upper()}", ttl)
+            for tool, ttl in DEFAULT_TOOL_TTLS.items()
+        }
+        return cls(
+            max_entries=env_int("WEB3_MCP_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+            max_bytes=env_int("WEB3_MCP_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            ttls=ttls,
+        )
+
+    def ttl_for(self, tool: str) -> float:
+        """Return the TTL for a tool's results in seconds (0 when not cached)"""
+        return self.ttls.get(tool, 0)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Cache a value, evicting least recently used entries to stay within bounds
+
+        Args:
+            key: Cache key, see coalesce.request_key
+            value: Tool result; it is shared with later callers and must not be mutated
+            ttl: Seconds the value stays fresh
+        """
+        if ttl <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _Entry(value, size, self._clock() + ttl)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop all cached values"""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters and current usage"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
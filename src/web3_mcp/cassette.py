@@ -0,0 +1,260 @@
+"""
+Record and replay of upstream Advanced API traffic
+
+In record mode every upstream call's result or error is appended to a cassette
+file; in replay mode calls are answered from that file without touching the
+network. The cassette plugs in below the API wrappers, at the native JSON-RPC
+client and at the Ankr SDK's HTTP provider, so the wrapper code runs unchanged and
+one cassette serves both transports.
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from .config import env_str
+from .keypool import RpcTransport
+from .rpc import AnkrRpcError, clean_nones
+
+if TYPE_CHECKING:
+    from ankr import AnkrWeb3
+
+MODES = ("record", "replay")
+
+# AnkrWeb3 attributes holding the SDK API objects
+_SDK_APIS = ("nft", "query", "token")
+
+# Prepended by ankr.exceptions.APIError to the upstream error
+_SDK_ERROR_PREFIX = "failed to handle request, "
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a call the cassette has no recording of"""
+
+
+def _key(method: str, params: Dict[str, Any]) -> str:
+    """Canonical form of a call: method and parameters without None values"""
+    return json.dumps([method, clean_nones(params)], sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """A file of recorded upstream calls, either being recorded or replayed"""
+
+    def __init__(self, path: str, mode: str = "replay"):
+        """
+        Open a cassette
+
+        Each line of the file is one call as JSON: method, params, and either result
+        or error. Identical calls recorded several times are replayed in order, and
+        the last recording is repeated once they run out.
+
+        Args:
+            path: Cassette file, appended to when recording
+            mode: "record" or "replay"
+
+        Raises:
+            FileNotFoundError: If replaying a cassette that does not exist
+        """
+        if mode not in MODES:
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._positions: Dict[str, int] = {}
+        self._recorded = 0
+        self._replayed = 0
+        self._misses = 0
+        if mode == "replay":
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        key = _key(entry["method"], entry["params"])
+                        self._entries.setdefault(key, []).append(entry)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """
+        Open the cassette named by WEB3_MCP_CASSETTE, or return None when it is unset
+
+        WEB3_MCP_CASSETTE_MODE is record or replay (default: replay).
+        """
+        path = env_str("WEB3_MCP_CASSETTE")
+        if path is None:
+            return None
+        return cls(os.path.expanduser(path), env_str("WEB3_MCP_CASSETTE_MODE", "replay") or "")
+
+    @property
+    def replaying(self) -> bool:
+        """Whether calls are answered from the cassette instead of the network"""
+        return self.mode == "replay"
+
+    def record(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Append a call to the cassette
+
+        Args:
+            method: JSON-RPC method name
+            params: Request parameters
+            result: JSON-RPC result, for a successful call
+            error: {"message", "code", "status"} of a failed call
+        """
+        entry: Dict[str, Any] = {"method": method, "params": clean_nones(params)}
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["result"] = result
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            # One append per call, so concurrent recorders do not interleave lines
+            with open(self.path, "a") as f:
+                f.write(line)
+            self._recorded += 1
+
+    def replay(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the next recording of a call
+
+        Args:
+            method: JSON-RPC method name
+            params: Request parameters
+
+        Returns:
+            The recorded entry, with either "result" or "error"
+
+        Raises:
+            CassetteMissError: If the call was never recorded
+        """
+        key = _key(method, params)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self._misses += 1
+                raise CassetteMissError(f"No recording of {method} with {clean_nones(params)}")
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self._replayed += 1
+        return copy.deepcopy(entries[min(position, len(entries) - 1)])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cassette's mode and counts of recorded, replayed and missing calls"""
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "recorded": self._recorded,
+            "replayed": self._replayed,
+            "misses": self._misses,
+        }
+
+    def wrap_rpc(self, rpc: Optional[RpcTransport]) -> "CassetteRpcClient":
+        """Return the native JSON-RPC transport recording to or replaying from this cassette"""
+        return CassetteRpcClient(self, rpc)
+
+    def wrap_sdk(self, client: "AnkrWeb3") -> "AnkrWeb3":
+        """
+        Route an Ankr SDK client's requests through this cassette
+
+        The HTTP provider of each SDK API object is patched in place, so parsing and
+        pagination in the SDK run as usual.
+
+        Args:
+            client: Ankr SDK client
+
+        Returns:
+            The same client
+        """
+        from ankr.exceptions import APIError
+
+        for name in _SDK_APIS:
+            provider = getattr(client, name).provider
+            provider.make_request = _sdk_make_request(self, provider.make_request, APIError)
+        return client
+
+
+def _sdk_make_request(cassette: Cassette, make_request: Any, api_error: Any) -> Any:
+    """Wrap an SDK provider's make_request, which takes a request object and returns JSON"""
+
+    def wrapped(method: str, request: Any) -> Dict[str, Any]:
+        params = request.to_dict()
+        if cassette.replaying:
+            entry = cassette.replay(method, params)
+            if "error" in entry:
+                error = entry["error"]
+                raise api_error(error["message"])
+            return {"jsonrpc": "2.0", "id": 0, "result": entry["result"]}
+        try:
+            response: Dict[str, Any] = make_request(method, request)
+        except api_error as e:
+            # APIError only keeps its formatted message, which replay formats again
+            message = str(e)
+            if message.startswith(_SDK_ERROR_PREFIX):
+                message = message[len(_SDK_ERROR_PREFIX) :]
+            error = {"message": message, "code": None}
+            cassette.record(method, params, error=error)
+            raise
+        cassette.record(method, params, result=response["result"])
+        return response
+
+    return wrapped
+
+
+class CassetteRpcClient:
+    """Native JSON-RPC transport recording to or replaying from a cassette"""
+
+    def __init__(self, cassette: Cassette, rpc: Optional[RpcTransport] = None):
+        """
+        Initialize the transport
+
+        Args:
+            cassette: Cassette to record to or replay from
+            rpc: Client or key pool making the real calls (None when replaying)
+        """
+        if rpc is None and not cassette.replaying:
+            raise ValueError("Recording needs an upstream client")
+        self.cassette = cassette
+        self.rpc = rpc
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call an Advanced API method, or replay its recording
+
+        Args:
+            method: JSON-RPC method name, e.g. ankr_getLogs
+            params: Method parameters; None values are omitted
+
+        Returns:
+            The JSON-RPC result object
+        """
+        if self.cassette.replaying:
+            entry = self.cassette.replay(method, params)
+            if "error" in entry:
+                error = entry["error"]
+                raise AnkrRpcError(
+                    error["message"], code=error.get("code"), status=error.get("status")
+                )
+            result: Dict[str, Any] = entry["result"]
+            return result
+
+        assert self.rpc is not None
+        try:
+            result = await self.rpc.call(method, params)
+        except AnkrRpcError as e:
+            error = {"message": str(e), "code": e.code, "status": e.status}
+            self.cassette.record(method, params, error=error)
+            raise
+        self.cassette.record(method, params, result=result)
+        return result
+
+    async def aclose(self) -> None:
+        """Close the upstream client, if any"""
+        if self.rpc is not None:
+            await self.rpc.aclose()
@@ -0,0 +1,85 @@
+"""
+Single-flight coalescing of identical in-flight tool calls
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# Request fields whose values are case-insensitive upstream
+CASE_INSENSITIVE_FIELDS = ("blockchain", "address", "contract_address", "wallet_address")
+
+
+def request_key(tool: str, request: BaseModel) -> str:
+    """
+    Build a normalized key identifying a tool call
+
+    Unset and None fields are treated alike, and chain names and addresses are
+    lowercased, so equivalent requests map to the same key.
+
+    Args:
+        tool: Tool name
+        request: Tool request model
+
+    Returns:
+        Stable string key
+    """
+    params = request.model_dump(mode="json", exclude_none=True)
+    for field in CASE_INSENSITIVE_FIELDS:
+        value = params.get(field)
+        if isinstance(value, str):
+            params[field] = value.lower()
+    return tool + ":" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+class SingleFlight:
+    """Share one upstream call between concurrent callers with the same key"""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func, or join an in-flight call with the same key
+
+        The shared call is shielded, so a caller being cancelled does not cancel the
+        work other callers are waiting on. Results are shared by reference and must
+        not be mutated.
+
+        Args:
+            key: Call key, see request_key
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            The shared call's result
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+
+            async def run() -> T:
+                return await func()
+
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        result: T = await asyncio.shield(task)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters; coalesced is the number of upstream calls saved"""
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.calls - self.coalesced,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
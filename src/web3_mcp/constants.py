@@ -2,6 +2,8 @@
 Constants for Ankr API integration
 """
 
+ANKR_MULTICHAIN_URL = "https://rpc.ankr.com/multichain/"
+
 NFT_GET_BY_OWNER = "ankr_getNFTsByOwner"
 NFT_GET_METADATA = "ankr_getNFTMetadata"
 NFT_GET_HOLDERS = "ankr_getNFTHolders"
@@ -21,4 +23,36 @@ TOKEN_GET_TOKEN_HOLDERS = "ankr_getTokenHolders"
 TOKEN_GET_TOKEN_HOLDERS_COUNT = "ankr_getTokenHoldersCount"
 TOKEN_GET_TOKEN_TRANSFERS = "ankr_getTokenTransfers"
 
+ADVANCED_API_METHODS = (
+    NFT_GET_BY_OWNER,
+    NFT_GET_METADATA,
+    NFT_GET_HOLDERS,
+    NFT_GET_TRANSFERS,
+    QUERY_GET_BLOCKCHAIN_STATS,
+    QUERY_GET_BLOCKS,
+    QUERY_GET_LOGS,
+    QUERY_GET_TRANSACTIONS_BY_HASH,
+    QUERY_GET_TRANSACTIONS_BY_ADDRESS,
+    QUERY_GET_INTERACTIONS,
+    TOKEN_GET_ACCOUNT_BALANCE,
+    TOKEN_GET_CURRENCIES,
+    TOKEN_GET_TOKEN_PRICE,
+    TOKEN_GET_TOKEN_HOLDERS,
+    TOKEN_GET_TOKEN_HOLDERS_COUNT,
+    TOKEN_GET_TOKEN_TRANSFERS,
+)
+
 SUPPORTED_NETWORKS = ["eth", "bsc", "polygon", "avalanche", "arbitrum", "fantom", "optimism"]
+
+# Blocks behind the chain head after which a block is treated as final and its
+# blocks/logs as immutable; conservative values chosen to outlast observed reorgs
+FINALITY_DEPTHS = {
+    "eth": 64,
+    "bsc": 15,
+    "polygon": 256,
+    "avalanche": 1,
+    "arbitrum": 64,
+    "fantom": 1,
+    "optimism": 64,
+}
+DEFAULT_FINALITY_DEPTH = 256
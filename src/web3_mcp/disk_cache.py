@@ -0,0 +1,280 @@
+"""
+Persistent SQLite tier for tool results that survives server restarts
+"""
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pydantic_core
+
+from .config import env_float, env_int, env_str
+
+DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+# Results with a shorter TTL than this are kept in memory only
+DEFAULT_DISK_MIN_TTL = 60.0
+# Seconds between access time updates of an entry, so warm reads are not all writes
+DEFAULT_DISK_TOUCH_INTERVAL = 5.0
+
+# Rows evicted per query when the cache is over its size bound
+EVICT_BATCH = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'bytes';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'bytes';
+END;
+"""
+
+# An upsert rather than INSERT OR REPLACE, whose implicit delete skips the triggers
+_UPSERT = """
+INSERT INTO entries VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    value = excluded.value,
+    size = excluded.size,
+    expires_at = excluded.expires_at,
+    accessed_at = excluded.accessed_at
+"""
+
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a tool result for storage"""
+    return pydantic_core.to_json(value, fallback=vars)
+
+
+class DiskCache:
+    """
+    Size-bounded SQLite cache in WAL mode
+
+    Each thread uses its own connection, so readers never block each other or a
+    writer. Values are stored as JSON; expiry uses wall-clock time so entries stay
+    valid across restarts, and a NULL expiry marks a result that never changes.
+    Triggers keep the total stored size in a meta row, so a write checks the size
+    bound without scanning the table.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+        min_ttl: float = DEFAULT_DISK_MIN_TTL,
+        touch_interval: float = DEFAULT_DISK_TOUCH_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache, creating the database file if needed
+
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of stored values
+            min_ttl: Minimum TTL in seconds for a result to be written to disk
+            touch_interval: Seconds between last access time updates of an entry; a
+                lookup within the interval is a pure read (math.inf to evict by write time)
+            clock: Wall-clock time source
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.min_ttl = min_ttl
+        self.touch_interval = touch_interval
+        self._clock = clock
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        # One transaction, so the size total of an existing file is taken before
+        # the triggers start updating it
+        conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}COMMIT;")
+
+    @classmethod
+    def from_env(cls) -> Optional["DiskCache"]:
+        """
+        Create a disk cache at WEB3_MCP_DISK_CACHE, or None when it is unset
+
+        WEB3_MCP_DISK_CACHE_MAX_BYTES bounds the file, WEB3_MCP_DISK_CACHE_MIN_TTL sets
+        the shortest TTL worth persisting and WEB3_MCP_DISK_CACHE_TOUCH_INTERVAL how often
+        a read refreshes an entry's access time.
+        """
+        path = env_str("WEB3_MCP_DISK_CACHE")
+        if path is None:
+            return None
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        return cls(
+            path,
+            max_bytes=env_int("WEB3_MCP_DISK_CACHE_MAX_BYTES", DEFAULT_DISK_MAX_BYTES),
+            min_ttl=env_float("WEB3_MCP_DISK_CACHE_MIN_TTL", DEFAULT_DISK_MIN_TTL),
+            touch_interval=env_float(
+                "WEB3_MCP_DISK_CACHE_TOUCH_INTERVAL", DEFAULT_DISK_TOUCH_INTERVAL
+            ),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a value, refreshing its last access time once per touch_interval
+
+        Args:
+            key: Cache key, see coalesce.request_key
+
+        Returns:
+            The value and its remaining TTL in seconds (math.inf if it never expires),
+            or None on a miss
+        """
+        now = self._clock()
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            self._count("errors")
+            return None
+        if (
+            row is not None
+            and (row[1] is None or row[1] > now)
+            and now - row[2] >= self.touch_interval
+        ):
+            try:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            except sqlite3.Error:
+                # E.g. busy with another writer; the access time only guides eviction
+                pass
+
+        if row is None or (row[1] is not None and row[1] <= now):
+            self._count("misses")
+            return None
+        self._count("hits")
+        ttl = math.inf if row[1] is None else row[1] - now
+        return json.loads(row[0]), ttl
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Store a value, evicting the least recently accessed entries to stay within bounds
+
+        Values with a TTL below min_ttl are not stored.
+
+        Args:
+            key: Cache key, see coalesce.request_key
+            value: Tool result
+            ttl: Seconds the value stays fresh (math.inf for immutable results)
+        """
+        if ttl < self.min_ttl:
+            return
+        self.set_encoded(key, encode_value(value), ttl)
+
+    def set_encoded(self, key: str, data: bytes, ttl: float) -> None:
+        """
+        Store a value already serialized with encode_value
+
+        Lets a result stored in several tiers be serialized once.
+
+        Args:
+            key: Cache key, see coalesce.request_key
+            data: Serialized tool result
+            ttl: Seconds the value stays fresh (math.inf for immutable results)
+        """
+        if ttl < self.min_ttl or len(data) > self.max_bytes:
+            return
+        now = self._clock()
+        expires_at = None if math.isinf(ttl) else now + ttl
+        try:
+            with self._write_lock:
+                conn = self._connection()
+                conn.execute(_UPSERT, (key, data, len(data), expires_at, now))
+                self._evict(conn, now)
+        except sqlite3.Error:
+            self._count("errors")
+            return
+        self._count("writes")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        total = self._total(conn)
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append((key,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+            with self._stats_lock:
+                self.evictions += len(evicted)
+            # Re-read, as other processes sharing the file may have written meanwhile
+            total = self._total(conn)
+
+    @staticmethod
+    def _total(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()
+        return int(row[0]) if row else 0
+
+    def clear(self) -> None:
+        """Drop all stored values"""
+        with self._write_lock:
+            self._connection().execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss, write and eviction counters and current usage"""
+        try:
+            conn = self._connection()
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            size = self._total(conn)
+        except sqlite3.Error:
+            entries, size = 0, 0
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
@@ -0,0 +1,152 @@
+"""
+Bounded thread-pool execution layer for blocking Ankr SDK calls
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .config import env_int
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_MAX_QUEUE = 256
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when the executor queue is full and a call cannot be accepted"""
+
+
+class BlockingExecutor:
+    """Run blocking callables on a bounded thread pool without stalling the event loop"""
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE):
+        """
+        Initialize the executor
+
+        Args:
+            max_workers: Maximum number of blocking calls running at once
+            max_queue: Maximum number of calls waiting for a worker (0 for unbounded)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="web3-mcp")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._peak_queued = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "BlockingExecutor":
+        """Create an executor configured from WEB3_MCP_MAX_WORKERS and WEB3_MCP_MAX_QUEUE"""
+        return cls(
+            max_workers=env_int("WEB3_MCP_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+            max_queue=env_int("WEB3_MCP_MAX_QUEUE", DEFAULT_MAX_QUEUE),
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the pool and await its result
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's return value
+        """
+        with self._lock:
+            if self.max_queue and self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Executor queue is full ({self._queued} calls waiting)"
+                )
+            self._queued += 1
+            self._peak_queued = max(self._peak_queued, self._queued)
+
+        submitted = time.perf_counter()
+        call = functools.partial(func, *args, **kwargs)
+        # Whether a worker picked the call up, or the caller gave up on it first; the
+        # queue slot is released by whichever happens first
+        started = False
+        abandoned = False
+
+        def tracked() -> T:
+            nonlocal started
+            with self._lock:
+                if abandoned:
+                    raise asyncio.CancelledError()
+                started = True
+                self._queued -= 1
+                self._running += 1
+                self._wait_seconds += time.perf_counter() - submitted
+            try:
+                result = call()
+            except BaseException:
+                with self._lock:
+                    self._running -= 1
+                    self._failed += 1
+                raise
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+            return result
+
+        def release(future: "asyncio.Future[T]") -> None:
+            nonlocal abandoned
+            if not future.cancelled():
+                return
+            with self._lock:
+                if not started:
+                    abandoned = True
+                    self._queued -= 1
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, tracked)
+        future.add_done_callback(release)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the executor's queue and throughput metrics"""
+        with self._lock:
+            started = self._completed + self._failed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (self._wait_seconds / started * 1000) if started else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the underlying thread pool"""
+        self._pool.shutdown(wait=wait)
+
+
+_default_executor: Optional[BlockingExecutor] = None
+
+
+def get_executor() -> BlockingExecutor:
+    """Return the process-wide default executor, creating it from the environment on first use"""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = BlockingExecutor.from_env()
+    return _default_executor
@@ -0,0 +1,77 @@
+"""
+Concurrent per-chain fan-out with per-chain deadlines
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_CHAIN_DEADLINE = 5.0
+
+
+async def fan_out(
+    chains: Sequence[str],
+    fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+    items_key: str,
+    deadline: float = DEFAULT_CHAIN_DEADLINE,
+) -> Dict[str, Any]:
+    """
+    Query every chain concurrently and merge the results in chain order
+
+    A chain that misses its deadline or fails is reported in the per-chain status and
+    left out of the merged items, so one slow chain cannot hold up the others. The
+    merged order does not depend on which chain answered first, so a continuation
+    cursor's offset into a refetched page points at the same items.
+
+    Args:
+        chains: Chains to query
+        fetch: Coroutine function returning one chain's single-page result
+        items_key: Key of the item list in each result
+        deadline: Seconds each chain may take
+
+    Returns:
+        Merged items, a status per chain (with the chain's own next_page_token) and
+        whether every chain answered in time
+
+    Raises:
+        Exception: The first chain's error if no chain answered
+    """
+
+    async def query(chain: str) -> Tuple[str, float, Any]:
+        start = time.perf_counter()
+        try:
+            result: Any = await asyncio.wait_for(fetch(chain), deadline)
+        except Exception as e:
+            result = e
+        return chain, time.perf_counter() - start, result
+
+    chain_items: Dict[str, List[Any]] = {}
+    statuses: Dict[str, Dict[str, Any]] = {}
+    errors: List[Exception] = []
+    for done in asyncio.as_completed([query(chain) for chain in chains]):
+        chain, elapsed, result = await done
+        status: Dict[str, Any] = {"elapsed_ms": round(elapsed * 1000, 1)}
+        if isinstance(result, asyncio.TimeoutError):
+            status["status"] = "timeout"
+        elif isinstance(result, Exception):
+            status.update(status="error", error=str(result))
+            errors.append(result)
+        else:
+            chain_items[chain] = result.get(items_key) or []
+            status.update(
+                status="ok",
+                count=len(chain_items[chain]),
+                next_page_token=result.get("next_page_token") or "",
+            )
+        statuses[chain] = status
+
+    if errors and len(errors) == len(chains):
+        raise errors[0]
+
+    items = [item for chain in chains for item in chain_items.get(chain, [])]
+    return {
+        items_key: items,
+        "next_page_token": "",
+        "chains": {chain: statuses[chain] for chain in chains},
+        "complete": all(status["status"] == "ok" for status in statuses.values()),
+    }
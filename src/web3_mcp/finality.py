@@ -0,0 +1,93 @@
+"""
+Finality-aware cache policy for block-range queries
+"""
+
+import math
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .config import env_int
+from .constants import DEFAULT_FINALITY_DEPTH, FINALITY_DEPTHS
+
+# Tools whose results are fixed once their block range is final
+BLOCK_RANGE_TOOLS = ("get_blocks", "get_logs")
+
+
+class FinalityPolicy:
+    """Treat block ranges sufficiently below the chain head as immutable"""
+
+    def __init__(
+        self,
+        head: Callable[[str], Awaitable[Optional[int]]],
+        depths: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            head: Coroutine function returning the latest block number of a chain
+            depths: Finality depth per chain (defaults to FINALITY_DEPTHS)
+        """
+        self._head = head
+        self.depths = dict(FINALITY_DEPTHS if depths is None else depths)
+        self.final = 0
+        self.recent = 0
+
+    @classmethod
+    def from_env(cls, head: Callable[[str], Awaitable[Optional[int]]]) -> "FinalityPolicy":
+        """Create a policy with WEB3_MCP_FINALITY_DEPTH_<CHAIN> overrides"""
+        depths = {
+            chain: env_int(f"WEB3_MCP_FINALITY_DEPTH_{chain.upper()}", depth)
+            for chain, depth in FINALITY_DEPTHS.items()
+        }
+        return cls(head, depths)
+
+    async def is_final(self, blockchain: str, to_block: Optional[int]) -> bool:
+        """
+        Check whether every block up to to_block is final
+
+        Open-ended ranges and failed head lookups are never final.
+
+        Args:
+            blockchain: Chain name
+            to_block: Last block of the range
+
+        Returns:
+            True if the range can no longer change
+        """
+        if to_block is None:
+            return False
+        try:
+            head = await self._head(blockchain)
+        except Exception:
+            return False
+        if head is None:
+            return False
+        depth = self.depths.get(blockchain.lower(), DEFAULT_FINALITY_DEPTH)
+        return to_block <= head - depth
+
+    async def ttl(self, tool: str, request: Any, default_ttl: float) -> float:
+        """
+        Return the cache TTL for a tool result
+
+        Block-range results entirely below the finality depth never expire; everything
+        else keeps the tool's default TTL.
+
+        Args:
+            tool: Tool name
+            request: Tool request model
+            default_ttl: The tool's regular TTL
+
+        Returns:
+            TTL in seconds (math.inf for immutable results)
+        """
+        if tool not in BLOCK_RANGE_TOOLS or not default_ttl:
+            return default_ttl
+        if await self.is_final(request.blockchain, getattr(request, "to_block", None)):
+            self.final += 1
+            return math.inf
+        self.recent += 1
+        return default_ttl
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many block-range results were cached as final or near-head"""
+        return {"final": self.final, "recent": self.recent}
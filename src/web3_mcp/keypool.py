@@ -0,0 +1,234 @@
+"""
+Pool of Advanced API keys and endpoints with health-weighted load balancing
+"""
+
+import json
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from .config import env_float, env_int
+from .constants import ANKR_MULTICHAIN_URL
+from .ratelimit import error_status
+from .resilience import is_degraded
+from .rpc import AnkrRpcClient, AnkrRpcError
+
+if TYPE_CHECKING:
+    from .cassette import CassetteRpcClient
+
+DEFAULT_POOL_MAX_FAILURES = 3
+DEFAULT_POOL_EJECT_SECONDS = 30.0
+DEFAULT_POOL_MAX_EJECT_SECONDS = 300.0
+
+
+def parse_pool(value: str) -> List[Tuple[str, int]]:
+    """
+    Parse a comma-separated list of keys or URLs, each optionally weighted as `item*weight`
+
+    Args:
+        value: e.g. "key1*3,key2"
+
+    Returns:
+        (item, weight) pairs
+    """
+    members = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        item, _, weight = entry.rpartition("*") if "*" in entry else (entry, "", "1")
+        try:
+            members.append((item.strip(), max(1, int(weight))))
+        except ValueError:
+            raise ValueError(f"Invalid pool member weight: {entry!r}")
+    return members
+
+
+def load_pool_file(path: str) -> List[Tuple[str, int]]:
+    """
+    Load pool members from a JSON file
+
+    The file holds a list of objects with either "key" or "url", and an optional
+    "weight" (default 1).
+
+    Args:
+        path: Path of the JSON file
+
+    Returns:
+        (url, weight) pairs
+    """
+    with open(path) as f:
+        entries = json.load(f)
+    members = []
+    for entry in entries:
+        url = entry.get("url") or ANKR_MULTICHAIN_URL + entry["key"]
+        members.append((url, max(1, int(entry.get("weight", 1)))))
+    return members
+
+
+def _label(url: str) -> str:
+    """Identify a member in stats without exposing its key"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}/…{url[-4:]}"
+
+
+class PoolMember:
+    """One key or endpoint in an RpcPool"""
+
+    def __init__(self, client: AnkrRpcClient, weight: int):
+        self.client = client
+        self.weight = weight
+        # Weight after health adjustments, used for selection
+        self.effective_weight = weight
+        # Smooth weighted round-robin counter
+        self.current = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        # Consecutive ejections without a success in between, for backoff
+        self.eject_streak = 0
+        self.calls = 0
+        self.errors = 0
+        self.ejections = 0
+
+
+class RpcPool:
+    """
+    Spread Advanced API calls over several keys or endpoints
+
+    Members are picked by smooth weighted round-robin. A degraded failure halves a
+    member's effective weight, and successes restore it. A member is ejected for a
+    while when it is throttled (429) or fails repeatedly, and re-admitted afterwards
+    at low weight. The pool has the same call interface as AnkrRpcClient.
+    """
+
+    def __init__(
+        self,
+        members: List[Tuple[str, int]],
+        max_failures: int = DEFAULT_POOL_MAX_FAILURES,
+        eject_seconds: float = DEFAULT_POOL_EJECT_SECONDS,
+        max_eject_seconds: float = DEFAULT_POOL_MAX_EJECT_SECONDS,
+        client_factory: Callable[[str], AnkrRpcClient] = AnkrRpcClient.from_env,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            members: (url, weight) pairs
+            max_failures: Consecutive degraded failures that eject a member
+            eject_seconds: First ejection period, doubled on each further ejection
+            max_eject_seconds: Longest ejection period
+            client_factory: Creates the JSON-RPC client for a member's URL
+            clock: Monotonic time source
+        """
+        if not members:
+            raise ValueError("RpcPool needs at least one member")
+        self.members: Dict[str, PoolMember] = {}
+        for index, (url, weight) in enumerate(members):
+            name = _label(url)
+            if name in self.members:
+                name = f"{name}#{index}"
+            self.members[name] = PoolMember(client_factory(url), weight)
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self._clock = clock
+
+    @classmethod
+    def from_env(cls, members: List[Tuple[str, int]]) -> "RpcPool":
+        """
+        Create a pool tuned by WEB3_MCP_POOL_MAX_FAILURES, WEB3_MCP_POOL_EJECT_SECONDS
+        and WEB3_MCP_POOL_MAX_EJECT_SECONDS
+        """
+        return cls(
+            members,
+            max_failures=env_int("WEB3_MCP_POOL_MAX_FAILURES", DEFAULT_POOL_MAX_FAILURES),
+            eject_seconds=env_float("WEB3_MCP_POOL_EJECT_SECONDS", DEFAULT_POOL_EJECT_SECONDS),
+            max_eject_seconds=env_float(
+                "WEB3_MCP_POOL_MAX_EJECT_SECONDS", DEFAULT_POOL_MAX_EJECT_SECONDS
+            ),
+        )
+
+    def _pick(self) -> PoolMember:
+        """Pick the next member among healthy ones, or the one re-admitted soonest"""
+        now = self._clock()
+        healthy = [m for m in self.members.values() if m.ejected_until <= now]
+        if not healthy:
+            return min(self.members.values(), key=lambda m: m.ejected_until)
+
+        total = 0
+        best = healthy[0]
+        for member in healthy:
+            member.current += member.effective_weight
+            total += member.effective_weight
+            if member.current > best.current:
+                best = member
+        best.current -= total
+        return best
+
+    def _eject(self, member: PoolMember, seconds: Optional[float] = None) -> None:
+        if seconds is None:
+            seconds = min(self.max_eject_seconds, self.eject_seconds * 2**member.eject_streak)
+        member.ejected_until = self._clock() + seconds
+        member.eject_streak += 1
+        member.ejections += 1
+        member.failures = 0
+        # Re-admitted members start at the lowest weight and earn the rest back
+        member.effective_weight = 1
+
+    def _failed(self, member: PoolMember, error: AnkrRpcError) -> None:
+        member.errors += 1
+        if error_status(error) == 429:
+            self._eject(member, error.retry_after)
+        elif is_degraded(error):
+            member.failures += 1
+            member.effective_weight = max(1, member.effective_weight // 2)
+            if member.failures >= self.max_failures:
+                self._eject(member)
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call an Advanced API method through the next pool member
+
+        Args:
+            method: JSON-RPC method name, e.g. ankr_getLogs
+            params: Method parameters; None values are omitted
+
+        Returns:
+            The JSON-RPC result object
+        """
+        member = self._pick()
+        member.calls += 1
+        try:
+            result = await member.client.call(method, params)
+        except AnkrRpcError as e:
+            self._failed(member, e)
+            raise
+        member.failures = 0
+        member.eject_streak = 0
+        member.effective_weight = min(member.weight, member.effective_weight + 1)
+        return result
+
+    async def aclose(self) -> None:
+        """Close every member's pooled connections"""
+        for member in self.members.values():
+            await member.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return weight, health and counters per member"""
+        now = self._clock()
+        return {
+            name: {
+                "weight": member.weight,
+                "effective_weight": member.effective_weight,
+                "healthy": member.ejected_until <= now,
+                "calls": member.calls,
+                "errors": member.errors,
+                "ejections": member.ejections,
+            }
+            for name, member in self.members.items()
+        }
+
+
+# Client the API wrappers send native JSON-RPC calls through
+RpcTransport = Union[AnkrRpcClient, RpcPool, "CassetteRpcClient"]
@@ -0,0 +1,318 @@
+"""
+Prometheus-style metrics for tool calls and upstream Advanced API calls
+"""
+
+import bisect
+import os
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from .config import env_bool, env_float, env_str
+
+T = TypeVar("T")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+DEFAULT_DUMP_INTERVAL = 15.0
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Value per label set that goes up and down"""
+
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: count per bucket (last is +Inf), then sum
+        self.series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, series in self.series.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_labels = _labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {_number(cumulative)}")
+            label_text = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {_number(cumulative)}")
+        return lines
+
+
+def error_type(error: BaseException) -> str:
+    """Label for an error: the class of its underlying cause"""
+    return type(error.__cause__ or error).__name__
+
+
+class Metrics:
+    """Latency, in-flight, error and payload size metrics for tools and upstream methods"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the registry
+
+        Args:
+            clock: Monotonic time source for latencies
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.tool_seconds = Histogram(
+            "web3_mcp_tool_duration_seconds", "Tool call latency", ["tool"], LATENCY_BUCKETS
+        )
+        self.tool_in_flight = Gauge("web3_mcp_tool_in_flight", "Tool calls in progress", ["tool"])
+        self.tool_errors = Counter(
+            "web3_mcp_tool_errors_total", "Failed tool calls", ["tool", "error"]
+        )
+        self.tool_bytes = Histogram(
+            "web3_mcp_tool_response_bytes", "Tool response size", ["tool"], SIZE_BUCKETS
+        )
+        self.upstream_seconds = Histogram(
+            "web3_mcp_upstream_duration_seconds",
+            "Advanced API call latency, per attempt",
+            ["method"],
+            LATENCY_BUCKETS,
+        )
+        self.upstream_in_flight = Gauge(
+            "web3_mcp_upstream_in_flight", "Advanced API calls in progress", ["method"]
+        )
+        self.upstream_errors = Counter(
+            "web3_mcp_upstream_errors_total", "Failed Advanced API calls", ["method", "error"]
+        )
+        self.upstream_bytes = Histogram(
+            "web3_mcp_upstream_response_bytes",
+            "Advanced API response size (native transport)",
+            ["method"],
+            SIZE_BUCKETS,
+        )
+        self._metrics: List[_Metric] = [
+            self.tool_seconds,
+            self.tool_in_flight,
+            self.tool_errors,
+            self.tool_bytes,
+            self.upstream_seconds,
+            self.upstream_in_flight,
+            self.upstream_errors,
+            self.upstream_bytes,
+        ]
+
+    @classmethod
+    def from_env(cls) -> Optional["Metrics"]:
+        """Create a registry when WEB3_MCP_METRICS is on, or None"""
+        return cls() if env_bool("WEB3_MCP_METRICS", False) else None
+
+    async def _track(
+        self,
+        labels: Labels,
+        seconds: Histogram,
+        in_flight: Gauge,
+        errors: Counter,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        with self._lock:
+            in_flight.inc(labels)
+        start = self._clock()
+        try:
+            result = await call()
+        except Exception as e:
+            # Cancellation, e.g. of a losing hedge, is not an error
+            with self._lock:
+                errors.inc(labels + (error_type(e),))
+            raise
+        finally:
+            elapsed = self._clock() - start
+            with self._lock:
+                in_flight.inc(labels, -1)
+                seconds.observe(labels, elapsed)
+        return result
+
+    async def track_tool(self, tool: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a tool call, recording its latency, in-flight count and errors"""
+        return await self._track(
+            (tool,), self.tool_seconds, self.tool_in_flight, self.tool_errors, call
+        )
+
+    async def track_upstream(self, method: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run one upstream call attempt, recording its latency, in-flight count and errors"""
+        return await self._track(
+            (method,), self.upstream_seconds, self.upstream_in_flight, self.upstream_errors, call
+        )
+
+    def observe_tool_bytes(self, tool: str, size: int) -> None:
+        """Record the size of a tool response"""
+        with self._lock:
+            self.tool_bytes.observe((tool,), size)
+
+    def observe_upstream_bytes(self, method: str, size: int) -> None:
+        """Record the size of an upstream response body"""
+        with self._lock:
+            self.upstream_bytes.observe((method,), size)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [line for metric in self._metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Optional[str]) -> None:
+        """
+        Write the metrics to a file, replacing it atomically, or to stderr
+
+        Args:
+            path: Destination file, e.g. for node_exporter's textfile collector
+                (None for stderr)
+        """
+        text = self.render()
+        if path is None:
+            sys.stderr.write(text)
+            sys.stderr.flush()
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def dump_periodically(
+        self, path: Optional[str] = None, interval: float = DEFAULT_DUMP_INTERVAL
+    ) -> threading.Event:
+        """
+        Write the metrics every interval seconds from a background thread
+
+        Used with the stdio transport, where there is no HTTP endpoint to scrape.
+
+        Args:
+            path: Destination file (None for stderr)
+            interval: Seconds between writes
+
+        Returns:
+            Event that stops the thread when set
+        """
+        stop = threading.Event()
+
+        def loop() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.write(path)
+                except OSError as e:
+                    print(f"Failed to write metrics: {e}", file=sys.stderr)
+
+        threading.Thread(target=loop, name="web3-mcp-metrics", daemon=True).start()
+        return stop
+
+    @staticmethod
+    def dump_settings() -> Tuple[Optional[str], float]:
+        """Return WEB3_MCP_METRICS_FILE and WEB3_MCP_METRICS_INTERVAL"""
+        path = env_str("WEB3_MCP_METRICS_FILE")
+        return (
+            os.path.expanduser(path) if path else None,
+            env_float("WEB3_MCP_METRICS_INTERVAL", DEFAULT_DUMP_INTERVAL),
+        )
+
+
+def instrument_tools(mcp: Any, metrics: Metrics) -> None:
+    """
+    Record latency, in-flight count, errors and response size of every tool call
+
+    Wraps the server's tool manager, which every tools/call request goes through.
+
+    Args:
+        mcp: FastMCP server whose tools are already registered or registered later
+        metrics: Registry to record into
+    """
+    manager = mcp._tool_manager
+    call_tool = manager.call_tool
+
+    async def instrumented(key: str, arguments: Dict[str, Any], context: Any = None) -> Any:
+        # Unknown names are not labelled, so clients cannot grow the series without bound
+        if not manager.has_tool(key):
+            return await call_tool(key, arguments, context=context)
+        content = await metrics.track_tool(key, lambda: call_tool(key, arguments, context=context))
+        metrics.observe_tool_bytes(
+            key, sum(len(getattr(item, "text", "") or "") for item in content)
+        )
+        return content
+
+    manager.call_tool = instrumented
+
+
+# Registry of the running server, or None when metrics are disabled
+_metrics: Optional[Metrics] = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """Return the running server's metrics registry, or None when metrics are disabled"""
+    return _metrics
+
+
+def set_metrics(metrics: Optional[Metrics]) -> None:
+    """Install the metrics registry used by the API wrappers and the JSON-RPC client"""
+    global _metrics
+    _metrics = metrics
@@ -0,0 +1,222 @@
+"""
+Sampled profiling of live tool calls
+
+A share of tool calls is profiled, either with cProfile or with a statistical
+sampler of the event loop thread's stack, and each profile slower than a threshold
+is written to a directory named by tool and latency.
+"""
+
+import cProfile
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .config import env_float, env_str
+
+T = TypeVar("T")
+
+DEFAULT_RATE = 10.0
+DEFAULT_SAMPLE_INTERVAL = 0.001
+MODES = ("cprofile", "sample")
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize the sampler
+
+        Args:
+            thread_id: Thread to sample (the event loop thread)
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="web3-mcp-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame: Optional[FrameType] = sys._current_frames().get(self.thread_id)
+            names: List[str] = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread"""
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: str) -> None:
+        """Write the samples as collapsed stacks, the input format of flame graph tools"""
+        with open(path, "w") as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+
+class Profiler:
+    """Profiles a sampled share of tool calls and keeps the slow ones"""
+
+    def __init__(
+        self,
+        directory: str,
+        rate: float = DEFAULT_RATE,
+        min_ms: float = 0.0,
+        mode: str = "cprofile",
+        sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+        random_source: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the profiler
+
+        Args:
+            directory: Directory profiles are written to; created if missing
+            rate: Percentage of tool calls to profile
+            min_ms: Keep only profiles of calls that took at least this long
+            mode: "cprofile" for deterministic profiles (.prof, readable with pstats or
+                snakeviz) or "sample" for statistical stack samples (.folded)
+            sample_interval: Seconds between stack samples in sample mode
+            random_source: Returns a float in [0, 1) deciding whether to sample a call
+        """
+        if mode not in MODES:
+            raise ValueError(f"Profiling mode must be one of {', '.join(MODES)}, got {mode!r}")
+        self.directory = directory
+        self.rate = rate
+        self.min_ms = min_ms
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self._random = random_source
+        # Profiles cover the whole event loop thread, so only one call is profiled at a time
+        self._active = False
+        self._profiled = 0
+        self._written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["Profiler"]:
+        """
+        Create a profiler when WEB3_MCP_PROFILE_DIR is set, or None
+
+        WEB3_MCP_PROFILE_RATE, WEB3_MCP_PROFILE_MIN_MS and WEB3_MCP_PROFILE_MODE set the
+        percentage of calls profiled, the latency threshold and the profiler.
+        """
+        directory = env_str("WEB3_MCP_PROFILE_DIR")
+        if directory is None:
+            return None
+        return cls(
+            os.path.expanduser(directory),
+            rate=env_float("WEB3_MCP_PROFILE_RATE", DEFAULT_RATE),
+            min_ms=env_float("WEB3_MCP_PROFILE_MIN_MS", 0.0),
+            mode=env_str("WEB3_MCP_PROFILE_MODE", "cprofile") or "cprofile",
+        )
+
+    async def call(self, tool: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a tool call, profiling it if it is sampled
+
+        Everything the event loop thread runs during the call is included, so a profile
+        of a call that overlapped others also shows their work. Blocking SDK and disk
+        cache calls run in executor threads and are not included.
+
+        Args:
+            tool: Tool name, used in the file name
+            call: Zero-argument coroutine function making the call
+
+        Returns:
+            The call's result
+        """
+        if self._active or self._random() * 100 >= self.rate:
+            return await call()
+
+        profile: Any
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler, e.g. a debugger's, owns the thread
+                return await call()
+        else:
+            profile = StackSampler(threading.get_ident(), self.sample_interval)
+            profile.start()
+        self._active = True
+        self._profiled += 1
+        start = time.perf_counter()
+        try:
+            return await call()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if self.mode == "cprofile":
+                profile.disable()
+            else:
+                profile.stop()
+            self._active = False
+            if elapsed_ms >= self.min_ms:
+                self._write(tool, elapsed_ms, profile)
+
+    def _write(self, tool: str, elapsed_ms: float, profile: Any) -> None:
+        extension = "prof" if self.mode == "cprofile" else "folded"
+        name = f"{tool}-{elapsed_ms:.0f}ms-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        path = os.path.join(self.directory, f"{name}-{self._profiled}.{extension}")
+        try:
+            if self.mode == "cprofile":
+                profile.dump_stats(path)
+            else:
+                profile.dump(path)
+        except OSError as e:
+            print(f"Failed to write profile {path}: {e}", file=sys.stderr)
+            return
+        self._written += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return profiling settings and counts of profiled calls and written profiles"""
+        return {
+            "directory": self.directory,
+            "mode": self.mode,
+            "rate": self.rate,
+            "min_ms": self.min_ms,
+            "profiled": self._profiled,
+            "written": self._written,
+        }
+
+
+def profile_tools(mcp: Any, profiler: Profiler) -> None:
+    """
+    Profile a sampled share of tool calls
+
+    Wraps the server's tool manager, so profiles include argument validation and
+    serialization of the result.
+
+    Args:
+        mcp: FastMCP server
+        profiler: Profiler deciding which calls to profile
+    """
+    manager = mcp._tool_manager
+    call_tool = manager.call_tool
+
+    async def profiled(key: str, arguments: Dict[str, Any], context: Any = None) -> Any:
+        if not manager.has_tool(key):
+            return await call_tool(key, arguments, context=context)
+        return await profiler.call(key, lambda: call_tool(key, arguments, context=context))
+
+    manager.call_tool = profiled
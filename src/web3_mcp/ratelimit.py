@@ -0,0 +1,276 @@
+"""
+Per-method adaptive rate limiting with retry and backoff for upstream calls
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from .config import env_float, env_int
+from .constants import ADVANCED_API_METHODS
+
+T = TypeVar("T")
+
+DEFAULT_RATE = 50.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.2
+DEFAULT_MAX_DELAY = 5.0
+DEFAULT_RETRY_RATIO = 0.2
+# Retries available before any calls have been made, and the most that are saved up
+DEFAULT_RETRY_RESERVE = 10.0
+
+# A throttled bucket never drops below this share of its configured rate
+_MIN_RATE_SHARE = 0.05
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """Return the HTTP status of a failed upstream call, from either transport"""
+    status = getattr(error, "status", None)
+    if status is None:
+        # requests.HTTPError raised by the Ankr SDK's provider
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(status: Optional[int]) -> bool:
+    """Return whether a call failing with this HTTP status may succeed if retried"""
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """
+    Token bucket whose rate halves on rate-limit responses and recovers on success
+
+    The rate recovers additively by 5% of the configured rate per successful call.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the bucket
+
+        Args:
+            rate: Configured calls per second (0 for no limit)
+            burst: Bucket capacity (defaults to one second of calls)
+            clock: Monotonic time source
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting"""
+        if not self.max_rate:
+            return 0.0
+        waited = 0.0
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return waited
+            delay = (1 - self.tokens) / self.rate
+            waited += delay
+            await asyncio.sleep(delay)
+
+    def throttle(self) -> None:
+        """Halve the rate after the upstream reported a rate limit"""
+        self._refill()
+        self.rate = max(self.max_rate * _MIN_RATE_SHARE, self.rate / 2)
+
+    def recover(self) -> None:
+        """Raise the rate back towards the configured rate after a success"""
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate * _MIN_RATE_SHARE)
+
+
+class RetryBudget:
+    """Allow retries only up to a fraction of recent calls, so retries cannot snowball"""
+
+    def __init__(self, ratio: float = DEFAULT_RETRY_RATIO, reserve: float = DEFAULT_RETRY_RESERVE):
+        """
+        Initialize the budget
+
+        Args:
+            ratio: Retries earned per call
+            reserve: Retries available at start, and the most that can be saved up
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+
+    def deposit(self) -> None:
+        """Record a call"""
+        self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry from the budget; returns False if it is exhausted"""
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class _MethodStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+
+class RateLimiter:
+    """Rate-limit, retry and back off Advanced API calls, per JSON-RPC method"""
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = DEFAULT_RATE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        retry_budget: Optional[RetryBudget] = None,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            rates: Calls per second per method (methods not listed use default_rate)
+            default_rate: Calls per second for other methods (0 for no limit)
+            max_retries: Maximum retries of one call
+            base_delay: Backoff before the first retry, doubled for each further retry
+            max_delay: Maximum backoff
+            retry_budget: Shared retry budget (defaults to RetryBudget())
+        """
+        self.default_rate = default_rate
+        self.buckets = {method: TokenBucket(rate) for method, rate in (rates or {}).items()}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_budget = retry_budget or RetryBudget()
+        self._stats: Dict[str, _MethodStats] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Create a limiter configured from the environment
+
+        WEB3_MCP_RATE_LIMIT sets the calls per second for every method and
+        WEB3_MCP_RATE_LIMIT_<METHOD> (e.g. WEB3_MCP_RATE_LIMIT_ANKR_GETLOGS) overrides
+        it; 0 disables limiting. WEB3_MCP_RETRY_MAX, WEB3_MCP_RETRY_BASE_DELAY,
+        WEB3_MCP_RETRY_MAX_DELAY and WEB3_MCP_RETRY_BUDGET_RATIO tune retries.
+        """
+        default_rate = env_float("WEB3_MCP_RATE_LIMIT", DEFAULT_RATE)
+        rates = {
+            method: env_float(f"WEB3_MCP_RATE_LIMIT_{method.upper()}", default_rate)
+            for method in ADVANCED_API_METHODS
+        }
+        return cls(
+            rates=rates,
+            default_rate=default_rate,
+            max_retries=env_int("WEB3_MCP_RETRY_MAX", DEFAULT_MAX_RETRIES),
+            base_delay=env_float("WEB3_MCP_RETRY_BASE_DELAY", DEFAULT_BASE_DELAY),
+            max_delay=env_float("WEB3_MCP_RETRY_MAX_DELAY", DEFAULT_MAX_DELAY),
+            retry_budget=RetryBudget(
+                ratio=env_float("WEB3_MCP_RETRY_BUDGET_RATIO", DEFAULT_RETRY_RATIO)
+            ),
+        )
+
+    def _bucket(self, method: str) -> TokenBucket:
+        bucket = self.buckets.get(method)
+        if bucket is None:
+            bucket = self.buckets[method] = TokenBucket(self.default_rate)
+        return bucket
+
+    def _backoff(self, retry: int, error: BaseException) -> float:
+        """Full-jitter exponential backoff, or the upstream's Retry-After if given"""
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return float(min(retry_after, self.max_delay))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    async def call(self, method: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make an upstream call within the method's rate, retrying 429 and 5xx failures
+
+        Args:
+            method: JSON-RPC method name
+            func: Zero-argument coroutine function making one upstream call
+
+        Returns:
+            The call's result
+
+        Raises:
+            Exception: The last failure, once it is not retryable or retries run out
+        """
+        bucket = self._bucket(method)
+        stats = self._stats.setdefault(method, _MethodStats())
+        stats.calls += 1
+        self.retry_budget.deposit()
+        retry = 0
+        while True:
+            stats.wait_seconds += await bucket.acquire()
+            try:
+                result = await func()
+            except Exception as e:
+                status = error_status(e)
+                if status == 429:
+                    stats.rate_limited += 1
+                    bucket.throttle()
+                if (
+                    not is_retryable(status)
+                    or retry >= self.max_retries
+                    or not self.retry_budget.withdraw()
+                ):
+                    stats.failures += 1
+                    raise
+                retry += 1
+                stats.retries += 1
+                await asyncio.sleep(self._backoff(retry, e))
+                continue
+            bucket.recover()
+            return result
+
+    async def acquire(self, method: str) -> None:
+        """
+        Wait for a token of the method's bucket for a request made outside call()
+
+        Used for hedged requests, which duplicate an attempt that call() already
+        took a token for.
+
+        Args:
+            method: JSON-RPC method name
+        """
+        stats = self._stats.setdefault(method, _MethodStats())
+        stats.wait_seconds += await self._bucket(method).acquire()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current rate and counters per method, and the retry budget"""
+        methods: Dict[str, Any] = {}
+        for method, stats in self._stats.items():
+            bucket = self._bucket(method)
+            methods[method] = {
+                "rate": bucket.rate,
+                "max_rate": bucket.max_rate,
+                "tokens": round(bucket.tokens, 2),
+                "calls": stats.calls,
+                "retries": stats.retries,
+                "rate_limited": stats.rate_limited,
+                "failures": stats.failures,
+                "wait_ms": round(stats.wait_seconds * 1000, 1),
+            }
+        return {"methods": methods, "retry_budget": round(self.retry_budget.balance, 2)}
@@ -0,0 +1,285 @@
+"""
+Hedged requests and per-method circuit breaking for upstream calls
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, TypeVar
+
+import httpx
+
+from .config import env_bool, env_float, env_int
+from .constants import NFT_GET_METADATA, QUERY_GET_BLOCKCHAIN_STATS, TOKEN_GET_TOKEN_PRICE
+from .ratelimit import error_status
+
+T = TypeVar("T")
+
+# Idempotent reads that may be sent twice
+HEDGED_METHODS = (NFT_GET_METADATA, TOKEN_GET_TOKEN_PRICE, QUERY_GET_BLOCKCHAIN_STATS)
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_MIN_DELAY = 0.05
+# Hedge delay used until enough latencies have been observed
+DEFAULT_HEDGE_INITIAL_DELAY = 1.0
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200
+
+DEFAULT_BREAKER_FAILURES = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while a method's circuit is open"""
+
+
+def is_degraded(error: BaseException) -> bool:
+    """
+    Return whether an error indicates a degraded upstream rather than a bad request
+
+    5xx responses, timeouts and connection failures count; 4xx responses and JSON-RPC
+    errors do not.
+    """
+    status = error_status(error)
+    if status is not None:
+        return status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # AnkrRpcError wraps the httpx error; the SDK raises requests' ConnectionError (OSError)
+    return isinstance(error.__cause__, httpx.TransportError) or isinstance(error, OSError)
+
+
+class Hedger:
+    """
+    Send a second request when the first is slower than a latency percentile
+
+    The first successful response wins and the other request is cancelled.
+    """
+
+    def __init__(
+        self,
+        percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        min_delay: float = DEFAULT_HEDGE_MIN_DELAY,
+        initial_delay: float = DEFAULT_HEDGE_INITIAL_DELAY,
+        methods: Optional[Set[str]] = None,
+    ):
+        """
+        Initialize the hedger
+
+        Args:
+            percentile: Latency percentile of recent calls after which to hedge
+            min_delay: Minimum seconds before hedging
+            initial_delay: Seconds before hedging until enough latencies are known
+            methods: Methods that may be hedged (defaults to HEDGED_METHODS)
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.methods = set(HEDGED_METHODS if methods is None else methods)
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["Hedger"]:
+        """
+        Create a hedger when WEB3_MCP_HEDGE is on, or None
+
+        WEB3_MCP_HEDGE_PERCENTILE and WEB3_MCP_HEDGE_MIN_DELAY tune when to hedge.
+        """
+        if not env_bool("WEB3_MCP_HEDGE", False):
+            return None
+        return cls(
+            percentile=env_float("WEB3_MCP_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE),
+            min_delay=env_float("WEB3_MCP_HEDGE_MIN_DELAY", DEFAULT_HEDGE_MIN_DELAY),
+        )
+
+    def delay(self, method: str) -> float:
+        """Return the seconds to wait for the first request before hedging"""
+        samples = self._latencies.get(method)
+        if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+            return self.initial_delay
+        ordered = sorted(samples)
+        index = round(self.percentile / 100 * (len(ordered) - 1))
+        return max(self.min_delay, ordered[index])
+
+    async def _timed(self, method: str, func: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await func()
+        samples = self._latencies.setdefault(method, deque(maxlen=HEDGE_WINDOW))
+        samples.append(time.perf_counter() - start)
+        return result
+
+    async def call(
+        self,
+        method: str,
+        func: Callable[[], Awaitable[T]],
+        backup: Optional[Callable[[], Awaitable[T]]] = None,
+    ) -> T:
+        """
+        Call func, hedging with a second call if the method is hedged and func is slow
+
+        Args:
+            method: JSON-RPC method name
+            func: Zero-argument coroutine function making one upstream call
+            backup: Coroutine function making the hedged call (defaults to func), e.g.
+                one that first takes a rate limiter token for the extra request
+
+        Returns:
+            The first successful result
+
+        Raises:
+            Exception: The last failure if every request failed
+        """
+        if method not in self.methods:
+            return await func()
+
+        self.calls += 1
+        primary = asyncio.ensure_future(self._timed(method, func))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(method))
+            if done:
+                return primary.result()
+
+            self.hedged += 1
+            hedge = asyncio.ensure_future(self._timed(method, backup or func))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            assert error is not None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedging counters and current hedge delays"""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "delays_ms": {
+                method: round(self.delay(method) * 1000, 1) for method in self._latencies
+            },
+        }
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial = False
+        self.opens = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """
+    Fail fast on a method after consecutive upstream failures
+
+    After `failures` consecutive degraded failures the circuit opens and calls are
+    rejected for `cooldown` seconds. Then one trial call is let through: success
+    closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failures: int = DEFAULT_BREAKER_FAILURES,
+        cooldown: float = DEFAULT_BREAKER_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the breaker
+
+        Args:
+            failures: Consecutive degraded failures that open a method's circuit
+            cooldown: Seconds an open circuit rejects calls
+            clock: Monotonic time source
+        """
+        self.failures = failures
+        self.cooldown = cooldown
+        self._clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+
+    @classmethod
+    def from_env(cls) -> Optional["CircuitBreaker"]:
+        """
+        Create a breaker unless WEB3_MCP_BREAKER is off
+
+        WEB3_MCP_BREAKER_FAILURES and WEB3_MCP_BREAKER_COOLDOWN tune it.
+        """
+        if not env_bool("WEB3_MCP_BREAKER", True):
+            return None
+        return cls(
+            failures=env_int("WEB3_MCP_BREAKER_FAILURES", DEFAULT_BREAKER_FAILURES),
+            cooldown=env_float("WEB3_MCP_BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN),
+        )
+
+    async def call(self, method: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call func unless the method's circuit is open
+
+        Args:
+            method: JSON-RPC method name
+            func: Zero-argument coroutine function making the upstream call
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        circuit = self._circuits.setdefault(method, _Circuit())
+        if circuit.state != "closed":
+            remaining = circuit.opened_at + self.cooldown - self._clock()
+            if remaining > 0 or circuit.trial:
+                circuit.rejected += 1
+                raise CircuitOpenError(
+                    f"{method} is failing upstream; retry in {max(remaining, 0):.0f}s"
+                )
+            circuit.state = "half_open"
+            circuit.trial = True
+
+        try:
+            result = await func()
+        except Exception as e:
+            if is_degraded(e):
+                circuit.failures += 1
+                if circuit.state == "half_open" or circuit.failures >= self.failures:
+                    circuit.state = "open"
+                    circuit.opened_at = self._clock()
+                    circuit.opens += 1
+            elif circuit.state == "half_open":
+                self._close(circuit)
+            raise
+        else:
+            self._close(circuit)
+            return result
+        finally:
+            circuit.trial = False
+
+    def _close(self, circuit: _Circuit) -> None:
+        circuit.state = "closed"
+        circuit.failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state, consecutive failures, opens and rejected calls per method"""
+        return {
+            method: {
+                "state": circuit.state,
+                "failures": circuit.failures,
+                "opens": circuit.opens,
+                "rejected": circuit.rejected,
+            }
+            for method, circuit in self._circuits.items()
+        }
@@ -0,0 +1,158 @@
+"""
+Native asyncio JSON-RPC client for the Ankr Advanced API
+"""
+
+import itertools
+from typing import Any, Dict, Optional
+
+import httpx
+
+from . import tracing
+from .config import env_float, env_int
+from .metrics import get_metrics
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+
+
+class AnkrRpcError(Exception):
+    """Error returned by the Ankr Advanced API or its HTTP transport"""
+
+    def __init__(
+        self,
+        message: str,
+        code: Optional[int] = None,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """
+        Initialize the error
+
+        Args:
+            message: Error message
+            code: JSON-RPC error code, if the upstream returned one
+            status: HTTP status code, if the request failed at the HTTP level
+            retry_after: Seconds the upstream asked to wait before retrying
+        """
+        super().__init__(message)
+        self.code = code
+        self.status = status
+        self.retry_after = retry_after
+
+
+def clean_nones(value: Any) -> Any:
+    """Recursively drop None values from dictionaries and lists, as the Ankr SDK does"""
+    if isinstance(value, list):
+        return [clean_nones(item) for item in value if item is not None]
+    if isinstance(value, dict):
+        return {key: clean_nones(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds"""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class AnkrRpcClient:
+    """Async JSON-RPC client speaking the Advanced API methods over a keep-alive connection pool"""
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize the client
+
+        Args:
+            url: Multichain JSON-RPC endpoint URL, including the API key
+            timeout: Per-request timeout in seconds
+            max_connections: Maximum number of pooled connections
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+            transport: Custom httpx transport (mainly for tests)
+        """
+        self.url = url
+        self._ids = itertools.count(1)
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            headers={"Content-Type": "application/json"},
+            transport=transport,
+        )
+
+    @classmethod
+    def from_env(cls, url: str) -> "AnkrRpcClient":
+        """Create a client tuned by WEB3_MCP_RPC_TIMEOUT and WEB3_MCP_RPC_MAX_CONNECTIONS"""
+        return cls(
+            url,
+            timeout=env_float("WEB3_MCP_RPC_TIMEOUT", DEFAULT_TIMEOUT),
+            max_connections=env_int("WEB3_MCP_RPC_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS),
+        )
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call an Advanced API method
+
+        Args:
+            method: JSON-RPC method name, e.g. ankr_getLogs
+            params: Method parameters; None values are omitted
+
+        Returns:
+            The JSON-RPC result object
+        """
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": clean_nones(params),
+        }
+
+        with tracing.span("http request", method=method) as request_span:
+            try:
+                response = await self._http.post(self.url, json=payload)
+            except httpx.HTTPError as e:
+                raise AnkrRpcError(f"{method} request failed: {e}") from e
+            request_span.set_attribute("status_code", response.status_code)
+            request_span.set_attribute("response_bytes", len(response.content))
+
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.observe_upstream_bytes(method, len(response.content))
+
+        if response.status_code >= 400:
+            raise AnkrRpcError(
+                f"{method} returned HTTP {response.status_code}",
+                status=response.status_code,
+                retry_after=_retry_after(response),
+            )
+
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise AnkrRpcError(f"{method} returned invalid JSON") from e
+
+        error = body.get("error")
+        if error:
+            if isinstance(error, dict):
+                raise AnkrRpcError(str(error.get("message", error)), code=error.get("code"))
+            raise AnkrRpcError(str(error))
+        if "result" not in body:
+            raise AnkrRpcError(f"{method} returned no result")
+        result: Dict[str, Any] = body["result"]
+        return result
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self._http.aclose()
@@ -0,0 +1,57 @@
+"""
+Lazy loading of the Ankr SDK
+
+The SDK's package init imports web3, which takes most of the server's startup time.
+The request and reply types in ankr.types have no dependencies, so they are loaded
+on their own; the rest of the SDK is imported only when the SDK transport is used.
+"""
+
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING, Type
+
+if TYPE_CHECKING:
+    from ankr import AnkrWeb3
+
+_TYPES_MODULE = "ankr.types"
+
+
+def preload_types() -> ModuleType:
+    """
+    Load ankr.types without running the ankr package init
+
+    The module is registered under its own name, so `from ankr.types import ...`
+    and the SDK itself use this same module.
+
+    Returns:
+        The ankr.types module
+    """
+    module = sys.modules.get(_TYPES_MODULE)
+    if module is not None:
+        return module
+    package = importlib.util.find_spec("ankr")
+    if package is None or not package.submodule_search_locations:
+        raise ImportError("ankr-sdk is not installed")
+    path = os.path.join(list(package.submodule_search_locations)[0], "types.py")
+    spec = importlib.util.spec_from_file_location(_TYPES_MODULE, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[_TYPES_MODULE] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[_TYPES_MODULE]
+        raise
+    return module
+
+
+def sdk_client_class() -> Type["AnkrWeb3"]:
+    """Import the Ankr SDK and return its client class"""
+    import ankr
+
+    # Normally set by the import system when it loads the submodule itself
+    if not hasattr(ankr, "types"):
+        setattr(ankr, "types", preload_types())
+    return ankr.AnkrWeb3
@@ -0,0 +1,104 @@
+"""
+Fast conversion of Ankr SDK reply objects to plain JSON-compatible values
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from . import tracing
+
+# Types returned as-is
+_SCALARS = frozenset({str, int, float, bool, type(None)})
+
+# Converter per type, built the first time a type is seen
+_converters: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _convert_list(value: Any) -> List[Any]:
+    return [item if type(item) in _SCALARS else _plain(item) for item in value]
+
+
+def _convert_dict(value: Dict[Any, Any]) -> Dict[Any, Any]:
+    return {key: item if type(item) in _SCALARS else _plain(item) for key, item in value.items()}
+
+
+def _convert_object(value: Any) -> Dict[str, Any]:
+    # Copy the instance dictionary in one step and convert only nested values
+    fields = dict(value.__dict__)
+    for name, item in fields.items():
+        if type(item) not in _SCALARS:
+            fields[name] = _plain(item)
+    return fields
+
+
+def _convert_object_public(value: Any) -> Dict[str, Any]:
+    return {
+        name: item if type(item) in _SCALARS else _plain(item)
+        for name, item in value.__dict__.items()
+        if not name.startswith("_")
+    }
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _enum_value(value: Enum) -> Any:
+    return value.value
+
+
+def _converter(value: Any) -> Callable[[Any], Any]:
+    kind = type(value)
+    if issubclass(kind, Enum):
+        return _enum_value
+    if issubclass(kind, (list, tuple)):
+        return _convert_list
+    if issubclass(kind, dict):
+        return _convert_dict
+    if issubclass(kind, (str, int, float)) or not hasattr(value, "__dict__"):
+        return _identity
+    if any(name.startswith("_") for name in vars(value)):
+        return _convert_object_public
+    return _convert_object
+
+
+def _project(value: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    source = value if isinstance(value, dict) else value.__dict__
+    return {name: _plain(source[name]) for name in fields if name in source}
+
+
+def to_plain(value: Any, fields: Optional[Sequence[str]] = None) -> Any:
+    """
+    Convert an SDK object (or a list/dict of them) to plain dicts, lists and scalars
+
+    How to convert each type is decided once and cached, so converting an SDK object
+    is a copy of its instance dictionary plus a pass over its nested values. Enums
+    (e.g. Blockchain) become their values. The conversion runs in a "serialize" span
+    carrying the number of rows converted.
+
+    Args:
+        value: SDK reply object, container or scalar
+        fields: Attributes to keep of value (or of each item when value is a list);
+            other attributes are never converted, and unknown names are ignored
+
+    Returns:
+        JSON-compatible equivalent of value
+    """
+    rows = len(value) if isinstance(value, (list, tuple)) else 1
+    with tracing.span("serialize", rows=rows):
+        if fields is not None:
+            if isinstance(value, (list, tuple)):
+                return [_project(item, fields) for item in value]
+            return _project(value, fields)
+        return _plain(value)
+
+
+def _plain(value: Any) -> Any:
+    """Convert a value with the converter cached for its type"""
+    kind = type(value)
+    if kind in _SCALARS:
+        return value
+    convert = _converters.get(kind)
+    if convert is None:
+        convert = _converters[kind] = _converter(value)
+    return convert(value)
@@ -0,0 +1,141 @@
+"""
+SSE transport serving with multiple worker processes and graceful shutdown
+"""
+
+import math
+import multiprocessing
+import multiprocessing.connection
+import signal
+import sys
+import time
+from types import FrameType
+from typing import Callable, List, Optional
+
+import uvicorn
+from fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .metrics import CONTENT_TYPE, get_metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0
+# Extra seconds a worker gets to exit after its own graceful shutdown timeout
+_KILL_MARGIN = 5.0
+
+
+def sse_app(mcp: FastMCP) -> Starlette:
+    """Return the server's SSE app, with the metrics at /metrics when they are enabled"""
+    app = mcp.sse_app()
+    metrics = get_metrics()
+    if metrics is not None:
+
+        async def scrape(request: Request) -> Response:
+            return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+        app.router.routes.append(Route("/metrics", scrape, methods=["GET"]))
+    return app
+
+
+def serve_sse(
+    mcp: FastMCP,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+) -> None:
+    """
+    Serve an MCP server over SSE until SIGINT or SIGTERM
+
+    On shutdown, new connections are refused and open SSE streams are given
+    shutdown_timeout seconds before they are closed.
+
+    Args:
+        mcp: Initialized MCP server
+        host: Interface to listen on
+        port: Port to listen on
+        shutdown_timeout: Seconds to wait for open connections on shutdown
+    """
+    config = uvicorn.Config(
+        sse_app(mcp),
+        host=host,
+        port=port,
+        log_level=mcp.settings.log_level.lower(),
+        # uvicorn takes whole seconds; rounding down would cut short fractional timeouts
+        timeout_graceful_shutdown=math.ceil(shutdown_timeout),
+    )
+    uvicorn.Server(config).run()
+
+
+def _worker(factory: Callable[[], FastMCP], host: str, port: int, shutdown_timeout: float) -> None:
+    """Worker process entry point: build a server of its own and serve it"""
+    serve_sse(factory(), host, port, shutdown_timeout)
+
+
+def run_workers(
+    factory: Callable[[], FastMCP],
+    workers: int,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+) -> int:
+    """
+    Serve over SSE from several worker processes, on consecutive ports
+
+    An SSE session lives in the process that opened its stream, so each worker
+    listens on its own port (port, port + 1, ...) and a load balancer in front must
+    keep each client on one port. SIGINT and SIGTERM are forwarded to the workers,
+    which are killed if they have not exited shutdown_timeout seconds later. If one
+    worker exits, the others are stopped too, so a supervisor can restart the set.
+
+    Args:
+        factory: Module-level function creating the MCP server, called in each worker
+        workers: Number of worker processes
+        host: Interface to listen on
+        port: First port
+        shutdown_timeout: Seconds to wait for open connections on shutdown
+
+    Returns:
+        Exit status: 0 if every worker exited cleanly, 1 otherwise
+    """
+    context = multiprocessing.get_context("spawn")
+    processes: List[multiprocessing.process.BaseProcess] = [
+        context.Process(
+            target=_worker,
+            args=(factory, host, port + index, shutdown_timeout),
+            name=f"web3-mcp-worker-{index}",
+        )
+        for index in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    print(
+        f"Serving SSE on http://{host}:{port}-{port + workers - 1} with {workers} workers",
+        file=sys.stderr,
+    )
+
+    def forward(signum: int, frame: Optional[FrameType]) -> None:
+        for process in processes:
+            if process.is_alive() and process.pid is not None:
+                process.terminate()
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+
+    # Once one worker is gone, the deployment is shutting down or broken: stop the rest
+    multiprocessing.connection.wait([process.sentinel for process in processes])
+    forward(signal.SIGTERM, None)
+
+    deadline = time.monotonic() + shutdown_timeout + _KILL_MARGIN
+    status = 0
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            process.kill()
+            process.join()
+        # uvicorn re-raises the stop signal after a graceful shutdown
+        if process.exitcode not in (0, -signal.SIGTERM, -signal.SIGINT):
+            status = 1
+    return status
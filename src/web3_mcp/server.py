@@ -2,14 +2,18 @@
 MCP server implementation for Ankr Advanced API
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
 
-from fastmcp import FastMCP
+import pydantic_core
+from fastmcp import Context, FastMCP
+from pydantic import BaseModel
 
+from . import tracing
 from .api.nft import (
     NFTApi,
     NFTByOwnerRequest,
     NFTHoldersRequest,
+    NFTMetadataBatchRequest,
     NFTMetadataRequest,
     NFTTransfersRequest,
 )
@@ -32,15 +36,84 @@ from .api.token import (
     TokenHoldersRequest,
     TokenHoldersResponse,
     TokenPriceRequest,
+    TokenPricesRequest,
     TokenTransfersRequest,
     TokenTransfersResponse,
 )
 from .auth import AnkrAuth
+from .batch import DEFAULT_BATCH_CONCURRENCY, DEFAULT_BATCH_MAX_ITEMS, run_batch
+from .budget import ResponseBudget
+from .cache import ResponseCache
+from .cassette import CassetteRpcClient
+from .coalesce import SingleFlight, request_key
+from .config import env_bool, env_float, env_int, env_str
 from .constants import SUPPORTED_NETWORKS
+from .disk_cache import DiskCache, encode_value
+from .executor import BlockingExecutor, ExecutorSaturatedError
+from .fanout import DEFAULT_CHAIN_DEADLINE, fan_out
+from .finality import FinalityPolicy
+from .keypool import RpcPool
+from .metrics import Metrics, instrument_tools, set_metrics
+from .profiling import Profiler, profile_tools
+from .ratelimit import RateLimiter
+from .resilience import CircuitBreaker, Hedger
+from .shared_cache import SharedCache
+from .tracing import MemoryExporter, Tracer, trace_tools
 
 # Initialize authentication
 _auth = None
 
+RequestT = TypeVar("RequestT", bound=BaseModel)
+
+# Default page limit for the streaming scan tools
+DEFAULT_SCAN_MAX_PAGES = 100
+
+
+async def _stream_pages(
+    tool_name: str,
+    pages: AsyncIterator[Dict[str, Any]],
+    items_key: str,
+    ctx: Context,
+    max_pages: int,
+) -> Dict[str, Any]:
+    """
+    Stream pages to the client as they arrive, holding only one page in memory
+
+    Each page is sent as a log notification from the tool's logger and followed by a
+    progress notification.
+
+    Args:
+        tool_name: Name of the scan tool, used as the log notification logger name
+        pages: Async iterator of single-page results
+        items_key: Key of the item list in each page
+        ctx: MCP request context
+        max_pages: Page limit, reported as the progress total
+
+    Returns:
+        Scan summary with the token to resume from if the scan stopped early
+    """
+    page_count = 0
+    row_count = 0
+    next_page_token = ""
+    async for page in pages:
+        page_count += 1
+        items = page.get(items_key) or []
+        row_count += len(items)
+        next_page_token = page.get("next_page_token") or ""
+
+        message = {"page": page_count, items_key: items, "next_page_token": next_page_token}
+        await ctx.log(
+            "info", pydantic_core.to_json(message, fallback=vars).decode(), logger_name=tool_name
+        )
+        await ctx.report_progress(page_count, max_pages)
+
+    return {
+        "pages": page_count,
+        "rows": row_count,
+        "next_page_token": next_page_token,
+        "complete": not next_page_token,
+    }
+
 
 def init_server(
     name: str = "Ankr MCP", endpoint: Optional[str] = None, private_key: Optional[str] = None
@@ -64,49 +137,272 @@ def init_server(
     # Create MCP server
     mcp: FastMCP = FastMCP(name, dependencies=["ankr-sdk>=1.0.2"])
 
+    # Tool and upstream latency metrics; without them the hooks are not installed
+    metrics = Metrics.from_env()
+    set_metrics(metrics)
+    if metrics is not None:
+        instrument_tools(mcp, metrics)
+
+    # Spans per tool call, upstream page fetch and HTTP request
+    tracer = Tracer.from_env()
+    tracing.set_tracer(tracer)
+    if tracer is not None:
+        trace_tools(mcp, tracer)
+
+    # A sampled share of tool calls is profiled to WEB3_MCP_PROFILE_DIR
+    profiler = Profiler.from_env()
+    if profiler is not None:
+        profile_tools(mcp, profiler)
+
+    # Blocking SDK calls share one bounded thread pool
+    executor = BlockingExecutor.from_env()
+
+    # Upstream transport: the native async JSON-RPC client, or the Ankr SDK as a fallback
+    upstream = env_str("WEB3_MCP_UPSTREAM", "rpc")
+    if upstream not in ("rpc", "sdk"):
+        raise ValueError(f"WEB3_MCP_UPSTREAM must be 'rpc' or 'sdk', got {upstream!r}")
+    rpc = _auth.rpc_client if upstream == "rpc" else None
+    # The SDK is imported only when it is the transport
+    sdk_client = _auth.client if upstream == "sdk" else None
+    # Either transport may record to or replay from WEB3_MCP_CASSETTE
+    cassette = _auth.cassette
+
+    # Upstream calls are rate-limited per method and retried on 429/5xx
+    limiter = RateLimiter.from_env()
+
+    # Slow idempotent reads may be hedged; failing methods fail fast while degraded
+    hedger = Hedger.from_env()
+    breaker = CircuitBreaker.from_env()
+
     # Initialize API clients
-    nft_api = NFTApi(_auth.client)
-    query_api = QueryApi(_auth.client)
-    token_api = TokenApi(_auth.client)
+    nft_api = NFTApi(sdk_client, executor, rpc, limiter, hedger, breaker)
+    query_api = QueryApi(sdk_client, executor, rpc, limiter, hedger, breaker)
+    token_api = TokenApi(sdk_client, executor, rpc, limiter, hedger, breaker)
+
+    # Concurrent identical tool calls share one upstream call
+    coalescer = SingleFlight() if env_bool("WEB3_MCP_COALESCE", True) else None
+
+    # Recent tool results are served from memory within each tool's TTL
+    cache = ResponseCache.from_env()
+
+    # Workers on one host share results through a cache in shared memory
+    shared = SharedCache.from_env() if cache is not None else None
+
+    # Long-lived results are also persisted so they survive restarts
+    disk = DiskCache.from_env() if cache is not None else None
+    stores = [store for store in (shared, disk) if store is not None]
+
+    async def chain_head(blockchain: str) -> Optional[int]:
+        """Return the latest block number of a chain via the cached stats tool"""
+        result = await invoke(
+            "get_blockchain_stats",
+            BlockchainStatsRequest(blockchain=blockchain),
+            query_api.get_blockchain_stats,
+        )
+        head = result["stats"].get("latestBlockNumber")
+        return head or None
+
+    # Block ranges below the finality depth are cached without expiry
+    finality = (
+        FinalityPolicy.from_env(chain_head)
+        if cache is not None and env_bool("WEB3_MCP_CACHE_FINALIZED", True)
+        else None
+    )
+
+    def persist(key: str, result: Dict[str, Any], ttl: float) -> None:
+        """Write a result to the shared and disk tiers, serializing it once"""
+        data = encode_value(result)
+        for store in stores:
+            store.set_encoded(key, data, ttl)
+
+    async def invoke(
+        tool: str,
+        request: RequestT,
+        handler: Callable[[RequestT], Awaitable[Dict[str, Any]]],
+        no_cache: bool = False,
+    ) -> Dict[str, Any]:
+        """Run a tool handler behind the shared response cache and call coalescing"""
+        key = request_key(tool, request)
+        ttl = cache.ttl_for(tool) if cache is not None else 0
+        if cache is not None and ttl and not no_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                tracing.count(cache_hits=1)
+                return cached
+            # SQLite lookups can wait on locks and checkpoints and decode large values,
+            # so both tiers are read off the event loop
+            stored = None
+            for tier in (shared, disk):
+                if tier is None or stored is not None:
+                    continue
+                try:
+                    stored = await executor.run(tier.get, key)
+                except ExecutorSaturatedError:
+                    stored = None
+            if stored is not None:
+                value, remaining = stored
+                cache.set(key, value, remaining)
+                tracing.count(cache_hits=1)
+                return value
+
+        async def fetch() -> Dict[str, Any]:
+            # Stored by the shared call, so the result is cached even if every caller
+            # waiting on it has gone away
+            result = await handler(request)
+            if cache is not None and ttl:
+                store_ttl = ttl if finality is None else await finality.ttl(tool, request, ttl)
+                cache.set(key, result, store_ttl)
+                if any(store_ttl >= store.min_ttl for store in stores):
+                    try:
+                        await executor.run(persist, key, result, store_ttl)
+                    except ExecutorSaturatedError:
+                        pass
+            return result
+
+        if coalescer is None:
+            return await fetch()
+        return await coalescer.do(key, fetch)
+
+    # Requests without a blockchain are split into concurrent per-chain calls
+    fanout = env_bool("WEB3_MCP_FANOUT", True)
+    chain_deadline = env_float("WEB3_MCP_FANOUT_DEADLINE", DEFAULT_CHAIN_DEADLINE)
+
+    async def invoke_all_chains(
+        tool: str,
+        request: RequestT,
+        handler: Callable[[RequestT], Awaitable[Dict[str, Any]]],
+        items_key: str,
+        no_cache: bool = False,
+    ) -> Dict[str, Any]:
+        """Fan a chain-less first-page request out over SUPPORTED_NETWORKS"""
+        if not fanout or getattr(request, "blockchain") or getattr(request, "page_token"):
+            return await invoke(tool, request, handler, no_cache)
+
+        def fetch(chain: str) -> Awaitable[Dict[str, Any]]:
+            return invoke(tool, request.model_copy(update={"blockchain": chain}), handler, no_cache)
+
+        return await fan_out(SUPPORTED_NETWORKS, fetch, items_key, chain_deadline)
+
+    # Large list responses are cut to a byte/row budget and continued by cursor
+    budget = ResponseBudget.from_env()
+
+    async def within_budget(
+        request: RequestT,
+        items_key: str,
+        fetch: Callable[[RequestT], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Fetch a list tool's page and fit it to the response budget"""
+        if budget is None:
+            return await fetch(request)
+
+        def fetch_page(page_token: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return fetch(request.model_copy(update={"page_token": page_token}))
+
+        return await budget.apply(getattr(request, "page_token"), items_key, fetch_page)
+
+    # Batch tools run their items through invoke with bounded concurrency
+    batch_concurrency = env_int("WEB3_MCP_BATCH_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY)
+    batch_max_items = env_int("WEB3_MCP_BATCH_MAX_ITEMS", DEFAULT_BATCH_MAX_ITEMS)
 
     @mcp.tool()
-    async def get_nfts_by_owner(request: NFTByOwnerRequest) -> Dict[str, Any]:
+    async def get_nfts_by_owner(
+        request: NFTByOwnerRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Get NFTs owned by a wallet address
 
         Args:
-            request: NFT by owner request parameters
+            request: NFT by owner request parameters; `fields` limits each item to the listed
+                attributes
+            no_cache: Skip the response cache and fetch fresh data
+
+        Without a blockchain, every supported chain is queried concurrently and the
+        result also carries a status and next_page_token per chain.
 
         Returns:
             List of NFTs owned by the specified wallet
         """
-        return await nft_api.get_nfts_by_owner(request)
+        return await within_budget(
+            request,
+            "assets",
+            lambda r: invoke_all_chains(
+                "get_nfts_by_owner", r, nft_api.get_nfts_by_owner, "assets", no_cache
+            ),
+        )
 
     @mcp.tool()
-    async def get_nft_metadata(request: NFTMetadataRequest) -> Dict[str, Any]:
+    async def get_nft_metadata(
+        request: NFTMetadataRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Get metadata for a specific NFT
 
         Args:
             request: NFT metadata request parameters
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             NFT metadata information
         """
-        return await nft_api.get_nft_metadata(request)
+        return await invoke("get_nft_metadata", request, nft_api.get_nft_metadata, no_cache)
 
     @mcp.tool()
-    async def get_nft_holders(request: NFTHoldersRequest) -> Dict[str, Any]:
+    async def get_nft_metadata_batch(
+        request: NFTMetadataBatchRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get metadata for several NFTs at once
+
+        Args:
+            request: List of NFT metadata requests
+            no_cache: Skip the response cache and fetch fresh data
+
+        Returns:
+            Results keyed by "blockchain:contract_address:token_id", each with either
+            the NFT metadata as "result" or an "error"
+        """
+        return await run_batch(
+            request.items,
+            lambda item: invoke("get_nft_metadata", item, nft_api.get_nft_metadata, no_cache),
+            ("blockchain", "contract_address", "token_id"),
+            batch_concurrency,
+            batch_max_items,
+        )
+
+    @mcp.tool()
+    async def get_nft_holders(request: NFTHoldersRequest, no_cache: bool = False) -> Dict[str, Any]:
         """
         Get holders of a specific NFT collection
 
         Args:
             request: NFT holders request parameters
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             List of NFT holders for the collection
         """
-        return await nft_api.get_nft_holders(request)
+        return await within_budget(
+            request,
+            "holders",
+            lambda r: invoke("get_nft_holders", r, nft_api.get_nft_holders, no_cache),
+        )
+
+    @mcp.tool()
+    async def scan_nft_holders(
+        request: NFTHoldersRequest, ctx: Context, max_pages: int = DEFAULT_SCAN_MAX_PAGES
+    ) -> Dict[str, Any]:
+        """
+        Scan holders of an NFT collection page by page, streaming each page to the client
+
+        Args:
+            request: NFT holders request parameters for the first page
+            max_pages: Maximum number of pages to fetch
+
+        Returns:
+            Scan summary; pass next_page_token back as page_token to resume
+        """
+        pages = nft_api.iter_nft_holders(request, max_pages)
+        return await _stream_pages("scan_nft_holders", pages, "holders", ctx, max_pages)
 
     # NFT Transfers endpoint is not supported in the current API
     # @mcp.tool()
@@ -123,43 +419,90 @@ def init_server(
         return await nft_api.get_nft_transfers(request)
 
     @mcp.tool()
-    async def get_blockchain_stats(request: BlockchainStatsRequest) -> Dict[str, Any]:
+    async def get_blockchain_stats(
+        request: BlockchainStatsRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Get blockchain statistics
 
         Args:
             request: Blockchain stats request parameters
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             Statistics for the specified blockchain
         """
-        return await query_api.get_blockchain_stats(request)
+        return await invoke(
+            "get_blockchain_stats", request, query_api.get_blockchain_stats, no_cache
+        )
 
     @mcp.tool()
-    async def get_blocks(request: BlocksRequest) -> Dict[str, Any]:
+    async def get_blocks(request: BlocksRequest, no_cache: bool = False) -> Dict[str, Any]:
         """
         Get blocks information
 
         Args:
-            request: Blocks request parameters
+            request: Blocks request parameters; `fields` limits each item to the listed
+                attributes
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             List of blocks matching the criteria
         """
-        return await query_api.get_blocks(request)
+        return await within_budget(
+            request, "blocks", lambda r: invoke("get_blocks", r, query_api.get_blocks, no_cache)
+        )
 
     @mcp.tool()
-    async def get_logs(request: LogsRequest) -> Dict[str, Any]:
+    async def scan_blocks(
+        request: BlocksRequest, ctx: Context, max_pages: int = DEFAULT_SCAN_MAX_PAGES
+    ) -> Dict[str, Any]:
+        """
+        Scan blocks page by page, streaming each page to the client
+
+        Args:
+            request: Blocks request parameters for the first page
+            max_pages: Maximum number of pages to fetch
+
+        Returns:
+            Scan summary; pass next_page_token back as page_token to resume
+        """
+        pages = query_api.iter_blocks(request, max_pages)
+        return await _stream_pages("scan_blocks", pages, "blocks", ctx, max_pages)
+
+    @mcp.tool()
+    async def get_logs(request: LogsRequest, no_cache: bool = False) -> Dict[str, Any]:
         """
         Get blockchain logs
 
         Args:
-            request: Logs request parameters
+            request: Logs request parameters; `fields` limits each item to the listed
+                attributes
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             List of logs matching the criteria
         """
-        return await query_api.get_logs(request)
+        return await within_budget(
+            request, "logs", lambda r: invoke("get_logs", r, query_api.get_logs, no_cache)
+        )
+
+    @mcp.tool()
+    async def scan_logs(
+        request: LogsRequest, ctx: Context, max_pages: int = DEFAULT_SCAN_MAX_PAGES
+    ) -> Dict[str, Any]:
+        """
+        Scan blockchain logs page by page, streaming each page to the client
+
+        Args:
+            request: Logs request parameters for the first page
+            max_pages: Maximum number of pages to fetch
+
+        Returns:
+            Scan summary; pass next_page_token back as page_token to resume
+        """
+        pages = query_api.iter_logs(request, max_pages)
+        return await _stream_pages("scan_logs", pages, "logs", ctx, max_pages)
 
     # Transactions by hash endpoint is not supported in the current API
     # @mcp.tool()
@@ -204,17 +547,30 @@ def init_server(
         return await query_api.get_interactions(request)
 
     @mcp.tool()
-    async def get_account_balance(request: AccountBalanceRequest) -> Dict[str, Any]:
+    async def get_account_balance(
+        request: AccountBalanceRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
         """
         Get token balances for a wallet address
 
         Args:
-            request: Account balance request parameters
+            request: Account balance request parameters; `fields` limits each item to the listed
+                attributes
+            no_cache: Skip the response cache and fetch fresh data
+
+        Without a blockchain, every supported chain is queried concurrently and the
+        result also carries a status and next_page_token per chain.
 
         Returns:
             Token balances for the specified wallet
         """
-        return await token_api.get_account_balance(request)
+        return await within_budget(
+            request,
+            "assets",
+            lambda r: invoke_all_chains(
+                "get_account_balance", r, token_api.get_account_balance, "assets", no_cache
+            ),
+        )
 
     # Currencies endpoint is not supported in the current API
     # @mcp.tool()
@@ -231,17 +587,41 @@ def init_server(
         return await token_api.get_currencies(request)
 
     @mcp.tool()
-    async def get_token_price(request: TokenPriceRequest) -> Dict[str, Any]:
+    async def get_token_price(request: TokenPriceRequest, no_cache: bool = False) -> Dict[str, Any]:
         """
         Get token price information
 
         Args:
             request: Token price request parameters
+            no_cache: Skip the response cache and fetch fresh data
 
         Returns:
             Price information for the specified token
         """
-        return await token_api.get_token_price(request)
+        return await invoke("get_token_price", request, token_api.get_token_price, no_cache)
+
+    @mcp.tool()
+    async def get_token_prices(
+        request: TokenPricesRequest, no_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get prices for several tokens at once
+
+        Args:
+            request: List of token price requests
+            no_cache: Skip the response cache and fetch fresh data
+
+        Returns:
+            Results keyed by "blockchain:contract_address", each with either the price
+            information as "result" or an "error"
+        """
+        return await run_batch(
+            request.items,
+            lambda item: invoke("get_token_price", item, token_api.get_token_price, no_cache),
+            ("blockchain", "contract_address"),
+            batch_concurrency,
+            batch_max_items,
+        )
 
     # Token Holders endpoint is not provided as a tool
     # @mcp.tool()
@@ -313,4 +693,53 @@ def init_server(
             "api_categories": ["NFT API", "Query API", "Token API"],
         }
 
+    @mcp.resource("ankr://stats")
+    def get_server_stats() -> Dict[str, Any]:
+        """
+        Get runtime statistics for the server
+
+        Returns:
+            Executor, rate limiter, key pool, hedging, circuit breaker, coalescing, cache,
+            finality, response budget, profiling and cassette metrics
+        """
+        stats: Dict[str, Any] = {"executor": executor.stats(), "rate_limiter": limiter.stats()}
+        pool = rpc.rpc if isinstance(rpc, CassetteRpcClient) else rpc
+        if isinstance(pool, RpcPool):
+            stats["key_pool"] = pool.stats()
+        if hedger is not None:
+            stats["hedging"] = hedger.stats()
+        if breaker is not None:
+            stats["circuit_breaker"] = breaker.stats()
+        if coalescer is not None:
+            stats["coalescing"] = coalescer.stats()
+        if cache is not None:
+            stats["cache"] = cache.stats()
+        if shared is not None:
+            stats["shared_cache"] = shared.stats()
+        if disk is not None:
+            stats["disk_cache"] = disk.stats()
+        if budget is not None:
+            stats["response_budget"] = budget.stats()
+        if finality is not None:
+            stats["finality"] = finality.stats()
+        if profiler is not None:
+            stats["profiling"] = profiler.stats()
+        if cassette is not None:
+            stats["cassette"] = cassette.stats()
+        return stats
+
+    if tracer is not None and isinstance(tracer.exporter, MemoryExporter):
+        spans = tracer.exporter
+
+        @mcp.resource("ankr://traces")
+        def get_recent_traces() -> List[Dict[str, Any]]:
+            """
+            Get the most recent traces kept by the in-memory span exporter
+
+            Returns:
+                Up to 20 traces, newest first, each with its spans and their durations
+                and attributes
+            """
+            return spans.traces(limit=20)
+
     return mcp
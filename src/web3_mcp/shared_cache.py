@@ -0,0 +1,77 @@
+"""
+Cache tier shared by the worker processes on one host
+"""
+
+import math
+import os
+import tempfile
+from typing import Optional
+
+from .config import env_float, env_int, env_str
+from .disk_cache import DiskCache
+
+DEFAULT_SHARED_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SHARED_MIN_TTL = 1.0
+
+# Memory-backed filesystem on Linux; elsewhere the temp directory
+_SHM_DIR = "/dev/shm"
+
+
+def default_shared_path(name: str) -> str:
+    """Return a path for a shared cache file, in shared memory when available"""
+    directory = _SHM_DIR if os.path.isdir(_SHM_DIR) else tempfile.gettempdir()
+    return os.path.join(directory, f"web3-mcp-{name}.db")
+
+
+def remove_shared_cache(path: str) -> None:
+    """Delete a shared cache file and its WAL files"""
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class SharedCache(DiskCache):
+    """
+    SQLite cache in shared memory, read and written by every worker process
+
+    A result fetched by one worker is served to the others, so adding workers does
+    not multiply upstream calls. Lookups do not update access times, so eviction
+    removes the oldest written entries first. They can still wait on another
+    worker's lock or a WAL checkpoint, so like the disk tier they run on the executor.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_SHARED_MAX_BYTES,
+        min_ttl: float = DEFAULT_SHARED_MIN_TTL,
+    ):
+        """
+        Initialize the cache, creating the database file if needed
+
+        Args:
+            path: SQLite database file, normally under /dev/shm
+            max_bytes: Maximum total size of stored values
+            min_ttl: Minimum TTL in seconds for a result to be shared
+        """
+        super().__init__(path, max_bytes=max_bytes, min_ttl=min_ttl, touch_interval=math.inf)
+
+    @classmethod
+    def from_env(cls) -> Optional["SharedCache"]:
+        """
+        Create a shared cache at WEB3_MCP_SHARED_CACHE, or None when it is unset
+
+        Multi-worker deployments set it for their workers. WEB3_MCP_SHARED_CACHE_MAX_BYTES
+        bounds the file and WEB3_MCP_SHARED_CACHE_MIN_TTL sets the shortest TTL worth
+        sharing.
+        """
+        path = env_str("WEB3_MCP_SHARED_CACHE")
+        if path is None:
+            return None
+        return cls(
+            os.path.expanduser(path),
+            max_bytes=env_int("WEB3_MCP_SHARED_CACHE_MAX_BYTES", DEFAULT_SHARED_MAX_BYTES),
+            min_ttl=env_float("WEB3_MCP_SHARED_CACHE_MIN_TTL", DEFAULT_SHARED_MIN_TTL),
+        )
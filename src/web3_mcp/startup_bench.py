@@ -0,0 +1,144 @@
+"""
+Time-to-first-tool-response measurement for `web3-mcp --startup-bench`
+
+Starts the stdio server as a fresh process, the way an MCP client spawns it per
+session, and times the MCP initialize handshake and the first tool call. Upstream
+calls go to a local fake JSON-RPC server, so only startup and the server's own
+overhead are measured.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, Dict, List
+
+# Variables that would send bench calls elsewhere or reuse cached results
+_ISOLATED_ENV = (
+    "WEB3_MCP_KEY_POOL_FILE",
+    "WEB3_MCP_DISK_CACHE",
+    "WEB3_MCP_SHARED_CACHE",
+    "WEB3_MCP_CASSETTE",
+    "WEB3_MCP_CASSETTE_MODE",
+)
+
+
+class _FakeUpstream(BaseHTTPRequestHandler):
+    """Answers ankr_getBlockchainStats, the bench's tool call"""
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        result = {"stats": [{"blockchain": "eth", "latestBlockNumber": 1}]}
+        data = json.dumps({"jsonrpc": "2.0", "id": body["id"], "result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _send(stream: IO[str], message: Dict[str, Any]) -> None:
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def _receive(stream: IO[str], message_id: int) -> Dict[str, Any]:
+    """Read messages until the response with message_id"""
+    while True:
+        line = stream.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+        message: Dict[str, Any] = json.loads(line)
+        if message.get("id") == message_id:
+            return message
+
+
+def measure_once(rpc_url: str) -> Dict[str, float]:
+    """
+    Start one server process and time its first responses
+
+    Args:
+        rpc_url: Upstream JSON-RPC URL for the server
+
+    Returns:
+        Milliseconds from spawning to the initialize response and to the first tool result
+    """
+    env = {key: value for key, value in os.environ.items() if key not in _ISOLATED_ENV}
+    env.update({"ANKR_RPC_URL": rpc_url, "WEB3_MCP_UPSTREAM": "rpc"})
+    env.setdefault("ANKR_ENDPOINT", rpc_url)
+    env.setdefault("ANKR_PRIVATE_KEY", "startup-bench")
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "web3_mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+    assert process.stdin is not None and process.stdout is not None
+    try:
+        client = {"name": "startup-bench", "version": "0"}
+        params = {"protocolVersion": "2024-11-05", "capabilities": {}, "clientInfo": client}
+        _send(process.stdin, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": params})
+        _receive(process.stdout, 1)
+        initialized = time.perf_counter()
+
+        _send(process.stdin, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        call = {"name": "get_blockchain_stats", "arguments": {"request": {"blockchain": "eth"}}}
+        _send(process.stdin, {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": call})
+        response = _receive(process.stdout, 2)
+        responded = time.perf_counter()
+        if "error" in response or response["result"].get("isError"):
+            raise RuntimeError(f"Tool call failed: {response}")
+    finally:
+        process.stdin.close()
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    return {
+        "initialize_ms": (initialized - start) * 1000,
+        "first_tool_ms": (responded - start) * 1000,
+    }
+
+
+def run(runs: int = 5) -> List[Dict[str, float]]:
+    """
+    Measure several cold starts against a local fake upstream and print a summary
+
+    Args:
+        runs: Number of server processes to start
+
+    Returns:
+        The measurement of each run
+    """
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), _FakeUpstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    rpc_url = f"http://127.0.0.1:{upstream.server_address[1]}/"
+    try:
+        results = [measure_once(rpc_url) for _ in range(runs)]
+    finally:
+        upstream.shutdown()
+        upstream.server_close()
+
+    print(f"{runs} cold starts of the stdio server")
+    print(f"{'':24} {'min ms':>8} {'median ms':>10} {'max ms':>8}")
+    for name, label in (
+        ("initialize_ms", "initialize response"),
+        ("first_tool_ms", "first tool response"),
+    ):
+        values = [result[name] for result in results]
+        print(f"{label:24} {min(values):8.1f} {statistics.median(values):10.1f} {max(values):8.1f}")
+    return results
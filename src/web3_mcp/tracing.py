@@ -0,0 +1,364 @@
+"""
+Tracing spans from the MCP tool call down to each upstream request
+
+A span is opened per tool call, per upstream page fetch and per HTTP request.
+Spans follow the current asyncio task through contextvars, so concurrent page
+fetches (fan-out, log shards, hedges) nest under the tool call that started them.
+Finished spans go to an in-memory buffer, to stderr, or to OpenTelemetry.
+"""
+
+import contextvars
+import json
+import random
+import sys
+import time
+from collections import deque
+from types import TracebackType
+from typing import Any, Deque, Dict, List, Optional, Type
+
+from pydantic import ValidationError
+
+from .config import env_int, env_str
+from .metrics import error_type
+
+DEFAULT_BUFFER_SPANS = 1000
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "web3_mcp_span", default=None
+)
+
+
+def _attribute(value: Any) -> Any:
+    """Convert a value to a type span attributes accept: str, bool, int, float or a list"""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    return str(value)
+
+
+class Span:
+    """One timed operation, used as a context manager"""
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "attributes",
+        "parent",
+        "trace_id",
+        "span_id",
+        "start_time",
+        "duration",
+        "error",
+        "otel",
+        "_started",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        """
+        Initialize the span; it starts when entered
+
+        Args:
+            tracer: Tracer exporting the span
+            name: Operation name
+            attributes: Initial attributes; None values are dropped
+        """
+        self.tracer = tracer
+        self.name = name
+        self.attributes = {k: _attribute(v) for k, v in attributes.items() if v is not None}
+        self.parent: Optional[Span] = None
+        self.trace_id = ""
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_time = 0.0
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        # Bridged OpenTelemetry span, when exporting to OpenTelemetry
+        self.otel: Any = None
+        self._started = 0.0
+        self._token: Optional[contextvars.Token[Optional[Span]]] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute; None is ignored"""
+        if value is not None:
+            self.attributes[key] = _attribute(value)
+
+    def add(self, key: str, amount: int) -> None:
+        """Add to a numeric attribute"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def root(self) -> "Span":
+        """The outermost span of this trace in this process, normally the tool call"""
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def __enter__(self) -> "Span":
+        self.parent = _current.get()
+        self.trace_id = (
+            self.parent.trace_id if self.parent is not None else f"{random.getrandbits(128):032x}"
+        )
+        self._token = _current.set(self)
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.tracer.exporter.on_start(self)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.duration = time.perf_counter() - self._started
+        if exc is not None and isinstance(exc, Exception):
+            self.error = error_type(exc)
+        if self._token is not None:
+            _current.reset(self._token)
+        self.tracer.exporter.on_end(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable dict"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent is not None else None,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoSpan:
+    """Stand-in used when tracing is off; every method does nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class SpanExporter:
+    """Receives spans as they start and end"""
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+class MemoryExporter(SpanExporter):
+    """Keeps the most recent finished spans in memory"""
+
+    def __init__(self, max_spans: int = DEFAULT_BUFFER_SPANS):
+        """
+        Initialize the buffer
+
+        Args:
+            max_spans: Number of finished spans kept; older ones are dropped
+        """
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def on_end(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def traces(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return buffered spans grouped by trace, most recent trace first
+
+        Args:
+            limit: Maximum number of traces (None for all)
+
+        Returns:
+            Traces, each with its spans in the order they finished
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for span in reversed(self.spans):
+            grouped.setdefault(span.trace_id, []).insert(0, span.to_dict())
+        traces = [{"trace_id": trace_id, "spans": spans} for trace_id, spans in grouped.items()]
+        return traces[:limit] if limit is not None else traces
+
+
+class ConsoleExporter(SpanExporter):
+    """Writes each finished span as a JSON line to stderr, leaving stdout to the protocol"""
+
+    def on_end(self, span: Span) -> None:
+        sys.stderr.write(json.dumps(span.to_dict()) + "\n")
+        sys.stderr.flush()
+
+
+class OpenTelemetryExporter(SpanExporter):
+    """
+    Mirrors spans into OpenTelemetry
+
+    Spans are created through the opentelemetry-api global tracer provider, so where
+    they are sent is configured by the OpenTelemetry SDK the deployment sets up. A tool
+    span started inside an existing OpenTelemetry span becomes its child.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bridge; requires the opentelemetry-api package"""
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise RuntimeError("WEB3_MCP_TRACING=otel requires opentelemetry-api") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer("web3_mcp")
+
+    def on_start(self, span: Span) -> None:
+        parent = span.parent.otel if span.parent is not None else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        span.otel = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start_time * 1e9)
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel = span.otel
+        otel.set_attributes(span.attributes)
+        if span.error is not None:
+            otel.set_attribute("error.type", span.error)
+            otel.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        otel.end(end_time=int((span.start_time + span.duration) * 1e9))
+
+
+class Tracer:
+    """Creates spans and hands finished ones to an exporter"""
+
+    def __init__(self, exporter: SpanExporter):
+        """
+        Initialize the tracer
+
+        Args:
+            exporter: Where spans go
+        """
+        self.exporter = exporter
+
+    @classmethod
+    def from_env(cls) -> Optional["Tracer"]:
+        """
+        Create a tracer from WEB3_MCP_TRACING, or None when it is off
+
+        WEB3_MCP_TRACING is one of off (default), memory, console or otel.
+        WEB3_MCP_TRACING_BUFFER sets the spans kept by the memory exporter.
+        """
+        mode = (env_str("WEB3_MCP_TRACING", "off") or "off").lower()
+        exporter: SpanExporter
+        if mode in ("", "off", "false", "0"):
+            return None
+        if mode == "memory":
+            exporter = MemoryExporter(env_int("WEB3_MCP_TRACING_BUFFER", DEFAULT_BUFFER_SPANS))
+        elif mode == "console":
+            exporter = ConsoleExporter()
+        elif mode == "otel":
+            exporter = OpenTelemetryExporter()
+        else:
+            raise ValueError(f"WEB3_MCP_TRACING must be off, memory, console or otel, got {mode!r}")
+        return cls(exporter)
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Return a span to be entered as a context manager"""
+        return Span(self, name, attributes)
+
+
+# Tracer of the running server, or None when tracing is off
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the running server's tracer, or None when tracing is off"""
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install the tracer used by the server, the API wrappers and the JSON-RPC client"""
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """
+    Open a child of the current span, or do nothing when tracing is off
+
+    Args:
+        name: Operation name
+        **attributes: Span attributes; None values are dropped
+
+    Returns:
+        Context manager yielding an object with set_attribute and add
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return Span(tracer, name, attributes)
+
+
+def current() -> Any:
+    """Return the current span, or a stand-in that ignores attributes"""
+    return _current.get() or _NO_SPAN
+
+
+def count(**amounts: int) -> None:
+    """Add to counters, e.g. pages and rows, on the current trace's root span"""
+    active = _current.get()
+    if active is not None:
+        root = active.root
+        for key, amount in amounts.items():
+            root.add(key, amount)
+
+
+def _validate(tool: Any, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a tool's arguments validated, which the tool then accepts as they are"""
+    metadata = tool.fn_metadata
+    try:
+        parsed = metadata.arg_model.model_validate(metadata.pre_parse_json(arguments))
+    except ValidationError:
+        return arguments
+    validated: Dict[str, Any] = parsed.model_dump_one_level()
+    return validated
+
+
+def trace_tools(mcp: Any, tracer: Tracer) -> None:
+    """
+    Open a span for every tool call
+
+    Wraps the server's tool manager, so the span covers argument validation, the
+    tool itself and serialization of its result. Validation gets a "validate" child
+    span; arguments that fail it are passed on unchanged for FastMCP to report.
+
+    Args:
+        mcp: FastMCP server
+        tracer: Tracer to create the spans with
+    """
+    manager = mcp._tool_manager
+    call_tool = manager.call_tool
+
+    async def traced(key: str, arguments: Dict[str, Any], context: Any = None) -> Any:
+        request = arguments.get("request")
+        blockchain = request.get("blockchain") if isinstance(request, dict) else None
+        with tracer.span(f"tool {key}", tool=key, blockchain=blockchain) as tool_span:
+            tool = manager._tools.get(key)
+            if tool is not None:
+                with tracer.span("validate"):
+                    arguments = _validate(tool, arguments)
+            content = await call_tool(key, arguments, context=context)
+            tool_span.set_attribute(
+                "response_bytes", sum(len(getattr(item, "text", "") or "") for item in content)
+            )
+            return content
+
+    manager.call_tool = traced
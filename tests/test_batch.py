@@ -0,0 +1,84 @@
+"""
+Tests for the batch tools
+"""
+
+import asyncio
+import json
+import os
+from typing import Dict, Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from mcp.types import TextContent
+
+from web3_mcp.api.token import TokenPriceRequest
+from web3_mcp.batch import run_batch
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_run_batch_bounds_concurrency_and_dedupes() -> None:
+    """At most `concurrency` items run at once and duplicates are called once"""
+    running = 0
+    peak = 0
+    calls: List[str] = []
+
+    async def call(item: TokenPriceRequest) -> Dict[str, str]:
+        nonlocal running, peak
+        calls.append(item.contract_address)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"price_usd": "1"}
+
+    items = [TokenPriceRequest(blockchain="eth", contract_address=f"0x{i}") for i in range(10)]
+    result = await run_batch(items + items[:2], call, ("blockchain", "contract_address"), 3)
+
+    assert peak == 3
+    assert len(calls) == 10
+    assert result["results"]["eth:0x0"] == {"result": {"price_usd": "1"}}
+    assert result["errors"] == 0
+
+    with pytest.raises(ValueError):
+        await run_batch(items, call, ("blockchain",), max_items=5)
+
+
+@pytest.mark.asyncio
+async def test_get_token_prices_reports_per_item_errors() -> None:
+    """One unpriced token does not fail the batch"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)["params"]
+        price = "0" if params["contractAddress"] == "0xdead" else "2.5"
+        return httpx.Response(200, json={"result": {"blockchain": "eth", "usdPrice": price}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    items = [
+        {"blockchain": "eth", "contract_address": "0xabc"},
+        {"blockchain": "bsc", "contract_address": "0xdead"},
+    ]
+    content = await mcp._mcp_call_tool("get_token_prices", {"request": {"items": items}})
+    assert isinstance(content[0], TextContent)
+    result = json.loads(content[0].text)
+
+    assert result["results"]["eth:0xabc"] == {"result": {"price_usd": "2.5"}}
+    assert "error" in result["results"]["bsc:0xdead"]
+    assert result["errors"] == 1
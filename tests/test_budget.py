@@ -0,0 +1,108 @@
+"""
+Tests for the response size budget and continuation cursors
+"""
+
+import json
+import os
+from typing import Any, Dict, Generator, List, Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from mcp.types import TextContent
+
+from web3_mcp.budget import ResponseBudget, decode_cursor
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+class PageSource:
+    """Upstream page fetcher that records the page tokens it is called with"""
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.tokens: List[Optional[str]] = []
+
+    async def __call__(self, page_token: Optional[str]) -> Dict[str, Any]:
+        self.tokens.append(page_token)
+        return {"items": self.items, "next_page_token": "upstream-2"}
+
+
+@pytest.mark.asyncio
+async def test_rows_budget_continues_without_refetching() -> None:
+    """A page over the row budget is returned in slices from the remainder store"""
+    source = PageSource(list(range(5)))
+    budget = ResponseBudget(max_bytes=0, max_rows=2)
+
+    pages = [await budget.apply(None, "items", source)]
+    while pages[-1]["next_page_token"].startswith("c1."):
+        pages.append(await budget.apply(pages[-1]["next_page_token"], "items", source))
+
+    assert [page["items"] for page in pages] == [[0, 1], [2, 3], [4]]
+    assert pages[-1]["next_page_token"] == "upstream-2"
+    assert source.tokens == [None]
+    assert budget.stats()["truncated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bytes_budget_and_refetch_after_remainder_expiry() -> None:
+    """Items are cut by size, and an evicted remainder refetches only that page"""
+    source = PageSource([{"data": "x" * 100} for _ in range(10)])
+    budget = ResponseBudget(max_bytes=350)
+
+    first = await budget.apply("page-7", "items", source)
+    assert len(first["items"]) == 3
+    assert first["truncated"] is True
+
+    cursor = decode_cursor(first["next_page_token"])
+    assert (cursor.offset, cursor.page_token) == (3, "page-7")
+
+    budget._remainders.clear()
+    second = await budget.apply(first["next_page_token"], "items", source)
+    assert len(second["items"]) == 3
+    assert source.tokens == ["page-7", "page-7"]
+
+    with pytest.raises(ValueError):
+        await budget.apply("c1.not-a-cursor", "items", source)
+
+
+@pytest.mark.asyncio
+async def test_server_truncates_nft_holders_to_row_budget() -> None:
+    """get_nft_holders pages through a large upstream page with one upstream call"""
+    requests: List[Dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        holders = [f"0x{i}" for i in range(5)]
+        return httpx.Response(200, json={"result": {"holders": holders, "nextPageToken": ""}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch.dict(os.environ, {"WEB3_MCP_MAX_RESPONSE_ROWS": "2"}),
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request: Dict[str, Any] = {"blockchain": "eth", "contract_address": "0xabc"}
+    holders: List[str] = []
+    while True:
+        content = await mcp._mcp_call_tool("get_nft_holders", {"request": request})
+        assert isinstance(content[0], TextContent)
+        page = json.loads(content[0].text)
+        holders.extend(page["holders"])
+        if not page["next_page_token"]:
+            break
+        request = {**request, "page_token": page["next_page_token"]}
+
+    assert holders == [f"0x{i}" for i in range(5)]
+    assert len(requests) == 1
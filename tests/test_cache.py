@@ -0,0 +1,110 @@
+"""
+Tests for the per-tool response cache
+"""
+
+import json
+import os
+from typing import Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from web3_mcp.cache import ResponseCache, estimate_size
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ,
+        {
+            "ANKR_ENDPOINT": "https://test.endpoint",
+            "ANKR_PRIVATE_KEY": "test_key",
+            "WEB3_MCP_CACHE_TTL_GET_TOKEN_PRICE": "60",
+        },
+    ):
+        yield
+
+
+def test_entries_expire_after_ttl() -> None:
+    """Values are served until their TTL elapses"""
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+
+    cache.set("k", {"v": 1}, ttl=5)
+    clock.now = 4.9
+    assert cache.get("k") == {"v": 1}
+    clock.now = 5.0
+    assert cache.get("k") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    """The least recently used entries are evicted to honour both bounds"""
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    value = {"data": "x" * 100}
+    by_bytes = ResponseCache(max_bytes=estimate_size(value) * 2)
+    for key in ("a", "b", "c"):
+        by_bytes.set(key, value, ttl=60)
+    assert by_bytes.get("a") is None
+    assert by_bytes.stats()["entries"] == 2
+    assert by_bytes.stats()["evictions"] == 1
+
+
+def test_ttl_overrides_from_env() -> None:
+    """WEB3_MCP_CACHE_TTL_<TOOL> overrides the default policy"""
+    cache = ResponseCache.from_env()
+    assert cache is not None
+    assert cache.ttl_for("get_token_price") == 60
+    assert cache.ttl_for("get_nft_metadata") == 6 * 60 * 60
+    assert cache.ttl_for("get_supported_networks") == 0
+
+    with patch.dict(os.environ, {"WEB3_MCP_CACHE": "false"}):
+        assert ResponseCache.from_env() is None
+
+
+@pytest.mark.asyncio
+async def test_server_caches_tool_results_and_honours_no_cache() -> None:
+    """Repeated tool calls hit the cache unless no_cache is set"""
+    requests: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["method"])
+        return httpx.Response(200, json={"result": {"blockchain": "eth", "usdPrice": "1.5"}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request = {"blockchain": "eth", "contract_address": "0xabc"}
+    for _ in range(3):
+        await mcp._mcp_call_tool("get_token_price", {"request": request})
+    assert len(requests) == 1
+
+    await mcp._mcp_call_tool("get_token_price", {"request": request, "no_cache": True})
+    assert len(requests) == 2
@@ -0,0 +1,136 @@
+"""
+Tests for recording and replaying upstream traffic
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Generator
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from ankr.exceptions import APIError
+from fastmcp.exceptions import ToolError
+
+from web3_mcp.cassette import Cassette, CassetteMissError
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+def _server(cassette: Path, mode: str, handler: Any) -> Any:
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    env = {"WEB3_MCP_CASSETTE": str(cassette), "WEB3_MCP_CASSETTE_MODE": mode}
+    with (
+        patch.dict(os.environ, env),
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        return init_server(name="Test Server")
+
+
+@pytest.mark.asyncio
+async def test_replay_answers_recorded_calls_without_the_network(tmp_path: Path) -> None:
+    """Tool calls replayed from a cassette return what was recorded, errors included"""
+    cassette = tmp_path / "calls.jsonl"
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if body["params"]["tokenId"] == "404":
+            return httpx.Response(200, json={"error": {"code": -32000, "message": "not found"}})
+        metadata = {"blockchain": "eth", "tokenId": body["params"]["tokenId"]}
+        return httpx.Response(200, json={"result": {"metadata": metadata}})
+
+    def offline(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("replay reached the network")
+
+    ok = {"blockchain": "eth", "contract_address": "0xabc", "token_id": "7"}
+    missing = {**ok, "token_id": "404"}
+    recorder = _server(cassette, "record", upstream)
+    recorded = await recorder._mcp_call_tool("get_nft_metadata", {"request": ok})
+    with pytest.raises(ToolError) as recorded_error:
+        await recorder._mcp_call_tool("get_nft_metadata", {"request": missing})
+    assert len(cassette.read_text().splitlines()) == 2
+
+    replayer = _server(cassette, "replay", offline)
+    replayed = await replayer._mcp_call_tool("get_nft_metadata", {"request": ok})
+    assert replayed[0].text == recorded[0].text
+    assert '"tokenId":"7"' in replayed[0].text.replace(" ", "")
+    with pytest.raises(ToolError) as replayed_error:
+        await replayer._mcp_call_tool("get_nft_metadata", {"request": missing})
+    assert str(replayed_error.value) == str(recorded_error.value)
+    assert "not found" in str(replayed_error.value)
+
+    stats = json.loads((await replayer._mcp_read_resource("ankr://stats"))[0].content)
+    assert stats["cassette"]["mode"] == "replay"
+    assert stats["cassette"]["replayed"] == 2 and stats["cassette"]["misses"] == 0
+
+
+def test_replay_repeats_calls_in_order_and_fails_on_unrecorded(tmp_path: Path) -> None:
+    """Repeated calls replay their recordings in order, then the last one"""
+    path = tmp_path / "calls.jsonl"
+    recorder = Cassette(str(path), "record")
+    recorder.record("ankr_getLogs", {"blockchain": "eth", "pageToken": None}, {"logs": [1]})
+    recorder.record("ankr_getLogs", {"blockchain": "eth"}, {"logs": [2]})
+
+    player = Cassette(str(path))
+    assert [player.replay("ankr_getLogs", {"blockchain": "eth"})["result"] for _ in range(3)] == [
+        {"logs": [1]},
+        {"logs": [2]},
+        {"logs": [2]},
+    ]
+    with pytest.raises(CassetteMissError):
+        player.replay("ankr_getLogs", {"blockchain": "bsc"})
+    assert player.stats()["misses"] == 1
+
+
+def test_sdk_provider_records_and_replays(tmp_path: Path) -> None:
+    """SDK requests are recorded at the provider, so the SDK still parses the replies"""
+    path = tmp_path / "calls.jsonl"
+
+    class Request:
+        def __init__(self, params: Dict[str, Any]) -> None:
+            self.params = params
+
+        def to_dict(self) -> Dict[str, Any]:
+            return self.params
+
+    def make_request(method: str, request: Request) -> Dict[str, Any]:
+        if request.params["blockchain"] == "bad":
+            raise APIError({"code": -32602, "message": "invalid blockchain"})
+        return {"jsonrpc": "2.0", "id": 1, "result": {"stats": [request.params]}}
+
+    def client() -> Any:
+        sdk = MagicMock()
+        for name in ("nft", "query", "token"):
+            getattr(sdk, name).provider.make_request = make_request
+        return sdk
+
+    recorder = Cassette(str(path), "record").wrap_sdk(client())
+    recorded = recorder.query.provider.make_request(
+        "ankr_getBlockchainStats", Request({"blockchain": "eth"})
+    )
+    with pytest.raises(APIError) as recorded_error:
+        recorder.query.provider.make_request(
+            "ankr_getBlockchainStats", Request({"blockchain": "bad"})
+        )
+
+    replayer = Cassette(str(path)).wrap_sdk(MagicMock())
+    replayed = replayer.query.provider.make_request(
+        "ankr_getBlockchainStats", Request({"blockchain": "eth"})
+    )
+    assert replayed["result"] == recorded["result"]
+    with pytest.raises(APIError) as replayed_error:
+        replayer.query.provider.make_request(
+            "ankr_getBlockchainStats", Request({"blockchain": "bad"})
+        )
+    assert str(replayed_error.value) == str(recorded_error.value)
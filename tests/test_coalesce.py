@@ -0,0 +1,90 @@
+"""
+Tests for single-flight coalescing of tool calls
+"""
+
+import asyncio
+import json
+import os
+from typing import Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from web3_mcp.api.query import BlockchainStatsRequest
+from web3_mcp.api.token import TokenPriceRequest
+from web3_mcp.coalesce import SingleFlight, request_key
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+def test_request_key_normalizes_requests() -> None:
+    """Equivalent requests share a key, different ones do not"""
+    a = TokenPriceRequest(blockchain="ETH", contract_address="0xABC")
+    b = TokenPriceRequest(blockchain="eth", contract_address="0xabc")
+    c = TokenPriceRequest(blockchain="bsc", contract_address="0xabc")
+
+    assert request_key("get_token_price", a) == request_key("get_token_price", b)
+    assert request_key("get_token_price", a) != request_key("get_token_price", c)
+    assert request_key("get_token_price", a) != request_key("other_tool", a)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_results_and_errors() -> None:
+    """Concurrent callers with the same key share one call, including its failure"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def fail() -> int:
+        await asyncio.sleep(0.05)
+        raise ValueError("upstream down")
+
+    assert await asyncio.gather(*[flight.do("k", fetch) for _ in range(5)]) == [42] * 5
+    assert calls == 1
+
+    results = await asyncio.gather(
+        *[flight.do("e", fail) for _ in range(3)], return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    assert flight.stats() == {"calls": 8, "upstream_calls": 2, "coalesced": 6, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_server_coalesces_identical_tool_calls() -> None:
+    """Identical concurrent get_blockchain_stats calls make one upstream request"""
+    requests: List[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["method"])
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"result": {"stats": []}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    arguments = {"request": BlockchainStatsRequest(blockchain="eth").model_dump()}
+    await asyncio.gather(
+        *[mcp._mcp_call_tool("get_blockchain_stats", arguments) for _ in range(10)]
+    )
+
+    assert requests == ["ankr_getBlockchainStats"]
@@ -0,0 +1,144 @@
+"""
+Tests for the persistent SQLite cache tier
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from web3_mcp.disk_cache import DiskCache
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+class FakeClock:
+    """Manually advanced wall clock"""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+def test_values_persist_across_instances_until_expiry(tmp_path: Path) -> None:
+    """A reopened cache serves stored values with their remaining TTL"""
+    clock = FakeClock()
+    path = str(tmp_path / "cache.db")
+    DiskCache(path, clock=clock).set("k", {"v": 1}, ttl=120)
+    DiskCache(path, clock=clock).set("final", [1, 2], ttl=math.inf)
+    DiskCache(path, clock=clock).set("short", {"v": 2}, ttl=5)
+
+    clock.now += 20
+    reopened = DiskCache(path, clock=clock)
+    assert reopened.get("k") == ({"v": 1}, 100)
+    assert reopened.get("final") == ([1, 2], math.inf)
+    assert reopened.get("short") is None
+
+    clock.now += 100
+    assert reopened.get("k") is None
+    assert reopened.get("final") == ([1, 2], math.inf)
+
+
+def test_evicts_least_recently_accessed_entries(tmp_path: Path) -> None:
+    """The file stays within max_bytes by dropping the stalest entries"""
+    clock = FakeClock()
+    value = {"data": "x" * 100}
+    size = len(json.dumps(value, separators=(",", ":")))
+    cache = DiskCache(str(tmp_path / "cache.db"), max_bytes=size * 2, clock=clock)
+
+    for key in ("a", "b"):
+        clock.now += 1
+        cache.set(key, value, ttl=600)
+
+    def accessed(key: str) -> float:
+        conn = cache._connection()
+        return float(
+            conn.execute("SELECT accessed_at FROM entries WHERE key = ?", (key,)).fetchone()[0]
+        )
+
+    # Reads within the touch interval do not write
+    written = accessed("a")
+    cache.get("a")
+    assert accessed("a") == written
+    clock.now += cache.touch_interval
+    cache.get("a")
+    assert accessed("a") == clock.now
+    clock.now += 1
+    cache.set("c", value, ttl=600)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tracked_size_follows_writes_expiry_and_eviction(tmp_path: Path) -> None:
+    """The size total kept by triggers matches the stored values, also for older files"""
+    clock = FakeClock()
+    path = str(tmp_path / "cache.db")
+    cache = DiskCache(path, max_bytes=1_000, clock=clock)
+
+    def stored() -> int:
+        conn = cache._connection()
+        return int(conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    for i in range(20):
+        cache.set(f"k{i}", {"data": "x" * (i * 10)}, ttl=60 if i % 2 else 600)
+        cache.set("replaced", {"data": "y" * i}, ttl=600)
+        clock.now += 10
+        assert cache.stats()["bytes"] == stored() <= 1_000
+    assert cache.stats()["evictions"] > 0
+
+    # A file written before the size total existed gets it on open
+    conn = cache._connection()
+    conn.executescript("DROP TABLE meta; DROP TRIGGER entries_insert;")
+    assert DiskCache(path, max_bytes=1_000, clock=clock).stats()["bytes"] == stored()
+
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_restarted_server_is_served_from_disk(tmp_path: Path) -> None:
+    """NFT metadata fetched before a restart is not fetched again after it"""
+    requests: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content)["method"])
+        return httpx.Response(
+            200, json={"result": {"metadata": {"blockchain": "eth", "tokenId": "1"}}}
+        )
+
+    def start_server() -> object:
+        client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+        with (
+            patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+            patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+        ):
+            return init_server(name="Test Server")
+
+    arguments = {"request": {"blockchain": "eth", "contract_address": "0xabc", "token_id": "1"}}
+    with patch.dict(os.environ, {"WEB3_MCP_DISK_CACHE": str(tmp_path / "cache.db")}):
+        first = start_server()
+        await first._mcp_call_tool("get_nft_metadata", arguments)  # type: ignore
+        second = start_server()
+        after = await second._mcp_call_tool("get_nft_metadata", arguments)  # type: ignore
+
+    assert requests == ["ankr_getNFTMetadata"]
+    assert json.loads(after[0].text)["metadata"]["tokenId"] == "1"
@@ -0,0 +1,137 @@
+"""
+Tests for the bounded executor used by the API wrappers
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Generator, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from web3_mcp.executor import BlockingExecutor, ExecutorSaturatedError
+from web3_mcp.server import init_server
+
+UPSTREAM_DELAY = 0.2
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ,
+        {
+            "ANKR_ENDPOINT": "https://test.endpoint",
+            "ANKR_PRIVATE_KEY": "test_key",
+            "WEB3_MCP_MAX_WORKERS": "8",
+            "WEB3_MCP_UPSTREAM": "sdk",
+        },
+    ):
+        yield
+
+
+@pytest.fixture
+def slow_ankr_web3() -> Generator[MagicMock, None, None]:
+    """Mock AnkrWeb3 client whose calls block like a slow upstream"""
+
+    def slow_call(**kwargs: Any) -> Any:
+        time.sleep(UPSTREAM_DELAY)
+        return MagicMock(stats=[])
+
+    with patch("web3_mcp.auth.AnkrWeb3") as mock:
+        mock_client = MagicMock()
+        mock_client.query.provider.call_method.side_effect = slow_call
+        mock.return_value = mock_client
+        yield mock_client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tool_calls_do_not_block_event_loop(slow_ankr_web3: MagicMock) -> None:
+    """N concurrent tool calls complete in roughly the time of one"""
+    mcp = init_server(name="Test Server")
+    calls = 8
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *[
+            mcp._mcp_call_tool("get_blockchain_stats", {"request": {"blockchain": f"chain{i}"}})
+            for i in range(calls)
+        ]
+    )
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == calls
+    assert slow_ankr_web3.query.provider.call_method.call_count == calls
+    assert elapsed < UPSTREAM_DELAY * 3
+
+
+@pytest.mark.asyncio
+async def test_executor_limits_concurrency() -> None:
+    """No more than max_workers calls run at the same time"""
+    executor = BlockingExecutor(max_workers=2, max_queue=0)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def work() -> None:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    await asyncio.gather(*[executor.run(work) for _ in range(6)])
+
+    stats = executor.stats()
+    assert peak == 2
+    assert stats["completed"] == 6
+    assert stats["peak_queued"] >= 4
+    assert stats["queued"] == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_is_full() -> None:
+    """Calls beyond the queue bound fail fast"""
+    executor = BlockingExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    first = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ExecutorSaturatedError):
+        await asyncio.gather(executor.run(time.sleep, 0), executor.run(time.sleep, 0))
+
+    release.set()
+    await first
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_calls_release_their_queue_slots() -> None:
+    """Calls cancelled before a worker picks them up no longer count as queued"""
+    executor = BlockingExecutor(max_workers=1, max_queue=4)
+    release = threading.Event()
+    ran: List[int] = []
+
+    first = asyncio.ensure_future(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    queued = [asyncio.ensure_future(executor.run(ran.append, i)) for i in range(4)]
+    await asyncio.sleep(0.05)
+    assert executor.stats()["queued"] == 4
+
+    for task in queued:
+        task.cancel()
+    await asyncio.gather(*queued, return_exceptions=True)
+    release.set()
+    await first
+
+    assert executor.stats()["queued"] == 0
+    assert ran == []
+    await executor.run(time.sleep, 0)
+    executor.shutdown()
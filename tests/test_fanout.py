@@ -0,0 +1,115 @@
+"""
+Tests for concurrent multi-chain fan-out
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, Generator
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from mcp.types import TextContent
+
+from web3_mcp.constants import SUPPORTED_NETWORKS
+from web3_mcp.fanout import fan_out
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ,
+        {
+            "ANKR_ENDPOINT": "https://test.endpoint",
+            "ANKR_PRIVATE_KEY": "test_key",
+            "WEB3_MCP_FANOUT_DEADLINE": "0.1",
+        },
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_fan_out_returns_partial_results_with_chain_status() -> None:
+    """Slow and failing chains are reported without holding up the rest"""
+
+    async def fetch(chain: str) -> Dict[str, Any]:
+        if chain == "slow":
+            await asyncio.sleep(1)
+        if chain == "broken":
+            raise ValueError("unsupported")
+        return {"assets": [chain], "next_page_token": f"{chain}-2"}
+
+    start = time.perf_counter()
+    result = await fan_out(["eth", "slow", "broken", "bsc"], fetch, "assets", deadline=0.1)
+    assert time.perf_counter() - start < 0.5
+
+    assert sorted(result["assets"]) == ["bsc", "eth"]
+    assert list(result["chains"]) == ["eth", "slow", "broken", "bsc"]
+    assert result["chains"]["eth"]["status"] == "ok"
+    assert result["chains"]["eth"]["next_page_token"] == "eth-2"
+    assert result["chains"]["slow"]["status"] == "timeout"
+    assert result["chains"]["broken"] == {
+        "elapsed_ms": result["chains"]["broken"]["elapsed_ms"],
+        "status": "error",
+        "error": "unsupported",
+    }
+    assert result["complete"] is False
+
+    with pytest.raises(ValueError):
+        await fan_out(["broken"], fetch, "assets")
+
+
+@pytest.mark.asyncio
+async def test_fan_out_merges_items_in_chain_order() -> None:
+    """Items are ordered by chain, not by which chain answered first"""
+
+    async def fetch(chain: str) -> Dict[str, Any]:
+        await asyncio.sleep({"eth": 0.03, "bsc": 0.02, "polygon": 0.0}[chain])
+        return {"assets": [f"{chain}-1", f"{chain}-2"]}
+
+    result = await fan_out(["eth", "bsc", "polygon"], fetch, "assets", deadline=1)
+    assert result["assets"] == ["eth-1", "eth-2", "bsc-1", "bsc-2", "polygon-1", "polygon-2"]
+
+
+@pytest.mark.asyncio
+async def test_server_fans_out_account_balance_without_blockchain() -> None:
+    """A chain-less get_account_balance queries every supported chain concurrently"""
+    chains = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        chain = json.loads(request.content)["params"]["blockchain"]
+        chains.append(chain)
+        if chain == "polygon":
+            await asyncio.sleep(0.3)
+        asset = {"blockchain": chain, "balance": "1"}
+        return httpx.Response(200, json={"result": {"assets": [asset]}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    arguments = {"request": {"wallet_address": "0x1"}}
+    content = await mcp._mcp_call_tool("get_account_balance", arguments)
+    assert isinstance(content[0], TextContent)
+    result = json.loads(content[0].text)
+
+    assert sorted(chains) == sorted(SUPPORTED_NETWORKS)
+    assert len(result["assets"]) == len(SUPPORTED_NETWORKS) - 1
+    assert result["chains"]["polygon"]["status"] == "timeout"
+    assert result["complete"] is False
+
+    # The slow chain's call keeps running after its deadline and warms the cache
+    await asyncio.sleep(0.3)
+    content = await mcp._mcp_call_tool("get_account_balance", arguments)
+    assert isinstance(content[0], TextContent)
+    result = json.loads(content[0].text)
+    assert result["complete"] is True
+    assert len(chains) == len(SUPPORTED_NETWORKS)
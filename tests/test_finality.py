@@ -0,0 +1,89 @@
+"""
+Tests for finality-aware caching of block ranges
+"""
+
+import json
+import math
+import os
+from typing import Generator, List, Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from web3_mcp.api.query import BlocksRequest, LogsRequest
+from web3_mcp.finality import FinalityPolicy
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_policy_ttl_by_distance_from_head() -> None:
+    """Ranges below head - depth never expire; recent and open ranges keep the tool TTL"""
+
+    async def head(blockchain: str) -> Optional[int]:
+        return 1000
+
+    policy = FinalityPolicy(head, depths={"eth": 64})
+
+    final = LogsRequest(blockchain="eth", from_block=1, to_block=936)
+    recent = LogsRequest(blockchain="eth", from_block=1, to_block=937)
+    open_ended = BlocksRequest(blockchain="eth", from_block=1)
+
+    assert await policy.ttl("get_logs", final, 15) == math.inf
+    assert await policy.ttl("get_logs", recent, 15) == 15
+    assert await policy.ttl("get_blocks", open_ended, 15) == 15
+    assert await policy.ttl("get_token_price", final, 30) == 30
+    assert policy.stats() == {"final": 1, "recent": 2}
+
+
+@pytest.mark.asyncio
+async def test_policy_treats_failed_head_lookup_as_not_final() -> None:
+    """An unavailable head never makes a range permanent"""
+
+    async def head(blockchain: str) -> Optional[int]:
+        raise RuntimeError("upstream down")
+
+    policy = FinalityPolicy(head)
+    assert not await policy.is_final("eth", 1)
+
+
+@pytest.mark.asyncio
+async def test_server_caches_finalized_logs_permanently() -> None:
+    """Finalized get_logs results outlive the tool TTL; the head comes from stats"""
+    requests: List[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        method = json.loads(request.content)["method"]
+        requests.append(method)
+        if method == "ankr_getBlockchainStats":
+            stats = {"blockchain": "eth", "latestBlockNumber": 20_000}
+            return httpx.Response(200, json={"result": {"stats": [stats]}})
+        return httpx.Response(200, json={"result": {"logs": []}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request = {"blockchain": "eth", "from_block": 100, "to_block": 200}
+    await mcp._mcp_call_tool("get_logs", {"request": request})
+    assert requests == ["ankr_getLogs", "ankr_getBlockchainStats"]
+
+    await mcp._mcp_call_tool("get_logs", {"request": request})
+    assert requests.count("ankr_getLogs") == 1
+
+    contents = await mcp._mcp_read_resource("ankr://stats")
+    stats = json.loads(contents[0].content)
+    assert stats["finality"] == {"final": 1, "recent": 0}
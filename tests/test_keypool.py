@@ -0,0 +1,116 @@
+"""
+Tests for the API key pool and its health-weighted load balancing
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, Generator, List
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from web3_mcp.auth import AnkrAuth
+from web3_mcp.constants import ANKR_MULTICHAIN_URL
+from web3_mcp.keypool import RpcPool, parse_pool
+from web3_mcp.rpc import AnkrRpcClient, AnkrRpcError
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(os.environ, {"ANKR_ENDPOINT": "https://test.endpoint"}, clear=True):
+        yield
+
+
+class Upstream:
+    """Mock upstream answering per key, with per-key failure statuses"""
+
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.status: Dict[str, int] = {}
+
+    def client(self, url: str) -> AnkrRpcClient:
+        key = url.rsplit("/", 1)[-1]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.calls[key] += 1
+            status = self.status.get(key, 200)
+            if status != 200:
+                return httpx.Response(status)
+            return httpx.Response(200, json={"result": {"key": key}})
+
+        return AnkrRpcClient(url, transport=httpx.MockTransport(handler))
+
+
+def _pool(upstream: Upstream, spec: str, clock: List[float]) -> RpcPool:
+    members = [(f"https://rpc.test/{key}", weight) for key, weight in parse_pool(spec)]
+    return RpcPool(
+        members,
+        max_failures=2,
+        eject_seconds=10,
+        client_factory=upstream.client,
+        clock=lambda: clock[0],
+    )
+
+
+async def _spread(pool: RpcPool, calls: int) -> None:
+    for _ in range(calls):
+        try:
+            await pool.call("ankr_getBlockchainStats", {})
+        except AnkrRpcError:
+            pass
+
+
+@pytest.mark.asyncio
+async def test_weighted_round_robin() -> None:
+    """Calls are spread in proportion to member weights"""
+    upstream = Upstream()
+    pool = _pool(upstream, "a*3,b", [0.0])
+    await _spread(pool, 8)
+    assert upstream.calls == {"a": 6, "b": 2}
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_throttled_and_failing_members_are_ejected_and_readmitted() -> None:
+    """429 ejects a member at once; repeated 5xx after max_failures; both come back later"""
+    clock = [0.0]
+    upstream = Upstream()
+    pool = _pool(upstream, "a,b,c", clock)
+    upstream.status = {"a": 429, "b": 503}
+
+    await _spread(pool, 12)
+    # a is ejected after one 429, b after two 503s; c serves the rest
+    assert (upstream.calls["a"], upstream.calls["b"], upstream.calls["c"]) == (1, 2, 9)
+    stats = pool.stats()
+    assert [member["healthy"] for member in stats.values()] == [False, False, True]
+
+    upstream.status = {}
+    clock[0] = 11.0
+    upstream.calls.clear()
+    await _spread(pool, 9)
+    assert set(upstream.calls) == {"a", "b", "c"}
+    # Re-admitted members start at weight 1 and earn their weight back
+    assert all(member["effective_weight"] == 1 for member in pool.stats().values())
+    await pool.aclose()
+
+
+def test_auth_builds_pool_from_env_and_file(tmp_path: Any) -> None:
+    """Comma-separated keys or a pool file configure several members"""
+    with patch.dict(os.environ, {"ANKR_PRIVATE_KEY": "k1*2, k2"}):
+        auth = AnkrAuth()
+    assert auth.private_key == "k1"
+    assert auth.rpc_urls == [(ANKR_MULTICHAIN_URL + "k1", 2), (ANKR_MULTICHAIN_URL + "k2", 1)]
+    assert isinstance(auth.rpc_client, RpcPool)
+
+    path = tmp_path / "keys.json"
+    path.write_text(json.dumps([{"key": "k3", "weight": 4}, {"url": "https://rpc.test/x"}]))
+    with patch.dict(os.environ, {"ANKR_PRIVATE_KEY": "k1", "WEB3_MCP_KEY_POOL_FILE": str(path)}):
+        auth = AnkrAuth()
+    assert auth.rpc_urls == [(ANKR_MULTICHAIN_URL + "k3", 4), ("https://rpc.test/x", 1)]
+
+    with patch.dict(os.environ, {"ANKR_PRIVATE_KEY": "k1"}):
+        auth = AnkrAuth()
+    assert isinstance(auth.rpc_client, AnkrRpcClient)
@@ -0,0 +1,149 @@
+"""
+Tests for concurrent block-range sharding of get_logs
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Tuple
+
+import httpx
+import pytest
+
+from web3_mcp.api.query import LogsRequest, QueryApi, _log_position
+from web3_mcp.executor import BlockingExecutor
+from web3_mcp.rpc import AnkrRpcClient
+
+
+class FakeLogChain:
+    """Upstream with one log every `step` blocks, three in block 5000, and a range limit"""
+
+    def __init__(self, step: int = 100, max_range: int = 1500) -> None:
+        self.max_range = max_range
+        self.logs: List[Dict[str, Any]] = []
+        for block in range(0, 10_000, step):
+            for index in range(3 if block == 5000 else 1):
+                self.logs.append(
+                    {
+                        "address": "0xabc",
+                        "blockHash": "0x1",
+                        "blockNumber": hex(block),
+                        "blockchain": "eth",
+                        "data": "0x",
+                        "logIndex": hex(index),
+                        "removed": False,
+                        "topics": [],
+                        "transactionHash": f"0x{block}{index}",
+                        "transactionIndex": "0x0",
+                    }
+                )
+        self.in_flight = 0
+        self.peak = 0
+        self.ranges: List[Tuple[int, int]] = []
+        self.rows = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)["params"]
+        start, end = params["fromBlock"], params["toBlock"]
+        self.ranges.append((start, end))
+        if end - start + 1 > self.max_range:
+            error = {"code": -32000, "message": "query returned too many results"}
+            return httpx.Response(200, json={"error": error})
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+        logs = [log for log in self.logs if start <= int(log["blockNumber"], 16) <= end]
+        if params.get("descOrder"):
+            logs.reverse()
+        offset = int(params.get("pageToken") or 0)
+        page = logs[offset : offset + params["pageSize"]]
+        self.rows += len(page)
+        more = offset + params["pageSize"] < len(logs)
+        result: Dict[str, Any] = {"logs": page}
+        if more:
+            result["nextPageToken"] = str(offset + params["pageSize"])
+        return httpx.Response(200, json={"result": result})
+
+
+async def _scan(api: QueryApi, request: LogsRequest) -> Tuple[List[str], int]:
+    hashes: List[str] = []
+    pages = 0
+    async for page in api.iter_logs(request):
+        pages += 1
+        hashes.extend(log["transactionHash"] for log in page["logs"])
+    return hashes, pages
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.asyncio
+async def test_sharded_scan_returns_every_log_once_in_order(descending: bool) -> None:
+    """Pages over a wide range are complete, ordered, and never repeat a log"""
+    chain = FakeLogChain()
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(chain))
+    api = QueryApi(None, BlockingExecutor(max_workers=1), client)
+
+    request = LogsRequest(
+        blockchain="eth",
+        from_block=0,
+        to_block=9_999,
+        descending_order=descending,
+        page_size=7,
+    )
+    hashes, pages = await _scan(api, request)
+
+    ordered = sorted(chain.logs, key=_log_position, reverse=descending)
+    assert hashes == [log["transactionHash"] for log in ordered]
+    assert pages == -(-len(ordered) // 7)
+    assert chain.peak > 1
+    # 2000-block shards were rejected, split, and later waves used smaller shards
+    sizes = [end - start + 1 for start, end in chain.ranges]
+    assert sizes[0] == 2000 and max(sizes) == 2000
+    assert sizes[-1] <= chain.max_range
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_narrow_ranges_are_not_sharded() -> None:
+    """Requests within one shard keep the single upstream call"""
+    chain = FakeLogChain()
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(chain))
+    api = QueryApi(None, BlockingExecutor(max_workers=1), client)
+
+    result = await api.get_logs(LogsRequest(blockchain="eth", from_block=0, to_block=999))
+    assert len(result["logs"]) == 10
+    assert chain.ranges == [(0, 999)]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sharded_pages_apply_field_projection() -> None:
+    """Projected sharded pages keep their order but only the requested fields"""
+    chain = FakeLogChain()
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(chain))
+    api = QueryApi(None, BlockingExecutor(max_workers=1), client)
+
+    request = LogsRequest(
+        blockchain="eth", from_block=0, to_block=9_999, page_size=5, fields=["transactionHash"]
+    )
+    result = await api.get_logs(request)
+
+    assert result["logs"] == [{"transactionHash": f"0x{block}0"} for block in range(0, 500, 100)]
+    assert result["next_page_token"].startswith("s1.")
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_small_sharded_pages_fetch_few_upstream_rows() -> None:
+    """Shards ask only for the rows the page needs and later shards are not consumed"""
+    chain = FakeLogChain(step=1, max_range=10_000)
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(chain))
+    api = QueryApi(None, BlockingExecutor(max_workers=1), client)
+
+    request = LogsRequest(blockchain="eth", from_block=0, to_block=9_999, page_size=5)
+    result = await api.get_logs(request)
+
+    assert [log["transactionHash"] for log in result["logs"]] == [f"0x{b}0" for b in range(5)]
+    assert chain.rows <= 5 * api.log_shard_concurrency
+    await client.aclose()
@@ -0,0 +1,44 @@
+"""
+Tests for the command line entry point
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from web3_mcp.__main__ import parse_args
+from web3_mcp.serve import serve_sse
+
+
+def test_defaults_to_stdio_and_reads_env() -> None:
+    """Options default to stdio, and WEB3_MCP_* variables set their defaults"""
+    with patch.dict(os.environ, {}, clear=True):
+        args = parse_args([])
+    assert (args.transport, args.host, args.port, args.workers) == ("stdio", "127.0.0.1", 8000, 1)
+
+    env = {"WEB3_MCP_TRANSPORT": "sse", "WEB3_MCP_PORT": "9000", "WEB3_MCP_WORKERS": "4"}
+    with patch.dict(os.environ, env):
+        args = parse_args(["--host", "0.0.0.0", "--shutdown-timeout", "3"])
+    assert (args.transport, args.host, args.port, args.workers) == ("sse", "0.0.0.0", 9000, 4)
+    assert args.shutdown_timeout == 3
+
+
+def test_rejects_workers_without_sse() -> None:
+    """Several workers only make sense for the SSE transport"""
+    with pytest.raises(SystemExit):
+        parse_args(["--workers", "2"])
+    with pytest.raises(SystemExit):
+        parse_args(["--transport", "sse", "--workers", "0"])
+
+
+def test_fractional_shutdown_timeout_rounds_up() -> None:
+    """uvicorn's whole-second grace period is never shorter than the requested one"""
+    mcp = MagicMock()
+    mcp.settings.log_level = "INFO"
+    with (
+        patch("web3_mcp.serve.sse_app", return_value=MagicMock()),
+        patch("web3_mcp.serve.uvicorn.Server") as server,
+    ):
+        serve_sse(mcp, "127.0.0.1", 8000, shutdown_timeout=0.5)
+    assert server.call_args.args[0].timeout_graceful_shutdown == 1
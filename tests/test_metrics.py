@@ -0,0 +1,108 @@
+"""
+Tests for the Prometheus-style tool and upstream metrics
+"""
+
+import json
+import os
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+
+from web3_mcp.metrics import Metrics, get_metrics, set_metrics
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.serve import sse_app
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables and reset the process-wide registry"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+    set_metrics(None)
+
+
+@pytest.mark.asyncio
+async def test_histograms_counters_and_gauges_render_as_text() -> None:
+    """Buckets are cumulative, errors are labelled by type and in-flight returns to zero"""
+    ticks = iter([0.0, 0.2, 1.0, 4.0])
+    metrics = Metrics(clock=lambda: next(ticks))
+
+    async def ok() -> int:
+        return 1
+
+    async def fail() -> int:
+        raise TimeoutError("slow")
+
+    assert await metrics.track_upstream("ankr_getLogs", ok) == 1
+    with pytest.raises(TimeoutError):
+        await metrics.track_upstream("ankr_getLogs", fail)
+    metrics.observe_upstream_bytes("ankr_getLogs", 2000)
+
+    text = metrics.render()
+    assert 'web3_mcp_upstream_duration_seconds_bucket{method="ankr_getLogs",le="0.25"} 1' in text
+    assert 'web3_mcp_upstream_duration_seconds_bucket{method="ankr_getLogs",le="2.5"} 1' in text
+    assert 'web3_mcp_upstream_duration_seconds_bucket{method="ankr_getLogs",le="5"} 2' in text
+    assert 'web3_mcp_upstream_duration_seconds_bucket{method="ankr_getLogs",le="+Inf"} 2' in text
+    assert 'web3_mcp_upstream_duration_seconds_sum{method="ankr_getLogs"} 3.2' in text
+    assert 'web3_mcp_upstream_duration_seconds_count{method="ankr_getLogs"} 2' in text
+    assert 'web3_mcp_upstream_errors_total{method="ankr_getLogs",error="TimeoutError"} 1' in text
+    assert 'web3_mcp_upstream_in_flight{method="ankr_getLogs"} 0' in text
+    assert 'web3_mcp_upstream_response_bytes_bucket{method="ankr_getLogs",le="1024"} 0' in text
+    assert 'web3_mcp_upstream_response_bytes_bucket{method="ankr_getLogs",le="4096"} 1' in text
+    assert "# TYPE web3_mcp_tool_duration_seconds histogram" in text
+
+
+@pytest.mark.asyncio
+async def test_server_records_tool_and_upstream_calls_and_serves_them() -> None:
+    """Tool and upstream calls are measured and scraped from /metrics"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["params"]["tokenId"] == "404":
+            return httpx.Response(503)
+        result = {"metadata": {"blockchain": "eth", "tokenId": "7"}}
+        return httpx.Response(200, json={"result": result})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    env = {"WEB3_MCP_METRICS": "1", "WEB3_MCP_RETRY_MAX": "0"}
+    with (
+        patch.dict(os.environ, env),
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request = {"blockchain": "eth", "contract_address": "0xabc", "token_id": "7"}
+    await mcp._mcp_call_tool("get_nft_metadata", {"request": request})
+    request["token_id"] = "404"
+    with pytest.raises(Exception):
+        await mcp._mcp_call_tool("get_nft_metadata", {"request": request})
+    await client.aclose()
+
+    response = TestClient(sse_app(mcp)).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'web3_mcp_tool_duration_seconds_count{tool="get_nft_metadata"} 2' in text
+    assert 'web3_mcp_tool_errors_total{tool="get_nft_metadata",error="AnkrRpcError"} 1' in text
+    assert 'web3_mcp_tool_response_bytes_count{tool="get_nft_metadata"} 1' in text
+    assert 'web3_mcp_upstream_duration_seconds_count{method="ankr_getNFTMetadata"} 2' in text
+    assert (
+        'web3_mcp_upstream_errors_total{method="ankr_getNFTMetadata",error="AnkrRpcError"} 1'
+        in text
+    )
+    assert 'web3_mcp_upstream_response_bytes_count{method="ankr_getNFTMetadata"} 2' in text
+
+
+def test_metrics_are_off_by_default() -> None:
+    """Without WEB3_MCP_METRICS no registry or hooks are installed"""
+    with patch("web3_mcp.auth.AnkrWeb3", MagicMock()):
+        mcp = init_server(name="Test Server")
+    assert get_metrics() is None
+    assert "instrumented" not in mcp._tool_manager.call_tool.__qualname__
+    assert TestClient(sse_app(mcp)).get("/metrics").status_code == 404
@@ -0,0 +1,90 @@
+"""
+Tests for page-at-a-time pagination in the API wrappers
+"""
+
+import json
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from web3_mcp.api.nft import NFTApi, NFTHoldersRequest
+from web3_mcp.api.query import BlocksRequest, InteractionsRequest, LogsRequest, QueryApi
+from web3_mcp.executor import BlockingExecutor
+from web3_mcp.rpc import AnkrRpcClient
+
+
+class RecordingUpstream:
+    """Mock upstream that records requests and answers with canned results"""
+
+    def __init__(self, results: Dict[str, Dict[str, Any]]):
+        self.results = results
+        self.requests: List[Dict[str, Any]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        return httpx.Response(200, json={"result": self.results[body["method"]]})
+
+    def client(self) -> AnkrRpcClient:
+        return AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(self))
+
+
+@pytest.mark.asyncio
+async def test_logs_fetch_one_page_and_return_upstream_token() -> None:
+    """get_logs issues exactly one upstream request and forwards nextPageToken"""
+    upstream = RecordingUpstream({"ankr_getLogs": {"logs": [], "nextPageToken": "page-2"}})
+    api = QueryApi(None, BlockingExecutor(max_workers=1), upstream.client())
+
+    result = await api.get_logs(LogsRequest(blockchain="eth", page_token="page-1", page_size=10))
+
+    assert result["next_page_token"] == "page-2"
+    assert len(upstream.requests) == 1
+    assert upstream.requests[0]["params"]["pageToken"] == "page-1"
+    assert upstream.requests[0]["params"]["pageSize"] == 10
+
+
+@pytest.mark.asyncio
+async def test_page_size_is_capped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Requested page sizes are clamped to WEB3_MCP_MAX_PAGE_SIZE"""
+    monkeypatch.setenv("WEB3_MCP_MAX_PAGE_SIZE", "100")
+    upstream = RecordingUpstream({"ankr_getNFTHolders": {"holders": ["0x1"], "nextPageToken": ""}})
+    api = NFTApi(None, BlockingExecutor(max_workers=1), upstream.client())
+
+    result = await api.get_nft_holders(
+        NFTHoldersRequest(blockchain="eth", contract_address="0xabc", page_size=5000)
+    )
+
+    assert result == {"holders": ["0x1"], "next_page_token": ""}
+    assert upstream.requests[0]["params"]["pageSize"] == 100
+
+    # Only the clamped arguments matter here, not the SDK request type
+    query = QueryApi(None, BlockingExecutor(max_workers=1), upstream.client())
+    request = InteractionsRequest(blockchain="eth", wallet_address="0x1", page_size=0)
+    with (
+        patch("web3_mcp.api.query.GetInteractionsRequest", side_effect=RuntimeError) as made,
+        pytest.raises(RuntimeError),
+    ):
+        await query.get_interactions(request)
+    assert made.call_args.kwargs["pageSize"] == 1
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_paged_in_windows() -> None:
+    """get_blocks walks the requested range page_size blocks at a time"""
+    upstream = RecordingUpstream({"ankr_getBlocks": {"blocks": []}})
+    api = QueryApi(None, BlockingExecutor(max_workers=1), upstream.client())
+    request = BlocksRequest(blockchain="eth", from_block=100, to_block=124, page_size=10)
+
+    tokens = []
+    while True:
+        result = await api.get_blocks(request)
+        tokens.append(result["next_page_token"])
+        if not result["next_page_token"]:
+            break
+        request = request.model_copy(update={"page_token": result["next_page_token"]})
+
+    windows = [(r["params"]["fromBlock"], r["params"]["toBlock"]) for r in upstream.requests]
+    assert windows == [("100", "109"), ("110", "119"), ("120", "124")]
+    assert tokens == ["110", "120", ""]
@@ -0,0 +1,97 @@
+"""
+Tests for sampled profiling of tool calls
+"""
+
+import json
+import os
+import pstats
+import time
+from pathlib import Path
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from web3_mcp.profiling import Profiler
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_server_writes_profiles_named_by_tool_and_latency(tmp_path: Path) -> None:
+    """A profiled tool call leaves a pstats file named after the tool"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        result = {"metadata": {"blockchain": "eth", "tokenId": "7"}}
+        return httpx.Response(200, json={"result": result})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    env = {"WEB3_MCP_PROFILE_DIR": str(tmp_path), "WEB3_MCP_PROFILE_RATE": "100"}
+    with (
+        patch.dict(os.environ, env),
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request = {"blockchain": "eth", "contract_address": "0xabc", "token_id": "7"}
+    await mcp._mcp_call_tool("get_nft_metadata", {"request": request})
+    await client.aclose()
+
+    [profile] = list(tmp_path.iterdir())
+    assert profile.name.startswith("get_nft_metadata-") and profile.suffix == ".prof"
+    assert "ms-" in profile.name
+    functions = {name for _, _, name in pstats.Stats(str(profile)).stats}  # type: ignore[attr-defined]
+    assert "get_nft_metadata" in functions
+
+    stats = json.loads((await mcp._mcp_read_resource("ankr://stats"))[0].content)
+    assert stats["profiling"]["profiled"] == stats["profiling"]["written"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unsampled_and_fast_calls_are_not_written(tmp_path: Path) -> None:
+    """Calls outside the sample rate or under the latency threshold leave no profile"""
+
+    async def call() -> int:
+        return 1
+
+    unsampled = Profiler(str(tmp_path), rate=10, random_source=lambda: 0.5)
+    assert await unsampled.call("get_logs", call) == 1
+    fast = Profiler(str(tmp_path), rate=100, min_ms=1000)
+    assert await fast.call("get_logs", call) == 1
+
+    assert unsampled.stats()["profiled"] == 0
+    assert fast.stats()["profiled"] == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_sample_mode_writes_collapsed_stacks(tmp_path: Path) -> None:
+    """Statistical profiles record the stacks the event loop thread spent time in"""
+
+    def busy_serialization() -> None:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    async def call() -> None:
+        busy_serialization()
+
+    profiler = Profiler(str(tmp_path), rate=100, mode="sample")
+    await profiler.call("get_nfts_by_owner", call)
+
+    [profile] = list(tmp_path.iterdir())
+    assert profile.name.startswith("get_nfts_by_owner-") and profile.suffix == ".folded"
+    stacks = profile.read_text().splitlines()
+    assert any("busy_serialization" in line.rsplit(" ", 1)[0] for line in stacks)
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in stacks)
@@ -0,0 +1,104 @@
+"""
+Tests for per-method rate limiting, retries and backoff
+"""
+
+import time
+from typing import List, Optional
+
+import httpx
+import pytest
+
+from web3_mcp.api.nft import NFTApi, NFTByOwnerRequest
+from web3_mcp.executor import BlockingExecutor
+from web3_mcp.ratelimit import RateLimiter, RetryBudget, TokenBucket
+from web3_mcp.rpc import AnkrRpcClient, AnkrRpcError
+
+
+def _limiter(retry_budget: Optional[RetryBudget] = None) -> RateLimiter:
+    """Unthrottled limiter with near-zero backoff"""
+    return RateLimiter(default_rate=0, base_delay=0.001, max_delay=0.01, retry_budget=retry_budget)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_calls_and_adapts_rate() -> None:
+    """Calls beyond the burst wait for tokens; 429s halve the rate and successes restore it"""
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.perf_counter()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.perf_counter() - start >= 0.04
+
+    bucket.throttle()
+    bucket.throttle()
+    assert bucket.rate == 25
+    for _ in range(20):
+        bucket.recover()
+    assert bucket.rate == 100
+
+
+@pytest.mark.asyncio
+async def test_retries_429_and_5xx_but_not_client_errors() -> None:
+    """Transient failures are retried with backoff; other errors propagate at once"""
+    limiter = _limiter()
+    outcomes: List[Exception] = [
+        AnkrRpcError("rate limited", status=429, retry_after=0),
+        AnkrRpcError("bad gateway", status=502),
+    ]
+
+    async def flaky() -> str:
+        if outcomes:
+            raise outcomes.pop(0)
+        return "ok"
+
+    assert await limiter.call("ankr_getLogs", flaky) == "ok"
+
+    calls = 0
+
+    async def invalid() -> str:
+        nonlocal calls
+        calls += 1
+        raise AnkrRpcError("invalid params", code=-32602)
+
+    with pytest.raises(AnkrRpcError):
+        await limiter.call("ankr_getLogs", invalid)
+    assert calls == 1
+
+    stats = limiter.stats()["methods"]["ankr_getLogs"]
+    assert (stats["calls"], stats["retries"], stats["rate_limited"], stats["failures"]) == (
+        2,
+        2,
+        1,
+        1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_stops_retry_storms() -> None:
+    """Once the retry budget is spent, failures are no longer retried"""
+    limiter = _limiter(RetryBudget(ratio=0, reserve=2))
+    attempts = 0
+
+    async def down() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise AnkrRpcError("unavailable", status=503)
+
+    for _ in range(3):
+        with pytest.raises(AnkrRpcError):
+            await limiter.call("ankr_getNFTsByOwner", down)
+    # 3 first attempts plus the 2 retries the budget allowed
+    assert attempts == 5
+
+
+@pytest.mark.asyncio
+async def test_get_nfts_by_owner_propagates_upstream_errors() -> None:
+    """Upstream failures are raised instead of being returned as an empty wallet"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(400)
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    api = NFTApi(None, BlockingExecutor(max_workers=1), client, _limiter())
+    with pytest.raises(AnkrRpcError):
+        await api.get_nfts_by_owner(NFTByOwnerRequest(wallet_address="0x1"))
+    await client.aclose()
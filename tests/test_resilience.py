@@ -0,0 +1,150 @@
+"""
+Tests for hedged requests and the per-method circuit breaker
+"""
+
+import asyncio
+from typing import List
+
+import httpx
+import pytest
+
+from web3_mcp.api.nft import NFTApi, NFTByOwnerRequest, NFTMetadataRequest
+from web3_mcp.executor import BlockingExecutor
+from web3_mcp.ratelimit import RateLimiter, TokenBucket
+from web3_mcp.resilience import CircuitBreaker, CircuitOpenError, Hedger, is_degraded
+from web3_mcp.rpc import AnkrRpcClient, AnkrRpcError
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_first_response_and_cancels_the_other() -> None:
+    """A slow first call is hedged after the delay and the faster duplicate wins"""
+    hedger = Hedger(initial_delay=0.01)
+    delays = [1.0, 0.0]
+    cancelled: List[int] = []
+
+    async def call() -> str:
+        attempt = 2 - len(delays)
+        try:
+            await asyncio.sleep(delays.pop(0))
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return f"attempt-{attempt}"
+
+    assert await hedger.call("ankr_getNFTMetadata", call) == "attempt-1"
+    await asyncio.sleep(0)
+    assert cancelled == [0]
+    assert hedger.stats()["hedged"] == hedger.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_latency_percentile_and_skips_other_methods() -> None:
+    """The hedge delay is the observed percentile; non-idempotent methods are never hedged"""
+    hedger = Hedger(percentile=50, min_delay=0, initial_delay=5)
+    for _ in range(30):
+        await hedger.call("ankr_getTokenPrice", lambda: asyncio.sleep(0.001))
+    assert hedger.delay("ankr_getTokenPrice") < 0.1
+    assert hedger.delay("ankr_getLogs") == 5
+
+    calls = 0
+
+    async def slow() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+
+    hedger.initial_delay = 0
+    await hedger.call("ankr_getLogs", slow)
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers_after_cooldown() -> None:
+    """Consecutive degraded failures open the circuit until a trial call succeeds"""
+    now = 0.0
+    breaker = CircuitBreaker(failures=2, cooldown=10, clock=lambda: now)
+    calls = 0
+
+    async def down() -> None:
+        nonlocal calls
+        calls += 1
+        raise AnkrRpcError("unavailable", status=503)
+
+    async def up() -> str:
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(AnkrRpcError):
+            await breaker.call("ankr_getLogs", down)
+    with pytest.raises(CircuitOpenError):
+        await breaker.call("ankr_getLogs", down)
+    assert calls == 2
+
+    now = 11.0
+    with pytest.raises(AnkrRpcError):
+        await breaker.call("ankr_getLogs", down)
+    assert breaker.stats()["ankr_getLogs"]["state"] == "open"
+
+    now = 22.0
+    assert await breaker.call("ankr_getLogs", up) == "ok"
+    stats = breaker.stats()["ankr_getLogs"]
+    assert (stats["state"], stats["opens"], stats["rejected"]) == ("closed", 2, 1)
+
+
+def test_client_errors_do_not_count_as_degraded() -> None:
+    """Bad requests say nothing about upstream health"""
+    assert is_degraded(AnkrRpcError("bad gateway", status=502))
+    assert is_degraded(asyncio.TimeoutError())
+    assert not is_degraded(AnkrRpcError("not found", status=404))
+    assert not is_degraded(AnkrRpcError("invalid params", code=-32602))
+
+
+@pytest.mark.asyncio
+async def test_api_wrapper_fails_fast_when_circuit_is_open() -> None:
+    """The API wrappers stop calling upstream once the method's circuit opens"""
+    requests = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        return httpx.Response(500)
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    breaker = CircuitBreaker(failures=1, cooldown=60)
+    api = NFTApi(None, BlockingExecutor(max_workers=1), client, breaker=breaker)
+    request = NFTByOwnerRequest(wallet_address="0x1")
+    with pytest.raises(AnkrRpcError):
+        await api.get_nfts_by_owner(request)
+    with pytest.raises(CircuitOpenError):
+        await api.get_nfts_by_owner(request)
+    assert requests == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_hedged_call_takes_a_rate_limiter_token_per_request() -> None:
+    """The duplicate request of a hedged call is not exempt from the method's rate"""
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        if requests == 1:
+            await asyncio.sleep(0.2)
+        return httpx.Response(
+            200, json={"result": {"metadata": {"blockchain": "eth", "tokenId": "7"}}}
+        )
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    limiter = RateLimiter()
+    # Practically no refill, so the tokens left show how many requests were made
+    bucket = limiter.buckets["ankr_getNFTMetadata"] = TokenBucket(0.001, burst=10)
+    hedger = Hedger(initial_delay=0.01)
+    api = NFTApi(None, BlockingExecutor(max_workers=1), client, limiter, hedger)
+
+    request = NFTMetadataRequest(blockchain="eth", contract_address="0xabc", token_id="7")
+    await api.get_nft_metadata(request)
+
+    assert requests == 2 and hedger.stats()["hedge_wins"] == 1
+    assert 7.9 < bucket.tokens < 8.1
+    await client.aclose()
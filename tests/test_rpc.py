@@ -0,0 +1,89 @@
+"""
+Tests for the native JSON-RPC client
+"""
+
+import json
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from web3_mcp.api.query import LogsRequest, QueryApi
+from web3_mcp.executor import BlockingExecutor
+from web3_mcp.rpc import AnkrRpcClient, AnkrRpcError
+
+
+def make_client(handler: Any) -> AnkrRpcClient:
+    """Create a client backed by an in-process mock transport"""
+    return AnkrRpcClient("https://rpc.test/multichain/key", transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_call_sends_json_rpc_without_nones() -> None:
+    """Requests are JSON-RPC 2.0 envelopes with None values stripped"""
+    seen: List[Dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": {"ok": True}})
+
+    client = make_client(handler)
+    result = await client.call("ankr_getLogs", {"blockchain": "eth", "pageToken": None})
+
+    assert result == {"ok": True}
+    assert seen[0]["method"] == "ankr_getLogs"
+    assert seen[0]["params"] == {"blockchain": "eth"}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_call_raises_on_errors() -> None:
+    """JSON-RPC and HTTP errors surface as AnkrRpcError"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if json.loads(request.content)["method"] == "ankr_getLogs":
+            return httpx.Response(
+                200, json={"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "bad"}}
+            )
+        return httpx.Response(429)
+
+    client = make_client(handler)
+    with pytest.raises(AnkrRpcError) as rpc_error:
+        await client.call("ankr_getLogs", {})
+    assert rpc_error.value.code == -32000
+
+    with pytest.raises(AnkrRpcError) as http_error:
+        await client.call("ankr_getBlocks", {})
+    assert http_error.value.status == 429
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_query_api_uses_native_client() -> None:
+    """QueryApi parses native client results into the same response shape as the SDK path"""
+    log = {
+        "address": "0xabc",
+        "blockHash": "0x1",
+        "blockNumber": "0x10",
+        "blockchain": "eth",
+        "data": "0x",
+        "logIndex": "0x0",
+        "removed": False,
+        "topics": [],
+        "transactionHash": "0x2",
+        "transactionIndex": "0x0",
+    }
+    pages = {None: {"logs": [log], "nextPageToken": "next"}, "next": {"logs": [log]}}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)["params"]
+        return httpx.Response(200, json={"result": pages[params.get("pageToken")]})
+
+    client = make_client(handler)
+    api = QueryApi(None, BlockingExecutor(max_workers=1), client)
+    result = await api.get_logs(LogsRequest(blockchain="eth"))
+
+    assert len(result["logs"]) == 1
+    assert result["logs"][0]["address"] == "0xabc"
+    assert result["next_page_token"] == "next"
+    await client.aclose()
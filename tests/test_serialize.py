@@ -0,0 +1,48 @@
+"""
+Tests for SDK object serialization
+"""
+
+from ankr.types import Blockchain, GetNFTMetadataReply, Nft, Trait
+
+from web3_mcp.serialize import to_plain
+
+
+def _nft(token_id: str) -> Nft:
+    return Nft(
+        blockchain=Blockchain.Eth,
+        collectionName="Punks",
+        contractAddress="0xabc",
+        contractType="ERC721",
+        imageUrl="",
+        name=f"Punk {token_id}",
+        symbol="PUNK",
+        tokenId=token_id,
+        tokenUrl="",
+        traits=[Trait(trait_type="hat", value="cap")],
+    )
+
+
+def test_to_plain_converts_nested_sdk_objects() -> None:
+    """SDK objects, enums and nested lists become plain JSON values"""
+    assets = to_plain([_nft("1"), _nft("2")])
+
+    assert assets[1]["tokenId"] == "2"
+    assert assets[0]["blockchain"] == "eth"
+    assert assets[0]["traits"] == [{"trait_type": "hat", "value": "cap"}]
+    assert set(assets[0]) == set(vars(_nft("1")))
+
+
+def test_to_plain_handles_missing_optional_objects() -> None:
+    """None members stay None and plain values pass through"""
+    reply = GetNFTMetadataReply(metadata=None, attributes=None, syncStatus=None)
+    assert to_plain(reply) == {"metadata": None, "attributes": None, "syncStatus": None}
+    assert to_plain({"a": (1, "x")}) == {"a": [1, "x"]}
+
+
+def test_to_plain_projects_fields_of_each_item() -> None:
+    """Only the requested attributes are converted; unknown names are ignored"""
+    assets = to_plain([_nft("1"), _nft("2")], ["tokenId", "blockchain", "missing"])
+    assert assets == [
+        {"tokenId": "1", "blockchain": "eth"},
+        {"tokenId": "2", "blockchain": "eth"},
+    ]
@@ -0,0 +1,77 @@
+"""
+Tests for the cache tier shared between worker processes
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from mcp.types import TextContent
+
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+from web3_mcp.shared_cache import SharedCache, remove_shared_cache
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+def test_instances_share_entries_and_reads_do_not_write(tmp_path: Path) -> None:
+    """A value written through one instance is read by another without touching the row"""
+    path = str(tmp_path / "shared.db")
+    writer, reader = SharedCache(path), SharedCache(path)
+    writer.set("k", {"v": 1}, ttl=30)
+    writer.set("too-short", {"v": 2}, ttl=0.5)
+
+    value, ttl = reader.get("k")  # type: ignore[misc]
+    assert value == {"v": 1} and 0 < ttl <= 30
+    assert reader.get("too-short") is None
+
+    accessed = reader._connection().execute("SELECT accessed_at FROM entries").fetchall()
+    reader.get("k")
+    assert reader._connection().execute("SELECT accessed_at FROM entries").fetchall() == accessed
+
+    remove_shared_cache(path)
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_servers_share_results_through_the_shared_tier(tmp_path: Path) -> None:
+    """A second server, standing in for another worker, is served without calling upstream"""
+    requests: List[Dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        result = {"metadata": {"blockchain": "eth", "tokenId": "7"}}
+        return httpx.Response(200, json={"result": result})
+
+    env = {"WEB3_MCP_SHARED_CACHE": str(tmp_path / "shared.db")}
+    request = {"blockchain": "eth", "contract_address": "0xabc", "token_id": "7"}
+    results = []
+    for _ in range(2):
+        client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+        with (
+            patch.dict(os.environ, env),
+            patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+            patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+        ):
+            mcp = init_server(name="Test Server")
+        content = await mcp._mcp_call_tool("get_nft_metadata", {"request": request})
+        assert isinstance(content[0], TextContent)
+        results.append(json.loads(content[0].text))
+        await client.aclose()
+
+    assert results[0] == results[1]
+    assert len(requests) == 1
+    stats = json.loads((await mcp._mcp_read_resource("ankr://stats"))[0].content)
+    assert stats["shared_cache"]["hits"] == 1
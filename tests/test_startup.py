@@ -0,0 +1,30 @@
+"""
+Tests for server cold start: lazy SDK loading and the startup benchmark
+"""
+
+import subprocess
+import sys
+
+from web3_mcp.startup_bench import run
+
+_CHECK_IMPORTS = """
+import sys
+import web3_mcp.server
+assert "web3" not in sys.modules and "ankr" not in sys.modules, "SDK imported at startup"
+
+from web3_mcp.sdk import sdk_client_class
+sdk_client_class()
+import ankr, ankr.advanced_apis
+assert ankr.types is ankr.advanced_apis.types is sys.modules["ankr.types"]
+"""
+
+
+def test_server_import_skips_sdk_until_needed() -> None:
+    """Importing the server loads ankr.types alone; the SDK later shares that module"""
+    subprocess.run([sys.executable, "-c", _CHECK_IMPORTS], check=True)
+
+
+def test_startup_bench_reaches_first_tool_response() -> None:
+    """A fresh stdio server answers initialize and a tool call"""
+    [result] = run(runs=1)
+    assert 0 < result["initialize_ms"] <= result["first_tool_ms"]
@@ -0,0 +1,106 @@
+"""
+Tests for the streaming scan tools
+"""
+
+import json
+import os
+from typing import Any, Dict, Generator, List
+from unittest.mock import MagicMock, patch
+
+import httpx
+import mcp.types as types
+import pytest
+from fastmcp import Client
+
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+
+PAGES = {
+    None: {"holders": ["0x1", "0x2"], "nextPageToken": "p2"},
+    "p2": {"holders": ["0x3"], "nextPageToken": "p3"},
+    "p3": {"holders": ["0x4"], "nextPageToken": ""},
+}
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+
+
+@pytest.fixture
+def paged_upstream() -> Generator[None, None, None]:
+    """Serve three pages of NFT holders from a mock upstream"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)["params"]
+        return httpx.Response(200, json={"result": PAGES[params.get("pageToken")]})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    with (
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        yield
+
+
+async def call_with_progress(client: Client, name: str, arguments: Dict[str, Any]) -> Any:
+    """Call a tool with a progress token so the server sends progress notifications"""
+    request = types.ClientRequest(
+        types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(
+                name=name,
+                arguments=arguments,
+                _meta=types.RequestParams.Meta(progressToken="scan"),
+            ),
+        )
+    )
+    return await client.session.send_request(request, types.CallToolResult)
+
+
+@pytest.mark.asyncio
+async def test_scan_streams_pages_with_progress(paged_upstream: None) -> None:
+    """Each page is streamed as a log notification followed by a progress notification"""
+    mcp = init_server(name="Test Server")
+    logged: List[Dict[str, Any]] = []
+    progress: List[float] = []
+
+    async def log_handler(params: types.LoggingMessageNotificationParams) -> None:
+        logged.append(json.loads(params.data))
+
+    async def message_handler(message: Any) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ProgressNotification
+        ):
+            progress.append(message.root.params.progress)
+
+    async with Client(mcp, log_handler=log_handler, message_handler=message_handler) as client:
+        result = await call_with_progress(
+            client,
+            "scan_nft_holders",
+            {"request": {"blockchain": "eth", "contract_address": "0xabc"}},
+        )
+
+    summary = json.loads(result.content[0].text)
+    assert summary == {"pages": 3, "rows": 4, "next_page_token": "", "complete": True}
+    assert [page["holders"] for page in logged] == [["0x1", "0x2"], ["0x3"], ["0x4"]]
+    assert progress == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_scan_stops_at_max_pages(paged_upstream: None) -> None:
+    """A scan cut short by max_pages returns the token to resume from"""
+    mcp = init_server(name="Test Server")
+
+    async with Client(mcp) as client:
+        result = await client.call_tool(
+            "scan_nft_holders",
+            {"request": {"blockchain": "eth", "contract_address": "0xabc"}, "max_pages": 1},
+        )
+
+    summary = json.loads(result[0].text)
+    assert summary == {"pages": 1, "rows": 2, "next_page_token": "p2", "complete": False}
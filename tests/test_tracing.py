@@ -0,0 +1,149 @@
+"""
+Tests for tracing spans from tool calls down to upstream requests
+"""
+
+import json
+import os
+from typing import Any, Dict, Generator, List, Optional
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from opentelemetry import trace
+
+from web3_mcp import tracing
+from web3_mcp.rpc import AnkrRpcClient
+from web3_mcp.server import init_server
+from web3_mcp.tracing import OpenTelemetryExporter, Tracer
+
+
+@pytest.fixture(autouse=True)
+def mock_env() -> Generator[None, None, None]:
+    """Mock environment variables and reset the process-wide tracer"""
+    with patch.dict(
+        os.environ, {"ANKR_ENDPOINT": "https://test.endpoint", "ANKR_PRIVATE_KEY": "test_key"}
+    ):
+        yield
+    tracing.set_tracer(None)
+
+
+def _log(block: int) -> Dict[str, Any]:
+    return {
+        "address": "0xabc",
+        "blockHash": "0x1",
+        "blockNumber": hex(block),
+        "blockchain": "eth",
+        "data": "0x",
+        "logIndex": "0x0",
+        "removed": False,
+        "topics": [],
+        "transactionHash": f"0x{block}",
+        "transactionIndex": "0x0",
+    }
+
+
+@pytest.mark.asyncio
+async def test_tool_span_nests_page_and_request_spans() -> None:
+    """A sharded get_logs call yields a tool span with a page span per shard
+
+    The chain head lookup made to decide finality shows up as a page span too, and
+    argument validation and each serialization get a child span of their own.
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if body["method"] == "ankr_getBlockchainStats":
+            stats = {"stats": [{"blockchain": "eth", "latestBlockNumber": 100_000}]}
+            return httpx.Response(200, json={"result": stats})
+        params = body["params"]
+        logs = [_log(params["fromBlock"]), _log(params["fromBlock"] + 1)]
+        return httpx.Response(200, json={"result": {"logs": logs}})
+
+    client = AnkrRpcClient("https://rpc.test/", transport=httpx.MockTransport(handler))
+    env = {"WEB3_MCP_TRACING": "memory", "WEB3_MCP_LOG_SHARD_BLOCKS": "2000"}
+    with (
+        patch.dict(os.environ, env),
+        patch("web3_mcp.auth.AnkrWeb3", MagicMock()),
+        patch("web3_mcp.auth.AnkrRpcClient.from_env", return_value=client),
+    ):
+        mcp = init_server(name="Test Server")
+
+    request = {"blockchain": "eth", "from_block": 0, "to_block": 3999}
+    for _ in range(2):
+        await mcp._mcp_call_tool("get_logs", {"request": request})
+    await client.aclose()
+
+    cached, fetched = json.loads((await mcp._mcp_read_resource("ankr://traces"))[0].content)
+    [tool_span] = [span for span in fetched["spans"] if span["parent_id"] is None]
+    assert tool_span["name"] == "tool get_logs"
+    assert tool_span["attributes"] == {
+        "tool": "get_logs",
+        "blockchain": "eth",
+        "pages": 3,
+        "rows": 5,
+        "response_bytes": tool_span["attributes"]["response_bytes"],
+    }
+
+    assert [span["name"] for span in fetched["spans"]].count("ankr_getBlockchainStats") == 1
+    pages = [span for span in fetched["spans"] if span["name"] == "ankr_getLogs"]
+    assert len(pages) == 2
+    assert all(page["parent_id"] == tool_span["span_id"] for page in pages)
+    assert all(page["attributes"]["rows"] == 2 for page in pages)
+
+    page_ids = {page["span_id"] for page in pages}
+    requests = [
+        span
+        for span in fetched["spans"]
+        if span["name"] == "http request" and span["attributes"]["method"] == "ankr_getLogs"
+    ]
+    assert len(requests) == 2
+    assert all(span["parent_id"] in page_ids for span in requests)
+    assert all(span["attributes"]["status_code"] == 200 for span in requests)
+
+    [validate] = [span for span in fetched["spans"] if span["name"] == "validate"]
+    assert validate["parent_id"] == tool_span["span_id"]
+    serialized = [span for span in fetched["spans"] if span["name"] == "serialize"]
+    assert all(span["parent_id"] == tool_span["span_id"] for span in serialized)
+    assert sorted(span["attributes"]["rows"] for span in serialized) == [1, 2, 2]
+
+    [cached_span] = [span for span in cached["spans"] if span["parent_id"] is None]
+    assert cached_span["attributes"]["cache_hits"] == 1
+    assert [span["name"] for span in cached["spans"]] == ["validate", "tool get_logs"]
+
+
+def test_opentelemetry_bridge_preserves_parents() -> None:
+    """Each span is mirrored into OpenTelemetry as a child of its parent's mirror"""
+    started: List[Any] = []
+
+    def start_span(name: str, context: Optional[Any] = None, start_time: int = 0) -> Any:
+        parent = trace.get_current_span(context) if context is not None else None
+        otel = MagicMock(spec=trace.Span)
+        started.append((name, parent, otel))
+        return otel
+
+    exporter = OpenTelemetryExporter()
+    exporter._tracer = MagicMock(start_span=start_span)
+    tracer = Tracer(exporter)
+    with (
+        tracer.span("tool get_logs", tool="get_logs"),
+        pytest.raises(TimeoutError),
+        tracer.span("ankr_getLogs"),
+    ):
+        raise TimeoutError
+
+    (_, tool_parent, tool_otel), (_, page_parent, page_otel) = started
+    assert tool_parent is None and page_parent is tool_otel
+    tool_otel.set_attributes.assert_called_once_with({"tool": "get_logs"})
+    page_otel.set_attribute.assert_called_once_with("error.type", "TimeoutError")
+    assert page_otel.end.called and tool_otel.end.called
+
+
+def test_spans_are_no_ops_when_tracing_is_off() -> None:
+    """Without WEB3_MCP_TRACING nothing is recorded"""
+    with patch("web3_mcp.auth.AnkrWeb3", MagicMock()):
+        init_server(name="Test Server")
+    assert tracing.get_tracer() is None
+    with tracing.span("ankr_getLogs") as span:
+        span.set_attribute("rows", 1)
+        tracing.count(pages=1)
+        assert tracing.current() is span